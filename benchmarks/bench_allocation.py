@@ -0,0 +1,150 @@
+"""Allocation benchmark suite for Garage.add_vehicles.
+
+Run with ``python -m benchmarks.bench_allocation``. Scenarios:
+
+- throughput: vehicles per second for one large batch into an empty garage.
+- latency: per-vehicle p50/p90/p99 when vehicles arrive one at a time.
+- memory: tracemalloc peak while placing a large batch.
+
+``--output results.json`` saves the results, and ``--baseline baseline.json`` compares
+them with a stored run. The exit status is 1 when a metric regresses by more than
+``--tolerance``.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import Garage
+
+
+class Metric(NamedTuple):
+    name: str
+    value: float
+    # Whether larger values are better, used when comparing with a baseline.
+    higher_is_better: bool
+
+
+def throughput(spec: GarageSpec, vehicle_count: int, repeats: int) -> List[Metric]:
+    vehicles = build_vehicles(vehicle_count, VehicleMix(), seed=spec.seed)
+    best = float("inf")
+    for _ in range(repeats):
+        garage = Garage(levels=build_levels(spec))
+        started = time.perf_counter()
+        garage.add_vehicles(vehicles)
+        best = min(best, time.perf_counter() - started)
+    return [Metric("throughput.vehicles_per_second", vehicle_count / best, True)]
+
+
+def latency(spec: GarageSpec, vehicle_count: int, repeats: int) -> List[Metric]:
+    vehicles = build_vehicles(vehicle_count, VehicleMix(), seed=spec.seed)
+    garage = Garage(levels=build_levels(spec))
+    samples = []
+    for vehicle in vehicles:
+        started = time.perf_counter_ns()
+        garage.add_vehicles([vehicle])
+        samples.append(time.perf_counter_ns() - started)
+
+    percentiles = statistics.quantiles(samples, n=100)
+    return [
+        Metric("latency.p50_ns", percentiles[49], False),
+        Metric("latency.p90_ns", percentiles[89], False),
+        Metric("latency.p99_ns", percentiles[98], False),
+    ]
+
+
+def memory(spec: GarageSpec, vehicle_count: int, repeats: int) -> List[Metric]:
+    vehicles = build_vehicles(vehicle_count, VehicleMix(), seed=spec.seed)
+    garage = Garage(levels=build_levels(spec))
+    tracemalloc.start()
+    garage.add_vehicles(vehicles)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return [Metric("memory.peak_bytes_per_vehicle", peak / vehicle_count, False)]
+
+
+SCENARIOS: Dict[str, Callable[[GarageSpec, int, int], List[Metric]]] = {
+    "throughput": throughput,
+    "latency": latency,
+    "memory": memory,
+}
+
+
+def compare(
+    metrics: List[Metric], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    regressions = []
+    for metric in metrics:
+        reference = baseline.get(metric.name)
+        if reference is None:
+            continue
+        if metric.higher_is_better:
+            regressed = metric.value < reference * (1 - tolerance)
+        else:
+            regressed = metric.value > reference * (1 + tolerance)
+        if regressed:
+            regressions.append(
+                f"{metric.name}: {metric.value:,.1f} vs baseline {reference:,.1f}"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    defaults = GarageSpec()
+    parser.add_argument("--levels", type=int, default=defaults.levels)
+    parser.add_argument(
+        "--spaces-per-level", type=int, default=defaults.spaces_per_level
+    )
+    parser.add_argument("--vehicles", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    spec = GarageSpec(
+        levels=args.levels, spaces_per_level=args.spaces_per_level, seed=args.seed
+    )
+    metrics: List[Metric] = []
+    for name in args.scenario or list(SCENARIOS):
+        metrics += SCENARIOS[name](spec, args.vehicles, args.repeats)
+
+    for metric in metrics:
+        print(f"{metric.name:>36}: {metric.value:,.1f}")
+
+    results = {metric.name: metric.value for metric in metrics}
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "spec": spec._asdict(),
+                    "vehicles": args.vehicles,
+                    "results": results,
+                },
+                output,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(metrics, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
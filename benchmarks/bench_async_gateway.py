@@ -0,0 +1,65 @@
+"""Measures AsyncGarage throughput and admission latency for several batching knobs.
+
+Run with ``python -m benchmarks.bench_async_gateway [gate_count]``. Each gate
+coroutine admits its vehicles one at a time; max_batch_size=1 is the
+one-add_vehicles-call-per-event baseline.
+"""
+
+import asyncio
+import sys
+import time
+from typing import List
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.async_garage import AsyncGarage
+from garage.garage import Garage
+from garage.vehicle import Vehicle
+
+VEHICLES_PER_GATE = 300
+# (max_batch_size, max_delay in seconds)
+KNOBS = [(1, 0.0), (16, 0.0005), (64, 0.001), (256, 0.001), (256, 0.005)]
+
+
+async def gate(gateway: AsyncGarage, vehicles: List[Vehicle], latencies: List[float]):
+    for vehicle in vehicles:
+        started = time.perf_counter()
+        await gateway.admit(vehicle)
+        latencies.append(time.perf_counter() - started)
+
+
+async def measure(spec: GarageSpec, gate_count: int, max_batch_size, max_delay):
+    vehicles = build_vehicles(gate_count * VEHICLES_PER_GATE, VehicleMix())
+    latencies: List[float] = []
+    async with AsyncGarage(
+        Garage(levels=build_levels(spec)),
+        max_batch_size=max_batch_size,
+        max_delay=max_delay,
+    ) as gateway:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                gate(gateway, vehicles[index::gate_count], latencies)
+                for index in range(gate_count)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(
+        f"batch={max_batch_size:>4} delay={max_delay * 1e3:5.1f}ms: "
+        f"{len(vehicles) / elapsed:10,.0f} vehicles/s, "
+        f"p50 {p50:6.2f}ms, p99 {p99:6.2f}ms"
+    )
+
+
+def main():
+    gate_count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    spec = GarageSpec(levels=20, spaces_per_level=1000)
+    for max_batch_size, max_delay in KNOBS:
+        asyncio.run(measure(spec, gate_count, max_batch_size, max_delay))
+
+
+if __name__ == "__main__":
+    main()
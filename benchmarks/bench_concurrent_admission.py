@@ -0,0 +1,55 @@
+"""Measures ConcurrentGarage admission throughput against the number of gate threads.
+
+Run with ``python -m benchmarks.bench_concurrent_admission``. Each gate thread
+places small batches and lets a third of its parked vehicles depart after each one.
+The single-threaded Garage is listed first for reference.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import Garage
+
+THREAD_COUNTS = [1, 2, 4, 8, 16]
+BATCHES_PER_GATE = 200
+BATCH_SIZE = 20
+
+
+def run_gate(garage: Garage, gate_index: int) -> int:
+    vehicles = build_vehicles(BATCHES_PER_GATE * BATCH_SIZE, VehicleMix(), gate_index)
+    parked = []
+    for start in range(0, len(vehicles), BATCH_SIZE):
+        batch = vehicles[start : start + BATCH_SIZE]
+        rejected = {id(vehicle) for vehicle in garage.add_vehicles(batch)}
+        parked += [
+            vehicle.vehicle_id for vehicle in batch if id(vehicle) not in rejected
+        ]
+        garage.remove_vehicles(parked[: len(parked) // 3])
+        parked = parked[len(parked) // 3 :]
+    return len(vehicles)
+
+
+def measure(garage: Garage, threads: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        admitted = sum(
+            executor.map(lambda gate: run_gate(garage, gate), range(threads))
+        )
+    return admitted / (time.perf_counter() - started)
+
+
+def main():
+    spec = GarageSpec(levels=20, spaces_per_level=500)
+    print(
+        f"{'Garage, 1 thread':>26}: {measure(Garage(build_levels(spec)), 1):10,.0f}/s"
+    )
+    for threads in THREAD_COUNTS:
+        garage = ConcurrentGarage(levels=build_levels(spec))
+        rate = measure(garage, threads)
+        print(f"{f'ConcurrentGarage, {threads} threads':>26}: {rate:10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Measures GarageFleet throughput against the number of worker shards.
+
+Run with ``python -m benchmarks.bench_fleet [garage_count]``. Every garage receives
+the same share of a regional batch; a fresh fleet is built for each worker count.
+"""
+
+import os
+import sys
+import time
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.fleet import GarageFleet
+from garage.garage import Garage
+
+VEHICLES_PER_GARAGE = 20_000
+
+
+def main():
+    garage_count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    spec = GarageSpec(levels=20, spaces_per_level=1000)
+    arrivals = [
+        (index % garage_count, vehicle)
+        for index, vehicle in enumerate(
+            build_vehicles(garage_count * VEHICLES_PER_GARAGE, VehicleMix())
+        )
+    ]
+
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for workers in worker_counts:
+        garages = [
+            Garage(levels=build_levels(spec._replace(seed=seed)))
+            for seed in range(garage_count)
+        ]
+        with GarageFleet(garages, workers=workers) as fleet:
+            started = time.perf_counter()
+            fleet.add_vehicles(arrivals)
+            elapsed = time.perf_counter() - started
+        print(f"workers={workers:>3}: {len(arrivals) / elapsed:12,.0f} vehicles/s")
+
+
+if __name__ == "__main__":
+    main()
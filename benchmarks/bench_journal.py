@@ -0,0 +1,76 @@
+"""Measures journaling overhead and journal replay against re-running placement.
+
+Run with ``python -m benchmarks.bench_journal [vehicle_count]``. Vehicles arrive in
+batches of BATCH_SIZE, so each batch is one group commit, and every third batch is
+followed by departures.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.journal import PlacementJournal
+
+BATCH_SIZE = 100
+
+
+def run_traffic(garage: Garage, vehicles):
+    parked = []
+    for start in range(0, len(vehicles), BATCH_SIZE):
+        batch = vehicles[start : start + BATCH_SIZE]
+        rejected = {id(vehicle) for vehicle in garage.add_vehicles(batch)}
+        parked += [
+            vehicle.vehicle_id for vehicle in batch if id(vehicle) not in rejected
+        ]
+        if start // BATCH_SIZE % 3 == 2:
+            garage.remove_vehicles(parked[: len(parked) // 4])
+            parked = parked[len(parked) // 4 :]
+
+
+def timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main():
+    vehicle_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    spec = GarageSpec(levels=20, spaces_per_level=1000)
+    vehicles = build_vehicles(vehicle_count, VehicleMix())
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, journal_options in [
+            ("no journal", None),
+            ("journal, no fsync", {"sync": False}),
+            ("journal, fsync", {"sync": True}),
+            ("journal, fsync 10ms", {"sync": True, "commit_interval": 0.01}),
+        ]:
+            journal = None
+            if journal_options is not None:
+                path = os.path.join(directory, f"{len(name)}.journal")
+                journal = PlacementJournal(path, **journal_options)
+            garage = Garage(levels=build_levels(spec), journal=journal)
+            elapsed = timed(lambda: run_traffic(garage, vehicles))
+            if journal is not None:
+                journal.close()
+            print(f"{name:>22}: {vehicle_count / elapsed:10,.0f} vehicles/s")
+
+        journal_path = os.path.join(directory, "replay.journal")
+        garage = Garage(
+            levels=build_levels(spec), journal=PlacementJournal(journal_path)
+        )
+        run_traffic(garage, vehicles)
+        garage.journal.close()
+        size = os.path.getsize(journal_path)
+
+        replay = timed(lambda: Garage.recover(journal_path, levels=build_levels(spec)))
+        rerun = timed(lambda: run_traffic(Garage(levels=build_levels(spec)), vehicles))
+        print(f"{'replay':>22}: {replay * 1e3:10.1f} ms ({size:,} byte journal)")
+        print(f"{'re-run placement':>22}: {rerun * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
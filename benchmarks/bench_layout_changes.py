@@ -0,0 +1,76 @@
+"""Measures live layout changes against rebuilding the garage.
+
+Run with ``python -m benchmarks.bench_layout_changes [levels]``. A half-full garage
+has spaces re-striped, a level closed and reopened, and admissions in between; a
+full rebuild of the same garage is timed for comparison.
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.generators import GarageSpec, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+
+
+def per_item_us(elapsed: float, count: int) -> float:
+    return elapsed * 1e6 / count
+
+
+def main():
+    level_count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    spec = GarageSpec(levels=level_count, spaces_per_level=1000)
+    garage = Garage(levels=build_levels(spec))
+    garage.add_vehicles(build_vehicles(spec.space_count // 2, seed=1))
+    rng = random.Random(0)
+
+    restripe_count = 10_000
+    started = time.perf_counter()
+    for _ in range(restripe_count):
+        level_index = rng.randrange(level_count)
+        space_index = rng.randrange(spec.spaces_per_level)
+        if garage.levels[level_index].spaces[space_index].vehicle is None:
+            garage.update_space(
+                level_index,
+                space_index,
+                compact=rng.random() < 0.5,
+                required_permit=Permit.NONE,
+            )
+    restripe = time.perf_counter() - started
+
+    started = time.perf_counter()
+    level_index = garage.add_level(
+        ParkingLevel(spaces=[ParkingSpace() for _ in range(spec.spaces_per_level)])
+    )
+    add_level = time.perf_counter() - started
+    garage.add_vehicles(build_vehicles(1000, seed=2))
+    garage.remove_vehicles(
+        [
+            space.vehicle.vehicle_id
+            for space in garage.levels[level_index].spaces
+            if space.vehicle is not None
+        ]
+    )
+    started = time.perf_counter()
+    garage.remove_level(level_index)
+    remove_level = time.perf_counter() - started
+
+    garage.verify_counters()
+
+    levels = build_levels(spec)
+    started = time.perf_counter()
+    Garage(levels=levels)
+    rebuild = time.perf_counter() - started
+
+    print(f"{spec.space_count:,} spaces")
+    print(f"{'update_space':>14}: {per_item_us(restripe, restripe_count):10.1f} us")
+    print(f"{'add_level':>14}: {add_level * 1e3:10.1f} ms")
+    print(f"{'remove_level':>14}: {remove_level * 1e3:10.1f} ms")
+    print(f"{'rebuild':>14}: {rebuild * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
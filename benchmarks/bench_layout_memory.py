@@ -0,0 +1,72 @@
+"""Reports bytes per space for the object layout and the compact layout.
+
+Run with ``python -m benchmarks.bench_layout_memory [space_count]``. Both layouts
+hold the same spaces; allocations are measured with tracemalloc while building them.
+"""
+
+import random
+import sys
+import tracemalloc
+
+from garage.compact_layout import CompactLayout
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+
+SPACES_PER_LEVEL = 1000
+
+
+def space_flags(space_count: int):
+    rng = random.Random(space_count)
+    return [
+        (rng.random() < 0.2, rng.choice([Permit.NONE, Permit.PREMIUM]))
+        for _ in range(space_count)
+    ]
+
+
+def build_object_levels(flags):
+    return [
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(compact=compact, required_permit=required_permit)
+                for compact, required_permit in flags[start : start + SPACES_PER_LEVEL]
+            ]
+        )
+        for start in range(0, len(flags), SPACES_PER_LEVEL)
+    ]
+
+
+def build_compact_layout(flags):
+    layout = CompactLayout()
+    for start in range(0, len(flags), SPACES_PER_LEVEL):
+        chunk = flags[start : start + SPACES_PER_LEVEL]
+        layout.add_level(
+            compact=[compact for compact, _ in chunk],
+            required_permits=[required_permit for _, required_permit in chunk],
+        )
+    return layout
+
+
+def measure(builder, flags) -> int:
+    tracemalloc.start()
+    built = builder(flags)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def main():
+    space_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    flags = space_flags(space_count)
+
+    for name, builder in [
+        ("objects", build_object_levels),
+        ("compact", build_compact_layout),
+    ]:
+        size = measure(builder, flags)
+        print(f"{name:>8}: {size / space_count:8.1f} bytes/space ({size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Checks the bytes a garage holds per space and per parked vehicle against budgets.
+
+Run with ``python -m benchmarks.bench_memory_budget``. The garage is built and then
+filled under tracemalloc; bytes per space are the traced size of the built garage,
+and bytes per vehicle what parking the vehicles added, including the vehicles
+themselves. Garage.memory_report breaks both down by component. The exit status is
+1 when either exceeds ``--space-budget`` or ``--vehicle-budget``.
+"""
+
+import argparse
+import sys
+import tracemalloc
+from typing import List
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.compact_layout import CompactLayout
+from garage.garage import Garage
+
+# Default budgets in bytes, per layout, with headroom over what they measure today.
+SPACE_BUDGETS = {"objects": 180, "compact": 80}
+VEHICLE_BUDGETS = {"objects": 400, "compact": 400}
+
+
+def build_garage(spec: GarageSpec, layout: str) -> Garage:
+    levels = build_levels(spec)
+    if layout == "compact":
+        levels = CompactLayout.from_levels(levels).levels()
+    return Garage(levels=levels)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--layout", choices=sorted(SPACE_BUDGETS), default="objects")
+    parser.add_argument("--levels", type=int, default=20)
+    parser.add_argument("--spaces-per-level", type=int, default=10_000)
+    parser.add_argument(
+        "--occupancy", type=float, default=0.8, help="share of spaces to fill"
+    )
+    parser.add_argument("--space-budget", type=float)
+    parser.add_argument("--vehicle-budget", type=float)
+    args = parser.parse_args(argv)
+    space_budget = args.space_budget or SPACE_BUDGETS[args.layout]
+    vehicle_budget = args.vehicle_budget or VEHICLE_BUDGETS[args.layout]
+    spec = GarageSpec(levels=args.levels, spaces_per_level=args.spaces_per_level)
+
+    tracemalloc.start()
+    garage = build_garage(spec, args.layout)
+    built, _ = tracemalloc.get_traced_memory()
+    garage.add_vehicles(
+        build_vehicles(int(spec.space_count * args.occupancy), VehicleMix())
+    )
+    filled, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report = garage.memory_report()
+
+    space_bytes = built / report.space_count
+    vehicle_bytes = (filled - built) / max(report.vehicle_count, 1)
+    print(
+        f"{args.layout} layout: {report.space_count:,} spaces, "
+        f"{report.vehicle_count:,} parked"
+    )
+    for name, size in sorted(report.components.items(), key=lambda item: -item[1]):
+        print(f"{name:>14}: {size / 2**20:10.1f} MiB")
+    largest = max(report.levels, key=lambda level: level.total)
+    print(f"{'largest level':>14}: {largest.total / 2**20:10.1f} MiB")
+    print(
+        f"{'per space':>14}: {space_bytes:10.1f} bytes traced, "
+        f"{report.bytes_per_space:.1f} walked (budget {space_budget:g})"
+    )
+    print(
+        f"{'per vehicle':>14}: {vehicle_bytes:10.1f} bytes traced, "
+        f"{report.bytes_per_vehicle:.1f} walked (budget {vehicle_budget:g})"
+    )
+
+    over_budget = []
+    if space_bytes > space_budget:
+        over_budget.append(f"{space_bytes:.1f} bytes per space > {space_budget:g}")
+    if vehicle_bytes > vehicle_budget:
+        over_budget.append(
+            f"{vehicle_bytes:.1f} bytes per vehicle > {vehicle_budget:g}"
+        )
+    for message in over_budget:
+        print(f"over budget: {message}", file=sys.stderr)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Compares greedy and optimal placement on a batch larger than the garage.
+
+Run with ``python -m benchmarks.bench_optimal_placement [vehicles]``. Premium
+holders driving compact vehicles take premium spaces under greedy placement, which
+premium-holding cars then lack.
+"""
+
+import sys
+import time
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import GREEDY, OPTIMAL, Garage
+from garage.permit import Permit
+from garage.vehicle_type import VehicleType
+
+MIX = VehicleMix(
+    types={VehicleType.Car: 0.8, VehicleType.Compact: 0.2},
+    permits={Permit.NONE: 0.6, Permit.PREMIUM: 0.4},
+)
+
+
+def main():
+    vehicle_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    spec = GarageSpec(
+        levels=vehicle_count * 9 // 10_000,
+        spaces_per_level=1000,
+        compact_share=0.25,
+        disability_share=0.02,
+        premium_share=0.4,
+    )
+    vehicles = build_vehicles(vehicle_count, MIX, seed=1)
+
+    for strategy in (GREEDY, OPTIMAL):
+        garage = Garage(levels=build_levels(spec))
+        started = time.perf_counter()
+        rejected = garage.add_vehicles(vehicles, strategy=strategy)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{strategy:>8}: {vehicle_count - len(rejected):,} parked, "
+            f"{len(rejected):,} rejected in {elapsed * 1e3:,.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
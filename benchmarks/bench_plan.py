@@ -0,0 +1,45 @@
+"""Compares Garage.plan with deep-copying the garage to answer a what-if question.
+
+Run with ``python -m benchmarks.bench_plan [vehicle_count]``. The garage is half
+occupied before the what-if batch is planned.
+"""
+
+import copy
+import sys
+import time
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import Garage
+
+REPEATS = 5
+
+
+def best_of(run) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    vehicle_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    spec = GarageSpec(levels=20, spaces_per_level=1000)
+    garage = Garage(levels=build_levels(spec))
+    garage.add_vehicles(build_vehicles(spec.space_count // 2, VehicleMix(), seed=1))
+    arrivals = build_vehicles(vehicle_count, VehicleMix(), seed=2)
+
+    scenarios = [
+        ("plan", lambda: garage.plan(arrivals)),
+        (
+            "deepcopy + add_vehicles",
+            lambda: copy.deepcopy(garage).add_vehicles(arrivals),
+        ),
+    ]
+    for name, run in scenarios:
+        print(f"{name:>24}: {best_of(run) * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
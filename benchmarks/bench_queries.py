@@ -0,0 +1,80 @@
+"""Measures the Garage query API against walking Garage.levels.
+
+Run with ``python -m benchmarks.bench_queries [levels]``. The garage is filled to
+about 80% and then asked the support-desk questions: where a vehicle is, how many
+premium holders are parked on a level, and which compact spaces are free.
+"""
+
+import sys
+import time
+from typing import Callable
+
+from benchmarks.generators import GarageSpec, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.permit import Permit
+
+
+def best_us(query: Callable[[], object], repeats: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        query()
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6
+
+
+def main():
+    level_count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    spec = GarageSpec(levels=level_count, spaces_per_level=1000)
+    garage = Garage(levels=build_levels(spec))
+    vehicles = build_vehicles(spec.space_count * 4 // 5, seed=1)
+    garage.add_vehicles(vehicles)
+    vehicle_id = vehicles[len(vehicles) // 2].vehicle_id
+    level_index = level_count // 2
+
+    def walk_locate():
+        for level_index, level in enumerate(garage.levels):
+            for space_index, space in enumerate(level.spaces):
+                if space.vehicle is not None and space.vehicle.vehicle_id == vehicle_id:
+                    return level_index, space_index
+
+    def walk_count_premium():
+        return sum(
+            1
+            for space in garage.levels[level_index].spaces
+            if space.vehicle is not None and space.vehicle.permit & Permit.PREMIUM
+        )
+
+    def walk_free_compact():
+        return [
+            (level_index, space_index)
+            for level_index, level in enumerate(garage.levels)
+            for space_index, space in enumerate(level.spaces)
+            if space.compact and space.vehicle is None
+        ]
+
+    queries = [
+        ("locate", lambda: garage.locate(vehicle_id), walk_locate),
+        (
+            "count premium",
+            lambda: garage.count_parked(Permit.PREMIUM, level_index=level_index),
+            walk_count_premium,
+        ),
+        ("first free compact", lambda: next(garage.free_spaces(compact=True)), None),
+        (
+            "free compact",
+            lambda: list(garage.free_spaces(compact=True)),
+            walk_free_compact,
+        ),
+    ]
+
+    print(f"{spec.space_count:,} spaces, {garage.counters.occupancy:,} parked")
+    for name, query, walk in queries:
+        line = f"{name:>20}: {best_us(query):10.1f} us"
+        if walk is not None:
+            line += f"   walk {best_us(walk, repeats=3):10.1f} us"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
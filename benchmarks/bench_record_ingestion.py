@@ -0,0 +1,68 @@
+"""Compares ingesting arrival rows through Vehicle objects and as columns.
+
+Run with ``python -m benchmarks.bench_record_ingestion [row_count]``. Both paths
+start from the same columns of type values, permits and IDs, as a feed parser
+would produce them: ``add_vehicles`` first wraps every row in a Vehicle, while
+``add_records`` places the columns directly and creates a Vehicle per parked row
+only. A third of the rows are rejected for lack of space.
+"""
+
+import sys
+import time
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+BATCH_SIZE = 4096
+
+
+def via_vehicles(garage: Garage, types, permits, vehicle_ids):
+    for start in range(0, len(types), BATCH_SIZE):
+        stop = start + BATCH_SIZE
+        garage.add_vehicles(
+            [
+                Vehicle(
+                    vehicle_type=VehicleType(vehicle_type),
+                    vehicle_id=vehicle_id,
+                    permit=Permit(permit),
+                )
+                for vehicle_type, permit, vehicle_id in zip(
+                    types[start:stop], permits[start:stop], vehicle_ids[start:stop]
+                )
+            ]
+        )
+
+
+def via_records(garage: Garage, types, permits, vehicle_ids):
+    for start in range(0, len(types), BATCH_SIZE):
+        stop = start + BATCH_SIZE
+        garage.add_records(
+            types[start:stop], permits[start:stop], vehicle_ids[start:stop]
+        )
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    spec = GarageSpec(levels=20, spaces_per_level=row_count * 2 // 3 // 20)
+    vehicles = build_vehicles(row_count, VehicleMix())
+    types = [vehicle.vehicle_type.value for vehicle in vehicles]
+    permits = [int(vehicle.permit) for vehicle in vehicles]
+    vehicle_ids = [vehicle.vehicle_id for vehicle in vehicles]
+    del vehicles
+
+    for name, ingest in [("add_vehicles", via_vehicles), ("add_records", via_records)]:
+        garage = Garage(levels=build_levels(spec))
+        started = time.perf_counter()
+        ingest(garage, types, permits, vehicle_ids)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:>14}: {row_count / elapsed:10,.0f} rows/s, "
+            f"{garage.counters.occupancy:,} parked"
+        )
+
+
+if __name__ == "__main__":
+    main()
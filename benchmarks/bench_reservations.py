@@ -0,0 +1,70 @@
+"""Measures reservation holds and their expiry.
+
+Run with ``python -m benchmarks.bench_reservations [hold_count]``. Holds get
+deadlines spread over an hour on a simulated clock, and time then advances in
+one-minute steps with an admission at each step.
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.generators import GarageSpec, build_levels
+from garage.garage import Garage
+from garage.timer_wheel import TimerWheel
+
+HOUR = 3600.0
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def per_item_ns(elapsed: float, count: int) -> float:
+    return elapsed * 1e9 / count
+
+
+def main():
+    hold_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(0)
+    deadlines = [rng.uniform(0, HOUR) for _ in range(hold_count)]
+
+    clock = SimulatedClock()
+    spec = GarageSpec(levels=hold_count // 1000, spaces_per_level=1000)
+    garage = Garage(levels=build_levels(spec), clock=clock)
+
+    started = time.perf_counter()
+    for deadline in deadlines:
+        garage.reserve(deadline)
+    reserve = time.perf_counter() - started
+    held = garage.reserved
+
+    started = time.perf_counter()
+    while clock.now < HOUR:
+        clock.now += 60
+        garage.add_vehicles([])
+    expire = time.perf_counter() - started
+
+    print(f"{held:,} holds of {hold_count:,} requested")
+    print(f"{'reserve':>16}: {per_item_ns(reserve, hold_count):8.0f} ns/hold")
+    print(f"{'expire':>16}: {per_item_ns(expire, held):8.0f} ns/hold")
+
+    wheel = TimerWheel()
+    timer_count = 10 * hold_count
+    started = time.perf_counter()
+    for index in range(timer_count):
+        wheel.schedule(deadlines[index % hold_count], index)
+    schedule = time.perf_counter() - started
+    started = time.perf_counter()
+    fired = sum(1 for _ in wheel.expired(HOUR))
+    drain = time.perf_counter() - started
+    print(f"{'wheel schedule':>16}: {per_item_ns(schedule, timer_count):8.0f} ns/timer")
+    print(f"{'wheel expire':>16}: {per_item_ns(drain, fired):8.0f} ns/timer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Simulates a week of traffic through a 10,000-space garage.
+
+Run with ``python -m benchmarks.bench_simulation [days]``. Arrivals follow a
+weekday profile that peaks in the morning and keeps the garage near capacity.
+"""
+
+import sys
+
+from benchmarks.generators import GarageSpec, build_levels
+from garage.garage import Garage
+from garage.simulation import DAY, HOUR, Simulation, TrafficMix, lognormal_dwell
+
+# Arrivals per hour, by hour of day.
+PROFILE = [200] * 6 + [2500, 4500, 4500, 2500] + [1500] * 6 + [1000] * 4 + [300] * 4
+
+
+def main():
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else 7.0
+    spec = GarageSpec(levels=20, spaces_per_level=500)
+    garage = Garage(levels=build_levels(spec))
+    mix = TrafficMix(arrivals_per_hour=PROFILE, dwell=lognormal_dwell(3 * HOUR, 0.8))
+
+    report = Simulation(garage, mix).run(days * DAY)
+
+    arrival_count = sum(report.arrivals.values())
+    rejection_count = sum(report.rejections.values())
+    peak = max(parked for _, parked in report.occupancy)
+    print(f"{spec.space_count:,} spaces, {days:g} days simulated")
+    print(f"{'events':>18}: {report.events:,}")
+    print(f"{'wall time':>18}: {report.wall_seconds:.2f} s")
+    print(f"{'events/s':>18}: {report.events_per_second:,.0f}")
+    print(f"{'peak occupancy':>18}: {peak:,}")
+    print(f"{'rejected':>18}: {rejection_count / arrival_count:.1%}")
+
+
+if __name__ == "__main__":
+    main()
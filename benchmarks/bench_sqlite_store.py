@@ -0,0 +1,49 @@
+"""Measures SQLite write-through against the binary journal, and reopening.
+
+Run with ``python -m benchmarks.bench_sqlite_store [vehicle_count]``. Traffic is the
+journal benchmark's: batches of BATCH_SIZE arrivals, each one transaction, with
+departures after every third batch. Reopening a stored garage is timed against
+recovering the same state from its journal.
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.bench_journal import BATCH_SIZE, run_traffic, timed
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.journal import PlacementJournal
+
+
+def main():
+    vehicle_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    spec = GarageSpec(levels=20, spaces_per_level=1000)
+    vehicles = build_vehicles(vehicle_count, VehicleMix())
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, sync in [("sqlite, NORMAL", False), ("sqlite, FULL", True)]:
+            path = os.path.join(directory, f"{sync}.db")
+            garage = Garage.open_sqlite(path, levels=build_levels(spec), sync=sync)
+            elapsed = timed(lambda: run_traffic(garage, vehicles))
+            garage.journal.close()
+            print(
+                f"{name:>22}: {vehicle_count / elapsed:10,.0f} vehicles/s "
+                f"({BATCH_SIZE} per transaction)"
+            )
+
+        journal_path = os.path.join(directory, "garage.journal")
+        garage = Garage(
+            levels=build_levels(spec), journal=PlacementJournal(journal_path)
+        )
+        run_traffic(garage, vehicles)
+        garage.journal.close()
+
+        reopen = timed(lambda: Garage.open_sqlite(path).journal.close())
+        replay = timed(lambda: Garage.recover(journal_path, levels=build_levels(spec)))
+        print(f"{'reopen sqlite':>22}: {reopen * 1e3:10.1f} ms")
+        print(f"{'replay journal':>22}: {replay * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
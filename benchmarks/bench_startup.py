@@ -0,0 +1,100 @@
+"""Compares garage startup from objects with restoring a binary snapshot.
+
+Run with ``python -m benchmarks.bench_startup [space_count]``. The object path
+rebuilds every ParkingLevel, ParkingSpace and parked Vehicle from plain rows, as a
+service would from its database. The snapshot path calls Garage.load.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import GarageSpec, VehicleMix, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+SPACES_PER_LEVEL = 1000
+
+
+def rows_from(garage: Garage):
+    return [
+        [
+            (
+                space.compact,
+                int(space.required_permit),
+                space.vehicle
+                and (
+                    space.vehicle.vehicle_type.value,
+                    space.vehicle.vehicle_id,
+                    int(space.vehicle.permit),
+                ),
+            )
+            for space in level.spaces
+        ]
+        for level in garage.levels
+    ]
+
+
+def build_from_rows(rows) -> Garage:
+    return Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(
+                        compact=compact,
+                        required_permit=Permit(required_permit),
+                        vehicle=vehicle
+                        and Vehicle(
+                            vehicle_type=VehicleType(vehicle[0]),
+                            vehicle_id=vehicle[1],
+                            permit=Permit(vehicle[2]),
+                        ),
+                    )
+                    for compact, required_permit, vehicle in level
+                ]
+            )
+            for level in rows
+        ]
+    )
+
+
+def timed(action):
+    started = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - started
+
+
+def main():
+    space_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    spec = GarageSpec(
+        levels=max(1, space_count // SPACES_PER_LEVEL),
+        spaces_per_level=min(space_count, SPACES_PER_LEVEL),
+    )
+    garage = Garage(levels=build_levels(spec))
+    garage.add_vehicles(build_vehicles(spec.space_count * 7 // 10, VehicleMix()))
+    rows = rows_from(garage)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "garage.snapshot")
+        _, write_seconds = timed(lambda: garage.snapshot(path))
+        _, object_seconds = timed(lambda: build_from_rows(rows))
+        restored, load_seconds = timed(lambda: Garage.load(path))
+        _, first_batch_seconds = timed(
+            lambda: restored.add_vehicles(build_vehicles(1000, VehicleMix(), seed=1))
+        )
+        size = os.path.getsize(path)
+
+    print(f"spaces: {spec.space_count:,}, snapshot: {size / 1e6:.1f} MB")
+    print(f"  write snapshot:     {write_seconds * 1e3:9.1f} ms")
+    print(f"  construct objects:  {object_seconds * 1e3:9.1f} ms")
+    print(f"  load snapshot:      {load_seconds * 1e3:9.1f} ms")
+    print(f"  first 1000 arrivals:{first_batch_seconds * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compares the per-vehicle and numpy allocation paths of Garage.add_vehicles.
+
+Run with ``python -m benchmarks.bench_vectorized_allocation [levels]``. Batches are
+placed into one large garage of ``levels`` x 10,000 spaces, first while it is empty
+and then after filling it until only a few times the batch size is left free. Each
+batch is removed again after it is timed, so every measurement sees the same pools.
+
+For each free-space ratio, the crossover is the smallest batch size from which the
+numpy engine wins at every larger size; Garage picks its engine from these.
+"""
+
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.generators import GarageSpec, build_levels, build_vehicles
+from garage.garage import Garage
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+BATCH_SIZES = [2**exponent for exponent in range(6, 17)]
+# Free spaces left per vehicle of the batch; None leaves the garage empty.
+FREE_RATIOS: List[Optional[int]] = [None, 16, 4, 2, 1]
+SPACES_PER_LEVEL = 10_000
+REPEATS = 5
+
+# May use every space, so a filler takes whatever space comes next.
+FILLER = dict(
+    vehicle_type=VehicleType.Compact, permit=Permit.DISABILITY | Permit.PREMIUM
+)
+
+
+def time_batch(garage: Garage, vehicles: List[Vehicle]) -> float:
+    vehicle_ids = [vehicle.vehicle_id for vehicle in vehicles]
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        garage.add_vehicles(vehicles)
+        best = min(best, time.perf_counter() - started)
+        garage.remove_vehicles(vehicle_ids)
+    return best
+
+
+def fill(garage: Garage, free_spaces: int):
+    count = garage.counters.free_spaces - free_spaces
+    garage.add_vehicles([Vehicle(**FILLER) for _ in range(count)])
+
+
+def main():
+    level_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    spec = GarageSpec(levels=level_count, spaces_per_level=SPACES_PER_LEVEL)
+    garages = {
+        "per-vehicle": Garage(levels=build_levels(spec), vectorized_batch_size=None),
+        "numpy": Garage(
+            levels=build_levels(spec),
+            vectorized_batch_size=0,
+            vectorized_free_ratio=None,
+        ),
+    }
+    # Fillers are only ever added, so the runs go from the most free spaces down.
+    runs = sorted(
+        (
+            (
+                spec.space_count if ratio is None else batch_size * ratio,
+                ratio,
+                batch_size,
+            )
+            for ratio in FREE_RATIOS
+            for batch_size in BATCH_SIZES
+            if ratio is None or batch_size * ratio <= spec.space_count
+        ),
+        key=lambda run: -run[0],
+    )
+
+    results: Dict[Tuple[Optional[int], int], Tuple[float, float]] = {}
+    for free_spaces, ratio, batch_size in runs:
+        vehicles = build_vehicles(batch_size, seed=batch_size)
+        timings = []
+        for garage in garages.values():
+            fill(garage, free_spaces)
+            timings.append(time_batch(garage, vehicles))
+        results[ratio, batch_size] = timings[0], timings[1]
+
+    print(f"{spec.space_count:,} spaces")
+    for ratio in FREE_RATIOS:
+        label = "empty garage" if ratio is None else f"{ratio}x the batch free"
+        print(f"\n{label}")
+        print(f"{'batch':>8} {'per-vehicle ms':>15} {'numpy ms':>10} {'speedup':>8}")
+        crossover = None
+        for batch_size in BATCH_SIZES:
+            if (ratio, batch_size) not in results:
+                continue
+            per_vehicle, vectorized = results[ratio, batch_size]
+            if vectorized < per_vehicle:
+                crossover = crossover or batch_size
+            else:
+                crossover = None
+            print(
+                f"{batch_size:>8} {per_vehicle * 1e3:>15.2f} "
+                f"{vectorized * 1e3:>10.2f} {per_vehicle / vectorized:>7.2f}x"
+            )
+        print(f"crossover batch size: {crossover}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Times Vehicle construction with eager uuid4 IDs, lazy IDs and a counter generator.
+
+Run with ``python -m benchmarks.bench_vehicle_construction``. ``eager`` mirrors the
+previous behaviour of generating a uuid4 for every vehicle up front, using a
+dict-backed class equivalent to the old Vehicle.
+"""
+
+import timeit
+from uuid import uuid4
+
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_id import CounterVehicleIds, set_vehicle_id_generator
+from garage.vehicle_type import VehicleType
+
+COUNT = 200_000
+
+
+class EagerVehicle:
+    def __init__(self, vehicle_type=None, vehicle_id=None, permit=None):
+        self.vehicle_type = vehicle_type or VehicleType.Car
+        self.vehicle_id = vehicle_id or str(uuid4())
+        self.permit = permit or Permit.NONE
+
+
+def build(factory):
+    return [factory() for _ in range(COUNT)]
+
+
+def read_ids(factory):
+    return [factory().vehicle_id for _ in range(COUNT)]
+
+
+def main():
+    scenarios = [
+        ("eager uuid4 (previous)", lambda: build(EagerVehicle)),
+        ("lazy id, never read", lambda: build(Vehicle)),
+        ("lazy uuid4, read once", lambda: read_ids(Vehicle)),
+    ]
+    for name, scenario in scenarios:
+        seconds = min(timeit.repeat(scenario, number=1, repeat=3))
+        print(f"{name:>26}: {seconds / COUNT * 1e9:8.0f} ns/vehicle")
+
+    previous = set_vehicle_id_generator(CounterVehicleIds(prefix="V"))
+    try:
+        seconds = min(timeit.repeat(lambda: read_ids(Vehicle), number=1, repeat=3))
+        print(f"{'counter id, read once':>26}: {seconds / COUNT * 1e9:8.0f} ns/vehicle")
+    finally:
+        set_vehicle_id_generator(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Seeded generators for synthetic garages and vehicle batches."""
+
+import random
+from typing import Dict, List, NamedTuple
+
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+
+class GarageSpec(NamedTuple):
+    levels: int = 10
+    spaces_per_level: int = 500
+    compact_share: float = 0.2
+    disability_share: float = 0.05
+    premium_share: float = 0.1
+    seed: int = 0
+
+    @property
+    def space_count(self) -> int:
+        return self.levels * self.spaces_per_level
+
+
+class VehicleMix(NamedTuple):
+    types: Dict[VehicleType, float] = {
+        VehicleType.Car: 0.7,
+        VehicleType.Truck: 0.1,
+        VehicleType.Compact: 0.2,
+    }
+    permits: Dict[Permit, float] = {
+        Permit.NONE: 0.8,
+        Permit.DISABILITY: 0.05,
+        Permit.PREMIUM: 0.13,
+        Permit.DISABILITY | Permit.PREMIUM: 0.02,
+    }
+
+
+def build_levels(spec: GarageSpec = GarageSpec()) -> List[ParkingLevel]:
+    rng = random.Random(spec.seed)
+    permit_choices = [Permit.DISABILITY, Permit.PREMIUM, Permit.NONE]
+    permit_weights = [
+        spec.disability_share,
+        spec.premium_share,
+        max(0.0, 1.0 - spec.disability_share - spec.premium_share),
+    ]
+    return [
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(
+                    compact=rng.random() < spec.compact_share,
+                    required_permit=rng.choices(permit_choices, permit_weights)[0],
+                )
+                for _ in range(spec.spaces_per_level)
+            ]
+        )
+        for _ in range(spec.levels)
+    ]
+
+
+def build_vehicles(
+    count: int, mix: VehicleMix = VehicleMix(), seed: int = 0
+) -> List[Vehicle]:
+    rng = random.Random(seed)
+    types = rng.choices(list(mix.types), list(mix.types.values()), k=count)
+    permits = rng.choices(list(mix.permits), list(mix.permits.values()), k=count)
+    return [
+        Vehicle(vehicle_type=vehicle_type, vehicle_id=f"{seed}-{index}", permit=permit)
+        for index, (vehicle_type, permit) in enumerate(zip(types, permits))
+    ]
@@ -5,6 +5,8 @@ setup(
     version="1.0",
     packages=find_packages("src"),
     package_dir={"": "src"},
+    extras_require={"numpy": ["numpy"]},
+    entry_points={"console_scripts": ["garage = garage.cli:main"]},
     url="https://github.com/wwt/parking-garage-python",
     license="Apache 2.0",
     author="Connor Barragan",
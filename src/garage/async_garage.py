@@ -0,0 +1,173 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from garage.free_space_pools import SpaceLocation
+from garage.garage import Garage
+from garage.vehicle import Vehicle
+
+# Defaults favour throughput while keeping the added latency around a millisecond.
+MAX_BATCH_SIZE = 256
+MAX_DELAY = 0.001
+MAX_PENDING = 4096
+
+_Arrival = Tuple[Vehicle, "asyncio.Future[Optional[SpaceLocation]]"]
+
+
+class AsyncGarage:
+    """Asyncio front end that gathers single-vehicle admissions into micro-batches.
+
+    A batch is placed with one add_vehicles call as soon as max_batch_size arrivals
+    are waiting or max_delay seconds have passed since its first arrival, so
+    priority rules apply within each batch. At most max_pending arrivals are queued;
+    further admit calls wait for room, which pushes back on the gates.
+    """
+
+    garage: Garage
+    max_batch_size: int
+    max_delay: float
+
+    def __init__(
+        self,
+        garage: Garage,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_delay: float = MAX_DELAY,
+        max_pending: int = MAX_PENDING,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative.")
+
+        self.garage = garage
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._max_pending = max_pending
+        self._queue: Optional["asyncio.Queue[_Arrival]"] = None
+        self._batcher: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+        # Admitted vehicles whose futures are not resolved yet, queued or not.
+        self._unplaced = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    async def admit(self, vehicle: Vehicle) -> Optional[SpaceLocation]:
+        """Queues the vehicle for the next batch and returns the (level index,
+        space index) it parked in, or None if it was rejected."""
+        if self._closed:
+            raise RuntimeError("AsyncGarage is closed.")
+        if self._batcher is None:
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._idle = asyncio.Event()
+            self._batcher = asyncio.get_running_loop().create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._unplaced += 1
+        self._idle.clear()
+        try:
+            await self._queue.put((vehicle, future))
+        except BaseException:
+            self._settled(1)
+            raise
+        return await future
+
+    @property
+    def pending(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    async def close(self):
+        """Places every arrival already admitted, including those still waiting for
+        room in the queue, then stops the batching task."""
+        self._closed = True
+        if self._batcher is None:
+            return
+        if self._unplaced:
+            await self._idle.wait()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> "AsyncGarage":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self._queue.get_nowait())
+
+            self._place(batch)
+            self._settled(len(batch))
+
+    def _settled(self, count: int):
+        self._unplaced -= count
+        if not self._unplaced:
+            self._idle.set()
+
+    def _place(self, batch: List[_Arrival]):
+        batch = self._valid_arrivals(batch)
+        vehicles = [vehicle for vehicle, _ in batch]
+        try:
+            rejected = {id(vehicle) for vehicle in self.garage.add_vehicles(vehicles)}
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for vehicle, future in batch:
+            if future.done():
+                # The gate stopped waiting; the vehicle keeps its space.
+                continue
+            if id(vehicle) in rejected:
+                future.set_result(None)
+            else:
+                future.set_result(self.garage.locate(vehicle.vehicle_id))
+
+    def _valid_arrivals(self, batch: List[_Arrival]) -> List[_Arrival]:
+        """Fails the futures of arrivals that add_vehicles would refuse, so that one
+        bad ID does not fail the whole batch, and returns the other arrivals."""
+        journal = self.garage.journal
+        seen_ids = set()
+        seen_vehicles = set()
+        valid = []
+        for vehicle, future in batch:
+            vehicle_id = vehicle.assigned_id
+            try:
+                if id(vehicle) in seen_vehicles:
+                    raise ValueError("A vehicle arrives twice.")
+                if vehicle_id is not None:
+                    if (
+                        vehicle_id in seen_ids
+                        or self.garage.locate(vehicle_id) is not None
+                    ):
+                        raise ValueError(
+                            f"Vehicle ID {vehicle_id!r} is already parked or "
+                            "arrives twice."
+                        )
+                    if journal is not None:
+                        journal.check_ids([vehicle_id])
+                    seen_ids.add(vehicle_id)
+            except ValueError as error:
+                if not future.done():
+                    future.set_exception(error)
+                continue
+            seen_vehicles.add(id(vehicle))
+            valid.append((vehicle, future))
+        return valid
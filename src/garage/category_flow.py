@@ -0,0 +1,139 @@
+from collections import Counter
+from typing import Dict, List, Mapping, Tuple
+
+from garage.free_space_pools import Category
+from garage.placement_rules import RuleTables
+
+# (vehicle code, space category)
+Assignment = Tuple[int, Category]
+
+
+class _FlowNetwork:
+    """Min-cost max-flow by successive shortest paths, for networks of a few dozen
+    nodes. Each augmentation pushes the whole bottleneck, so the work depends on the
+    size of the network, not on the amount of flow."""
+
+    def __init__(self, node_count: int):
+        self.node_count = node_count
+        # Edges as [head, capacity, cost, reverse edge index] lists per tail node.
+        self.edges: List[List[list]] = [[] for _ in range(node_count)]
+
+    def add_edge(self, tail: int, head: int, capacity: int, cost: int) -> list:
+        edge = [head, capacity, cost, len(self.edges[head])]
+        self.edges[tail].append(edge)
+        self.edges[head].append([tail, 0, -cost, len(self.edges[tail]) - 1])
+        return edge
+
+    def solve(self, source: int, sink: int):
+        while True:
+            # Bellman-Ford, since residual edges carry negative costs.
+            distance = [None] * self.node_count
+            previous: List[Tuple[int, int]] = [None] * self.node_count
+            distance[source] = 0
+            changed = True
+            while changed:
+                changed = False
+                for tail in range(self.node_count):
+                    if distance[tail] is None:
+                        continue
+                    for edge_index, (head, capacity, cost, _) in enumerate(
+                        self.edges[tail]
+                    ):
+                        if capacity and (
+                            distance[head] is None
+                            or distance[tail] + cost < distance[head]
+                        ):
+                            distance[head] = distance[tail] + cost
+                            previous[head] = tail, edge_index
+                            changed = True
+            if distance[sink] is None:
+                return
+
+            path = []
+            node = sink
+            while node != source:
+                tail, edge_index = previous[node]
+                path.append(self.edges[tail][edge_index])
+                node = tail
+            flow = min(edge[1] for edge in path)
+            for edge in path:
+                edge[1] -= flow
+                self.edges[edge[0]][edge[3]][1] += flow
+
+
+class CategoryAllotment:
+    """How many spaces of each category each vehicle code may take in one batch."""
+
+    def __init__(self, counts: Mapping[Assignment, int]):
+        self.counts: Dict[Assignment, int] = {
+            assignment: count for assignment, count in counts.items() if count
+        }
+
+    def categories(
+        self, code: int, eligible: Tuple[Category, ...]
+    ) -> Tuple[Category, ...]:
+        counts = self.counts
+        return tuple(category for category in eligible if (code, category) in counts)
+
+    def take(self, code: int, category: Category):
+        assignment = code, category
+        remaining = self.counts[assignment] - 1
+        if remaining:
+            self.counts[assignment] = remaining
+        else:
+            del self.counts[assignment]
+
+
+def optimal_allotment(
+    tables: RuleTables, demand: Counter, supply: Mapping[Category, int]
+) -> CategoryAllotment:
+    """Solves the placement of a batch as a flow from vehicle codes to space
+    categories and returns how many vehicles of each code go to each category.
+
+    The allotment parks as many vehicles as possible. Among those allotments it
+    prefers giving each vehicle a category from its earliest placement tier, and
+    then parking vehicles that enter earlier tiers, e.g. disability holders before
+    vehicles without permits.
+    """
+    codes = [code for code, count in demand.items() if count]
+    categories = [category for category, free in supply.items() if free]
+    tier_count = len(tables.tier_names)
+
+    source, sink = 0, 1
+    code_nodes = {code: 2 + position for position, code in enumerate(codes)}
+    category_nodes = {
+        category: 2 + len(codes) + position
+        for position, category in enumerate(categories)
+    }
+    network = _FlowNetwork(2 + len(codes) + len(categories))
+    for category, node in category_nodes.items():
+        network.add_edge(node, sink, supply[category], 0)
+
+    edges: Dict[Assignment, list] = {}
+    for code, node in code_nodes.items():
+        tiers = [
+            tier_index
+            for tier_index in range(tier_count)
+            if tables.eligible[tier_index][code]
+        ]
+        if not tiers:
+            continue
+        network.add_edge(source, node, demand[code], tiers[0])
+        for tier_index in tiers:
+            for category in tables.eligible[tier_index][code]:
+                if category in category_nodes and (code, category) not in edges:
+                    # Tier preference outweighs any difference in vehicle priority.
+                    edges[code, category] = network.add_edge(
+                        node,
+                        category_nodes[category],
+                        demand[code],
+                        tier_index * (tier_count + 1),
+                    )
+
+    network.solve(source, sink)
+    return CategoryAllotment(
+        {
+            assignment: demand[assignment[0]] - edge[1]
+            for assignment, edge in edges.items()
+        }
+    )
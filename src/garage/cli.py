@@ -0,0 +1,152 @@
+"""Command line tools for garage layouts, arrival feeds and traffic simulation."""
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from garage.garage import Garage
+from garage.loader import (
+    LOAD_BATCH_SIZE,
+    RejectionWriter,
+    format_permit,
+    load_arrivals,
+    load_layout,
+)
+from garage.simulation import DAY, HOUR, Simulation, TrafficMix, exponential_dwell
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, where the platform reports
+    it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    garage = Garage(levels=load_layout(args.layout))
+    layout_seconds = time.perf_counter() - started
+    space_count = garage.counters.capacity
+    parked_before = garage.counters.occupancy
+
+    started = time.perf_counter()
+    rejected_count = 0
+    rejected = load_arrivals(garage, args.arrivals, args.batch_size)
+    if args.rejected:
+        with RejectionWriter(args.rejected) as writer:
+            for vehicle in rejected:
+                writer.write([vehicle])
+                rejected_count += 1
+    else:
+        rejected_count = sum(1 for _ in rejected)
+    arrival_seconds = time.perf_counter() - started
+    parked_count = garage.counters.occupancy - parked_before
+    arrival_count = parked_count + rejected_count
+
+    if args.snapshot:
+        garage.snapshot(args.snapshot)
+
+    report = sys.stderr
+    print(
+        f"layout: {space_count:,} spaces in {layout_seconds:.3f} s "
+        f"({space_count / max(layout_seconds, 1e-9):,.0f} rows/s)",
+        file=report,
+    )
+    print(
+        f"arrivals: {arrival_count:,} rows in {arrival_seconds:.3f} s "
+        f"({arrival_count / max(arrival_seconds, 1e-9):,.0f} rows/s), "
+        f"{parked_count:,} parked, {rejected_count:,} rejected",
+        file=report,
+    )
+    rss = peak_rss()
+    if rss is not None:
+        print(f"peak RSS: {rss / 2**20:,.1f} MiB", file=report)
+    return 0
+
+
+def simulate(args: argparse.Namespace) -> int:
+    garage = Garage(levels=load_layout(args.layout))
+    mix = TrafficMix(
+        arrivals_per_hour=args.arrivals_per_hour,
+        dwell=exponential_dwell(args.mean_dwell_hours * HOUR),
+    )
+    report = Simulation(garage, mix, seed=args.seed).run(args.days * DAY)
+
+    arrival_count = sum(report.arrivals.values())
+    rejection_count = sum(report.rejections.values())
+    print(f"{'hour':>6} {'parked':>8}")
+    for seconds, parked in report.occupancy:
+        if seconds % HOUR == 0:
+            print(f"{seconds / HOUR:6.0f} {parked:8,}")
+    print(
+        f"{arrival_count:,} arrivals, {rejection_count:,} rejected "
+        f"({rejection_count / max(arrival_count, 1):.1%})"
+    )
+    for (vehicle_type, permit), rate in sorted(
+        report.rejection_rates.items(), key=lambda item: -item[1]
+    ):
+        if rate:
+            print(
+                f"  {vehicle_type.name:>8} {format_permit(permit):>18}: "
+                f"{rate:.1%} rejected"
+            )
+    print(
+        f"{report.events:,} events in {report.wall_seconds:.2f} s "
+        f"({report.events_per_second:,.0f} events/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="garage", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = commands.add_parser(
+        "load",
+        help="park an arrival feed in a garage layout",
+        description="Streams a layout file and an arrival file (CSV or JSON Lines) "
+        "through Garage.add_vehicles in batches.",
+    )
+    load_parser.add_argument("layout")
+    load_parser.add_argument("arrivals")
+    load_parser.add_argument(
+        "--rejected", help="write rejected arrivals to this CSV or JSON Lines file"
+    )
+    load_parser.add_argument("--batch-size", type=int, default=LOAD_BATCH_SIZE)
+    load_parser.add_argument(
+        "--snapshot", help="write a snapshot of the loaded garage to this file"
+    )
+    load_parser.set_defaults(run=load)
+
+    simulate_parser = commands.add_parser(
+        "simulate",
+        help="replay generated traffic through a garage layout",
+        description="Simulates Poisson arrivals with exponential dwell times and "
+        "prints occupancy by hour and rejection rates by vehicle category.",
+    )
+    simulate_parser.add_argument("layout")
+    simulate_parser.add_argument("--days", type=float, default=1.0)
+    simulate_parser.add_argument("--arrivals-per-hour", type=float, default=1000.0)
+    simulate_parser.add_argument("--mean-dwell-hours", type=float, default=2.0)
+    simulate_parser.add_argument("--seed", type=int, default=0)
+    simulate_parser.set_defaults(run=simulate)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"garage: {error}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+
+if TYPE_CHECKING:
+    from garage.space_counters import SpaceCounters
+
+FREE = -1
+
+
+class CompactLayout:
+    """Struct-of-arrays storage for a garage layout.
+
+    Space flags live in bytearray columns indexed by ordinal (the position of the
+    space in garage order) and occupants in one index array pointing into a shared
+    vehicle list. ParkingLevel and ParkingSpace views are only created on access.
+    """
+
+    compact: bytearray
+    required_permits: bytearray
+    occupants: array
+    level_offsets: array
+    vehicles: List[Optional[Vehicle]]
+    # Maintained by the Garage holding this layout.
+    level_counters: List["SpaceCounters"]
+
+    def __init__(self):
+        self.compact = bytearray()
+        self.required_permits = bytearray()
+        self.occupants = array("q")
+        self.level_offsets = array("q", [0])
+        self.vehicles = []
+        self.level_counters = []
+        self._free_slots: List[int] = []
+
+    @classmethod
+    def from_levels(cls, levels: Iterable) -> "CompactLayout":
+        layout = cls()
+        for level in levels:
+            layout.add_level(
+                compact=[space.compact for space in level.spaces],
+                required_permits=[space.required_permit for space in level.spaces],
+            )
+            for ordinal, space in enumerate(level.spaces, layout.level_offsets[-2]):
+                if space.vehicle is not None:
+                    layout.set_vehicle(ordinal, space.vehicle)
+        return layout
+
+    def add_level(
+        self,
+        compact: Iterable[bool],
+        required_permits: Iterable[Union[Permit, int]] = None,
+    ):
+        compact = bytes(bool(flag) for flag in compact)
+        if required_permits is None:
+            required_permits = bytes(len(compact))
+        else:
+            required_permits = bytes(int(permit) for permit in required_permits)
+        if len(required_permits) != len(compact):
+            raise ValueError("Every space needs both a compact flag and a permit.")
+
+        self._detach()
+        self.compact += compact
+        self.required_permits += required_permits
+        self.occupants.extend([FREE] * len(compact))
+        self.level_offsets.append(len(self.compact))
+
+    def insert_space(
+        self, level_index: int, compact: bool, required_permit: Union[Permit, int] = 0
+    ) -> int:
+        """Appends a free space to a level and returns its space index."""
+        self._detach()
+        ordinal = self.level_offsets[level_index + 1]
+        self.compact.insert(ordinal, bool(compact))
+        self.required_permits.insert(ordinal, int(required_permit))
+        self.occupants.insert(ordinal, FREE)
+        for position in range(level_index + 1, len(self.level_offsets)):
+            self.level_offsets[position] += 1
+        return ordinal - self.level_offsets[level_index]
+
+    def remove_space(self, level_index: int, space_index: int):
+        self._detach()
+        ordinal = self.ordinal(level_index, space_index)
+        self.set_vehicle(ordinal, None)
+        del self.compact[ordinal]
+        del self.required_permits[ordinal]
+        del self.occupants[ordinal]
+        for position in range(level_index + 1, len(self.level_offsets)):
+            self.level_offsets[position] -= 1
+
+    def remove_level(self, level_index: int):
+        self._detach()
+        start = self.level_offsets[level_index]
+        stop = self.level_offsets[level_index + 1]
+        for ordinal in range(start, stop):
+            self.set_vehicle(ordinal, None)
+        del self.compact[start:stop]
+        del self.required_permits[start:stop]
+        del self.occupants[start:stop]
+        del self.level_offsets[level_index + 1]
+        for position in range(level_index + 1, len(self.level_offsets)):
+            self.level_offsets[position] -= stop - start
+
+    def set_flags(
+        self, ordinal: int, compact: bool, required_permit: Union[Permit, int]
+    ):
+        self._detach()
+        self.compact[ordinal] = bool(compact)
+        self.required_permits[ordinal] = int(required_permit)
+
+    def _detach(self):
+        """Hook for layouts whose columns must become writable and resizable before
+        they change."""
+
+    @property
+    def level_count(self) -> int:
+        return len(self.level_offsets) - 1
+
+    @property
+    def space_count(self) -> int:
+        return len(self.compact)
+
+    def ordinal(self, level_index: int, space_index: int) -> int:
+        return self.level_offsets[level_index] + space_index
+
+    def vehicle(self, ordinal: int) -> Optional[Vehicle]:
+        slot = self.occupants[ordinal]
+        return None if slot == FREE else self.vehicles[slot]
+
+    def set_vehicle(self, ordinal: int, vehicle: Optional[Vehicle]):
+        slot = self.occupants[ordinal]
+        if slot != FREE:
+            self.vehicles[slot] = None
+            self._free_slots.append(slot)
+            self.occupants[ordinal] = FREE
+
+        if vehicle is None:
+            return
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.vehicles[slot] = vehicle
+        else:
+            slot = len(self.vehicles)
+            self.vehicles.append(vehicle)
+        self.occupants[ordinal] = slot
+
+    def vehicle_id(self, slot: int) -> str:
+        return self.vehicles[slot].vehicle_id
+
+    def occupied_ids(self) -> Iterator[Tuple[int, int, str]]:
+        for level_index, space_index, slot in self._occupied_slots():
+            yield level_index, space_index, self.vehicle_id(slot)
+
+    def _occupied_slots(self) -> Iterator[Tuple[int, int, int]]:
+        offsets = self.level_offsets
+        for level_index in range(self.level_count):
+            start = offsets[level_index]
+            for space_index, slot in enumerate(
+                self.occupants[start : offsets[level_index + 1]]
+            ):
+                if slot != FREE:
+                    yield level_index, space_index, slot
+
+    def levels(self) -> "CompactLevels":
+        return CompactLevels(self)
+
+
+class CompactParkingSpace:
+    __slots__ = ("layout", "ordinal")
+
+    def __init__(self, layout: CompactLayout, ordinal: int):
+        self.layout = layout
+        self.ordinal = ordinal
+
+    @property
+    def compact(self) -> bool:
+        return bool(self.layout.compact[self.ordinal])
+
+    @property
+    def required_permit(self) -> Permit:
+        return Permit(self.layout.required_permits[self.ordinal])
+
+    @property
+    def vehicle(self) -> Optional[Vehicle]:
+        return self.layout.vehicle(self.ordinal)
+
+    @vehicle.setter
+    def vehicle(self, vehicle: Optional[Vehicle]):
+        self.layout.set_vehicle(self.ordinal, vehicle)
+
+
+class CompactSpaces(Sequence[CompactParkingSpace]):
+    __slots__ = ("layout", "start", "stop")
+
+    def __init__(self, layout: CompactLayout, start: int, stop: int):
+        self.layout = layout
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: int) -> CompactParkingSpace:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("space index out of range")
+        return CompactParkingSpace(self.layout, self.start + index)
+
+    def __iter__(self) -> Iterator[CompactParkingSpace]:
+        for ordinal in range(self.start, self.stop):
+            yield CompactParkingSpace(self.layout, ordinal)
+
+
+class CompactParkingLevel:
+    __slots__ = ("layout", "level_index")
+
+    def __init__(self, layout: CompactLayout, level_index: int):
+        self.layout = layout
+        self.level_index = level_index
+
+    @property
+    def counters(self) -> Optional["SpaceCounters"]:
+        if self.level_index < len(self.layout.level_counters):
+            return self.layout.level_counters[self.level_index]
+        return None
+
+    @property
+    def spaces(self) -> CompactSpaces:
+        offsets = self.layout.level_offsets
+        return CompactSpaces(
+            self.layout, offsets[self.level_index], offsets[self.level_index + 1]
+        )
+
+
+class CompactLevels(Sequence[CompactParkingLevel]):
+    __slots__ = ("layout",)
+
+    def __init__(self, layout: CompactLayout):
+        self.layout = layout
+
+    def __len__(self) -> int:
+        return self.layout.level_count
+
+    def __getitem__(self, index: int) -> CompactParkingLevel:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("level index out of range")
+        return CompactParkingLevel(self.layout, index)
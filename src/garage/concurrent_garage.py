@@ -0,0 +1,158 @@
+from contextlib import contextmanager
+from threading import RLock
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from garage.free_space_pools import (
+    Category,
+    LockingFreeSpacePools,
+    SpaceLocation,
+)
+from garage.garage import GREEDY, Garage, PlacementPlan, Reservation
+from garage.memory_report import MemoryReport
+from garage.metrics import PhaseStats
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+
+class ConcurrentGarage(Garage):
+    """Garage that several entry gates may call at the same time.
+
+    Spaces are claimed by popping them from per-category pools under that pool's
+    lock, so a space can only ever be handed to one vehicle. Counters and the
+    vehicle index are updated under a short bookkeeping lock that is never held
+    while a pool lock is taken. Priority rules hold within each batch; concurrent
+    batches interleave.
+    """
+
+    _pools_class = LockingFreeSpacePools
+
+    def __init__(self, *args, **kwargs):
+        self._bookkeeping = RLock()
+        super().__init__(*args, **kwargs)
+
+    def remove_vehicles(self, vehicle_ids: Iterable[str] = None) -> List[Vehicle]:
+        removed = []
+        for vehicle_id in vehicle_ids or []:
+            with self._bookkeeping:
+                location = self._locations.get(vehicle_id)
+                released = location and self._release(*location)
+            if released:
+                vehicle, category = released
+                self._pools.push(category, location)
+                removed.append(vehicle)
+        self._commit()
+        return removed
+
+    def parked(
+        self,
+        permit: Union[Permit, int] = Permit.NONE,
+        vehicle_type: Optional[VehicleType] = None,
+        level_index: Optional[int] = None,
+    ) -> Iterator[Vehicle]:
+        # Other gates change the index at any time, so results are copied out
+        # under the lock instead of being produced lazily.
+        with self._bookkeeping:
+            return iter(list(super().parked(permit, vehicle_type, level_index)))
+
+    def count_parked(
+        self,
+        permit: Union[Permit, int] = Permit.NONE,
+        vehicle_type: Optional[VehicleType] = None,
+        level_index: Optional[int] = None,
+    ) -> int:
+        with self._bookkeeping:
+            return super().count_parked(permit, vehicle_type, level_index)
+
+    def free_spaces(
+        self,
+        compact: Optional[bool] = None,
+        required_permit: Optional[Union[Permit, int]] = None,
+        level_index: Optional[int] = None,
+    ) -> Iterator[SpaceLocation]:
+        with self._pools.locked(), self._bookkeeping:
+            return iter(
+                list(super().free_spaces(compact, required_permit, level_index))
+            )
+
+    def count_free(
+        self,
+        compact: Optional[bool] = None,
+        required_permit: Optional[Union[Permit, int]] = None,
+        level_index: Optional[int] = None,
+    ) -> int:
+        with self._pools.locked(), self._bookkeeping:
+            return super().count_free(compact, required_permit, level_index)
+
+    def memory_report(self) -> MemoryReport:
+        with self._pools.locked(), self._bookkeeping:
+            return super().memory_report()
+
+    def plan(
+        self, vehicles: Iterable[Vehicle], strategy: str = GREEDY
+    ) -> PlacementPlan:
+        with self._pools.locked():
+            return super().plan(vehicles, strategy)
+
+    def apply(self, plan: PlacementPlan) -> bool:
+        # Parking takes the bookkeeping lock inside the pool locks; nothing takes
+        # them in the opposite order.
+        with self._pools.locked():
+            return super().apply(plan)
+
+    @contextmanager
+    def _layout_change(self) -> Iterator[None]:
+        # Same lock order as apply: all pool locks, then bookkeeping.
+        with self._pools.locked(), self._bookkeeping:
+            yield
+
+    def _hold(
+        self, location: SpaceLocation, deadline: float, reservation_id: int = None
+    ) -> Reservation:
+        with self._bookkeeping:
+            return super()._hold(location, deadline, reservation_id)
+
+    def _take_reservation(
+        self, reservation_id: int
+    ) -> Optional[Tuple[Reservation, Category]]:
+        with self._bookkeeping:
+            return super()._take_reservation(reservation_id)
+
+    def _take_expired(self, now: float) -> List[Tuple[Reservation, Category]]:
+        with self._bookkeeping:
+            return super()._take_expired(now)
+
+    def _check_arrival_ids(self, vehicle_ids: List[str]):
+        with self._bookkeeping:
+            super()._check_arrival_ids(vehicle_ids)
+
+    def _admit_ids(self, vehicle_ids: List[str]):
+        # The IDs are checked and held in one step, so two gates cannot both pass
+        # the check with the same ID and then both park it.
+        with self._bookkeeping:
+            super()._admit_ids(vehicle_ids)
+
+    def _release_ids(self, vehicle_ids: List[str]):
+        with self._bookkeeping:
+            super()._release_ids(vehicle_ids)
+
+    def _park(self, vehicle: Vehicle, location: SpaceLocation):
+        with self._bookkeeping:
+            super()._park(vehicle, location)
+
+    def _release(
+        self, level_index: int, space_index: int
+    ) -> Optional[Tuple[Vehicle, Category]]:
+        with self._bookkeeping:
+            return super()._release(level_index, space_index)
+
+    def _allocate_optimal(
+        self, vehicles: List[Vehicle], stats: PhaseStats = None
+    ) -> List[int]:
+        # The allotment is only valid while no other gate takes a space.
+        with self._pools.locked():
+            return super()._allocate_optimal(vehicles, stats)
+
+    def _vectorized_placements(self, vehicles: List[Vehicle]):
+        with self._pools.locked():
+            return super()._vectorized_placements(vehicles)
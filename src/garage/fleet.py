@@ -0,0 +1,287 @@
+import os
+import tempfile
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from garage.free_space_pools import LEVEL_SHIFT, SPACE_MASK
+from garage.garage import Garage
+from garage.permit import MAX_PERMIT, Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+REJECTED = -1
+
+# (garage index, level index, space index)
+FleetLocation = Tuple[int, int, int]
+
+
+class FleetResult(NamedTuple):
+    # One entry per arrival, in arrival order; None for rejected vehicles.
+    locations: List[Optional[FleetLocation]]
+    rejected: List[Vehicle]
+
+
+class FleetPlacementError(ValueError):
+    """Raised when a worker fails to place a batch. Batches of other garages may
+    already be committed: locations holds every placement made by the call, in
+    the form of FleetResult.locations, and errors the exception of each garage
+    that failed."""
+
+    def __init__(
+        self,
+        locations: List[Optional[FleetLocation]],
+        errors: Dict[int, BaseException],
+    ):
+        super().__init__(
+            "Placement failed in garages "
+            + ", ".join(map(str, sorted(errors)))
+            + "; other garages may have parked vehicles of the batch."
+        )
+        self.locations = locations
+        self.errors = errors
+
+
+def encode_vehicles(vehicles: Sequence[Vehicle]) -> bytes:
+    """Packs vehicles as type and permit byte columns plus a length-prefixed id heap,
+    so batches cross process boundaries without pickling Vehicle objects."""
+    ids = [vehicle.vehicle_id.encode() for vehicle in vehicles]
+    lengths = array("q", map(len, ids))
+    return b"".join(
+        [
+            array("q", [len(vehicles)]).tobytes(),
+            bytes(vehicle.vehicle_type.value for vehicle in vehicles),
+            bytes(int(vehicle.permit) for vehicle in vehicles),
+            lengths.tobytes(),
+            *ids,
+        ]
+    )
+
+
+def decode_vehicles(payload: bytes) -> List[Vehicle]:
+    view = memoryview(payload)
+    count = view[:8].cast("q")[0]
+    types = view[8 : 8 + count]
+    permits = view[8 + count : 8 + 2 * count]
+    lengths = view[8 + 2 * count : 8 + 10 * count].cast("q")
+
+    vehicles = []
+    position = 8 + 10 * count
+    for index in range(count):
+        end = position + lengths[index]
+        vehicles.append(
+            Vehicle(
+                vehicle_type=VehicleType(types[index]),
+                vehicle_id=str(view[position:end], "utf-8"),
+                permit=Permit(permits[index]),
+            )
+        )
+        position = end
+    return vehicles
+
+
+_worker_garages: Dict[int, Garage] = {}
+
+
+def _load_worker_garages(
+    paths: Dict[int, str], garage_settings: Dict[int, Tuple[type, dict]]
+):
+    for garage_index, path in paths.items():
+        garage_class, settings = garage_settings[garage_index]
+        _worker_garages[garage_index] = garage_class.load(path, **settings)
+
+
+def _garage_settings(garage: Garage, garage_options: dict) -> Tuple[type, dict]:
+    # The metrics sink and journal belong to this process, so they stay behind.
+    settings = dict(
+        vectorized_batch_size=garage.vectorized_batch_size,
+        vectorized_free_ratio=garage.vectorized_free_ratio,
+        rules=garage.rules,
+        clock=garage.clock,
+    )
+    settings.update(garage_options)
+    return type(garage), settings
+
+
+def _place_in_worker(garage_index: int, payload: bytes) -> bytes:
+    garage = _worker_garages[garage_index]
+    vehicles = decode_vehicles(payload)
+    rejected = {id(vehicle) for vehicle in garage.add_vehicles(vehicles)}
+
+    keys = array("q", [REJECTED]) * len(vehicles)
+    for index, vehicle in enumerate(vehicles):
+        if id(vehicle) not in rejected:
+            level_index, space_index = garage.locate(vehicle.vehicle_id)
+            keys[index] = level_index << LEVEL_SHIFT | space_index
+    return keys.tobytes()
+
+
+def _snapshot_in_worker(garage_index: int, path: str):
+    _worker_garages[garage_index].snapshot(path)
+
+
+class GarageFleet:
+    """Runs add_vehicles for many garages in parallel worker processes.
+
+    Each garage is owned by exactly one single-process shard, so its state stays in
+    that process between batches. Arrivals are routed to their target garage, and
+    vehicles it rejects move on to the garages listed for it in overflow, one
+    round at a time. Only packed vehicle columns and location arrays are exchanged
+    with the workers.
+
+    Each worker restores its garages from snapshots with the class, rules,
+    vectorized engine settings and clock of the garage passed in, overridden by
+    garage_options; these must be picklable. Metrics sinks, journals and
+    reservations are not carried over. The garages passed in are copied, not
+    shared: they no longer see the fleet's placements and should not be used to
+    place vehicles afterwards. Read a garage's state back with snapshot().
+    """
+
+    def __init__(
+        self,
+        garages: Sequence[Garage],
+        workers: int = None,
+        overflow: Dict[int, Sequence[int]] = None,
+        **garage_options,
+    ):
+        self.garage_count = len(garages)
+        self.overflow = overflow or {}
+        # IDs parked in each garage; the fleet never removes vehicles.
+        self._vehicle_ids: List[Set[str]] = [
+            {vehicle.vehicle_id for vehicle in garage.parked()} for garage in garages
+        ]
+        self._directory = tempfile.TemporaryDirectory(prefix="garage-fleet-")
+
+        shard_count = max(1, min(workers or os.cpu_count() or 1, len(garages)))
+        shard_paths: List[Dict[int, str]] = [{} for _ in range(shard_count)]
+        garage_settings = {}
+        for garage_index, garage in enumerate(garages):
+            path = os.path.join(self._directory.name, f"{garage_index}.snapshot")
+            garage.snapshot(path)
+            shard_paths[garage_index % shard_count][garage_index] = path
+            garage_settings[garage_index] = _garage_settings(garage, garage_options)
+
+        self._shards = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_load_worker_garages,
+                initargs=(
+                    paths,
+                    {
+                        garage_index: garage_settings[garage_index]
+                        for garage_index in paths
+                    },
+                ),
+            )
+            for paths in shard_paths
+        ]
+
+    def _shard(self, garage_index: int) -> ProcessPoolExecutor:
+        return self._shards[garage_index % len(self._shards)]
+
+    def add_vehicles(self, arrivals: Iterable[Tuple[int, Vehicle]]) -> FleetResult:
+        """Places (target garage index, vehicle) arrivals and returns where each
+        one parked, plus the rejected vehicles in arrival order.
+
+        Raises ValueError before placing anything if a vehicle ID arrives twice or
+        is parked in its target garage or one of its overflow garages. Raises
+        FleetPlacementError if a worker fails anyway.
+        """
+        arrivals = list(arrivals)
+        self._check_arrivals(arrivals)
+        locations: List[Optional[FleetLocation]] = [None] * len(arrivals)
+        attempts = [0] * len(arrivals)
+
+        routed: Dict[int, List[int]] = {}
+        for index, (garage_index, _) in enumerate(arrivals):
+            routed.setdefault(garage_index, []).append(index)
+
+        while routed:
+            futures: Dict[int, Future] = {
+                garage_index: self._shard(garage_index).submit(
+                    _place_in_worker,
+                    garage_index,
+                    encode_vehicles([arrivals[index][1] for index in indices]),
+                )
+                for garage_index, indices in routed.items()
+            }
+
+            # Every garage's result is collected before any error is raised, so
+            # the placements already committed are reported with it.
+            next_round: Dict[int, List[int]] = {}
+            errors: Dict[int, BaseException] = {}
+            for garage_index, future in futures.items():
+                keys = array("q")
+                try:
+                    keys.frombytes(future.result())
+                except Exception as error:
+                    errors[garage_index] = error
+                    continue
+                for index, key in zip(routed[garage_index], keys):
+                    if key != REJECTED:
+                        locations[index] = (
+                            garage_index,
+                            key >> LEVEL_SHIFT,
+                            key & SPACE_MASK,
+                        )
+                        self._vehicle_ids[garage_index].add(
+                            arrivals[index][1].vehicle_id
+                        )
+                        continue
+
+                    overflow = self.overflow.get(arrivals[index][0], ())
+                    if attempts[index] < len(overflow):
+                        next_round.setdefault(overflow[attempts[index]], []).append(
+                            index
+                        )
+                        attempts[index] += 1
+
+            if errors:
+                raise FleetPlacementError(locations, errors)
+
+            # Keep arrival order within each garage's next batch.
+            routed = {
+                garage_index: sorted(indices)
+                for garage_index, indices in next_round.items()
+            }
+
+        rejected = [
+            vehicle
+            for (_, vehicle), location in zip(arrivals, locations)
+            if location is None
+        ]
+        return FleetResult(locations=locations, rejected=rejected)
+
+    def _check_arrivals(self, arrivals: List[Tuple[int, Vehicle]]):
+        seen = set()
+        for garage_index, vehicle in arrivals:
+            vehicle_id = vehicle.vehicle_id
+            if vehicle_id in seen or any(
+                vehicle_id in self._vehicle_ids[index]
+                for index in (garage_index, *self.overflow.get(garage_index, ()))
+            ):
+                raise ValueError(
+                    f"Vehicle ID {vehicle_id!r} is already parked or arrives twice."
+                )
+            if vehicle.permit > MAX_PERMIT:
+                raise ValueError(
+                    f"Permit {int(vehicle.permit)} does not fit in one byte."
+                )
+            seen.add(vehicle_id)
+
+    def snapshot(self, garage_index: int, path: str):
+        """Writes the current state of one garage, as held by its worker."""
+        self._shard(garage_index).submit(
+            _snapshot_in_worker, garage_index, path
+        ).result()
+
+    def close(self):
+        for shard in self._shards:
+            shard.shutdown()
+        self._directory.cleanup()
+
+    def __enter__(self) -> "GarageFleet":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
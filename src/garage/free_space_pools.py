@@ -0,0 +1,321 @@
+import heapq
+from contextlib import ExitStack, contextmanager
+from itertools import count
+from threading import Lock, RLock
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from garage.compact_layout import FREE, CompactLayout, CompactLevels
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+
+Category = Tuple[int, bool]
+SpaceLocation = Tuple[int, int]
+
+# Locations are stored as level_index << LEVEL_SHIFT | space_index so the heaps
+# compare plain ints while keeping (level index, space index) order.
+LEVEL_SHIFT = 32
+SPACE_MASK = (1 << LEVEL_SHIFT) - 1
+
+# Shared by every pool set, so a version number identifies both the pools and
+# their state.
+_versions = count(1)
+
+
+def space_category(space: ParkingSpace) -> Category:
+    return int(space.required_permit), bool(space.compact)
+
+
+def location_key(location: SpaceLocation) -> int:
+    return location[0] << LEVEL_SHIFT | location[1]
+
+
+def key_location(key: int) -> SpaceLocation:
+    return key >> LEVEL_SHIFT, key & SPACE_MASK
+
+
+class FreeSpacePools:
+    """Free spaces grouped by (required permit, compact), each pool a min-heap of
+    location keys so the first free space in garage order pops first.
+
+    version changes to a new, never reused number whenever a pool changes.
+    """
+
+    pools: Dict[Category, List[int]]
+    version: int
+
+    def __init__(self, levels: List[ParkingLevel] = None):
+        self.pools = {}
+        self.version = next(_versions)
+        # Keys discarded from each pool but still in its heap.
+        self._stale: Dict[Category, Set[int]] = {}
+
+        if isinstance(levels, CompactLevels):
+            self._add_layout(levels.layout)
+            return
+
+        # Spaces are visited in garage order, so every pool is already a valid heap.
+        for level_index, level in enumerate(levels or []):
+            for space_index, space in enumerate(level.spaces):
+                pool = self.pools.setdefault(space_category(space), [])
+                if space.vehicle is None:
+                    pool.append(level_index << LEVEL_SHIFT | space_index)
+
+    def _add_layout(self, layout: CompactLayout):
+        # Reads the flag columns directly so no space views are materialized.
+        offsets = layout.level_offsets
+        for level_index in range(layout.level_count):
+            start = offsets[level_index]
+            stop = offsets[level_index + 1]
+            level_key = level_index << LEVEL_SHIFT
+            for space_index, (required_permit, compact, slot) in enumerate(
+                zip(
+                    layout.required_permits[start:stop],
+                    layout.compact[start:stop],
+                    layout.occupants[start:stop],
+                )
+            ):
+                pool = self.pools.setdefault((required_permit, compact == 1), [])
+                if slot == FREE:
+                    pool.append(level_key | space_index)
+
+    def categories(self) -> Iterable[Category]:
+        return self.pools.keys()
+
+    def add_category(self, category: Category):
+        self.pools.setdefault(category, [])
+
+    def free_count(self, categories: Iterable[Category]) -> int:
+        return sum(
+            len(self.pools[category]) - len(self._stale.get(category, ()))
+            for category in categories
+        )
+
+    def free_keys(self, category: Category) -> List[int]:
+        """Location keys of the free spaces in one category, in heap order."""
+        pool = self.pools[category]
+        stale = self._stale.get(category)
+        if stale:
+            return [key for key in pool if key not in stale]
+        return pool
+
+    def ordered_keys(self, category: Category, stop: int = None) -> Iterator[int]:
+        """Yields the free location keys of one category in ascending order, up to
+        but excluding stop, in O(log n) per key.
+
+        The heap is walked in place: a small frontier heap holds the entries whose
+        parents have been yielded, so nothing is copied or sorted up front.
+        """
+        pool = self.pools[category]
+        stale = self._stale.get(category, ())
+        frontier = [(pool[0], 0)] if pool else []
+        while frontier:
+            key, index = heapq.heappop(frontier)
+            if stop is not None and key >= stop:
+                return
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(pool):
+                    heapq.heappush(frontier, (pool[child], child))
+            if key not in stale:
+                yield key
+
+    def pop(self, categories: Iterable[Category]) -> Optional[SpaceLocation]:
+        if self._stale:
+            self._drop_stale(categories)
+
+        best_pool = None
+        for category in categories:
+            pool = self.pools[category]
+            if pool and (best_pool is None or pool[0] < best_pool[0]):
+                best_pool = pool
+
+        if best_pool is None:
+            return None
+
+        self.version = next(_versions)
+        return key_location(heapq.heappop(best_pool))
+
+    def pop_smallest(self, category: Category, count: int) -> List[int]:
+        """Takes up to count of the smallest free keys of a category and returns
+        them in ascending order."""
+        pool = self.pools[category]
+        stale = self._stale.get(category)
+        keys = []
+        while len(keys) < count and pool:
+            key = heapq.heappop(pool)
+            if stale and key in stale:
+                stale.discard(key)
+            else:
+                keys.append(key)
+        if stale is not None and not stale:
+            del self._stale[category]
+        self.version = next(_versions)
+        return keys
+
+    def push_keys(self, category: Category, keys: Iterable[int]):
+        """Returns free keys, e.g. taken by pop_smallest, to a category's pool."""
+        pool = self.pools[category]
+        for key in keys:
+            heapq.heappush(pool, key)
+        self.version = next(_versions)
+
+    def push(self, category: Category, location: SpaceLocation):
+        key = location_key(location)
+        stale = self._stale.get(category)
+        if stale and key in stale:
+            # The discarded entry is still in the heap; it only needs reviving.
+            stale.discard(key)
+            if not stale:
+                del self._stale[category]
+        else:
+            heapq.heappush(self.pools.setdefault(category, []), key)
+        self.version = next(_versions)
+
+    def discard(self, category: Category, location: SpaceLocation):
+        """Takes a free space out of its pool in amortized O(1).
+
+        The entry is only marked stale and is skipped when it reaches the top of the
+        heap; a pool that is more than half stale is rebuilt.
+        """
+        pool = self.pools[category]
+        stale = self._stale.setdefault(category, set())
+        stale.add(location_key(location))
+        if len(stale) * 2 > len(pool):
+            pool[:] = [key for key in pool if key not in stale]
+            heapq.heapify(pool)
+            del self._stale[category]
+        self.version = next(_versions)
+
+    def mark_changed(self):
+        """Moves the version on for changes that leave the pools as they are."""
+        self.version = next(_versions)
+
+    def _drop_stale(self, categories: Iterable[Category]):
+        for category in categories:
+            stale = self._stale.get(category)
+            if stale:
+                pool = self.pools[category]
+                while pool and pool[0] in stale:
+                    stale.discard(heapq.heappop(pool))
+                if not stale:
+                    del self._stale[category]
+
+
+class OverlayFreeSpacePools(FreeSpacePools):
+    """Copy-on-write view of another FreeSpacePools.
+
+    Pools are shared with the base until they change, or until they are read while
+    holding stale entries, at which point the view copies that one category's live
+    keys; the base is never modified.
+    """
+
+    base: FreeSpacePools
+    copied: Dict[Category, List[int]]
+
+    def __init__(self, base: FreeSpacePools):
+        self.base = base
+        self.pools = dict(base.pools)
+        self.version = base.version
+        self.copied = {}
+        self._stale = {}
+
+    def _own(self, category: Category) -> List[int]:
+        pool = self.copied.get(category)
+        if pool is None:
+            pool = list(self.base.free_keys(category)) if category in self.pools else []
+            if category in self.base._stale:
+                heapq.heapify(pool)
+            self.copied[category] = self.pools[category] = pool
+        return pool
+
+    def free_count(self, categories: Iterable[Category]) -> int:
+        return sum(
+            (
+                len(self.copied[category])
+                if category in self.copied
+                else self.base.free_count([category])
+            )
+            for category in categories
+        )
+
+    def free_keys(self, category: Category) -> List[int]:
+        if category in self.copied:
+            return self.copied[category]
+        return self.base.free_keys(category)
+
+    def ordered_keys(self, category: Category, stop: int = None) -> Iterator[int]:
+        if category in self.copied:
+            return super().ordered_keys(category, stop)
+        return self.base.ordered_keys(category, stop)
+
+    def pop(self, categories: Iterable[Category]) -> Optional[SpaceLocation]:
+        stale = self.base._stale
+        best_category = None
+        best_key = None
+        for category in categories:
+            if category in stale and category not in self.copied:
+                self._own(category)
+            pool = self.pools[category]
+            if pool and (best_key is None or pool[0] < best_key):
+                best_category, best_key = category, pool[0]
+
+        if best_category is None:
+            return None
+
+        return key_location(heapq.heappop(self._own(best_category)))
+
+    def pop_smallest(self, category: Category, count: int) -> List[int]:
+        pool = self._own(category)
+        return [heapq.heappop(pool) for _ in range(min(count, len(pool)))]
+
+    def push_keys(self, category: Category, keys: Iterable[int]):
+        pool = self._own(category)
+        for key in keys:
+            heapq.heappush(pool, key)
+
+    def push(self, category: Category, location: SpaceLocation):
+        heapq.heappush(self._own(category), location_key(location))
+
+
+class LockingFreeSpacePools(FreeSpacePools):
+    """FreeSpacePools with one lock per category pool for concurrent callers.
+
+    A pop locks every pool it compares, always in sorted category order, so two
+    callers can never claim the same space or deadlock each other. The locks are
+    reentrant so layout changes can update pools while holding all of them.
+    """
+
+    locks: Dict[Category, RLock]
+
+    def __init__(self, levels: List[ParkingLevel] = None):
+        super().__init__(levels)
+        self.locks = {category: RLock() for category in self.pools}
+        self._locks_lock = Lock()
+
+    def _lock(self, category: Category) -> RLock:
+        lock = self.locks.get(category)
+        if lock is None:
+            with self._locks_lock:
+                lock = self.locks.setdefault(category, RLock())
+        return lock
+
+    def pop(self, categories: Iterable[Category]) -> Optional[SpaceLocation]:
+        with ExitStack() as stack:
+            for category in sorted(categories):
+                stack.enter_context(self._lock(category))
+            return super().pop(categories)
+
+    def push(self, category: Category, location: SpaceLocation):
+        with self._lock(category):
+            super().push(category, location)
+
+    def discard(self, category: Category, location: SpaceLocation):
+        with self._lock(category):
+            super().discard(category, location)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Holds every pool lock, e.g. while a batch engine works on all pools."""
+        with ExitStack() as stack:
+            for category in sorted(self.locks):
+                stack.enter_context(self._lock(category))
+            yield
@@ -1,14 +1,1206 @@
-from typing import List
+import heapq
+import os
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from itertools import count, islice
+from time import perf_counter_ns
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+from garage.category_flow import CategoryAllotment, optimal_allotment
+from garage.compact_layout import FREE, CompactLevels
+from garage.free_space_pools import (
+    Category,
+    FreeSpacePools,
+    OverlayFreeSpacePools,
+    SpaceLocation,
+    key_location,
+    space_category,
+)
+from garage.journal import PlacementJournal, PlacementLog, replay_journal
+from garage.memory_report import MemoryReport, measure_memory
+from garage.metrics import MetricsSink, PhaseStats
+from garage.parked_index import ParkedVehicleIndex
 from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import MAX_PERMIT, Permit
+from garage.placement_rules import PLACEMENT_RULES, PlacementRules, vehicle_code
+from garage.snapshot import SnapshotLayout, write_snapshot
+from garage.space_counters import SpaceCounters
+from garage.sqlite_store import SqliteStore
+from garage.timer_wheel import TimerWheel
+from garage.vectorized_allocator import VectorizedAllocator, numpy_available
 from garage.vehicle import Vehicle
+from garage.vehicle_id import next_vehicle_id
+from garage.vehicle_records import RecordPlacements, VehicleRecords
+from garage.vehicle_type import VehicleType
+
+# Placement strategies for add_vehicles and plan.
+GREEDY = "greedy"
+OPTIMAL = "optimal"
+
+# Batch size from which the numpy engine beats the per-vehicle path, and the most
+# free spaces per vehicle of the batch for which it does, as measured by
+# benchmarks/bench_vectorized_allocation.py.
+VECTORIZED_BATCH_SIZE = 4096
+VECTORIZED_FREE_RATIO = 2
+
+
+class PlacementPlan(NamedTuple):
+    vehicles: List[Vehicle]
+    # One entry per vehicle; None for vehicles the plan rejects.
+    locations: List[Optional[SpaceLocation]]
+    # Indices of rejected vehicles, in arrival order.
+    rejected: List[int]
+    # Free-space pools version the plan was computed against.
+    version: int
+
+
+class Reservation(NamedTuple):
+    reservation_id: int
+    location: SpaceLocation
+    # On the garage clock.
+    deadline: float
 
 
 class Garage:
     levels: List[ParkingLevel]
+    vectorized_batch_size: Optional[int]
+    vectorized_free_ratio: Optional[float]
+    metrics: Optional[MetricsSink]
+    rules: PlacementRules
+    journal: Optional[PlacementLog]
+    clock: Callable[[], float]
+    counters: SpaceCounters
 
-    def __init__(self, levels: List[ParkingLevel] = None):
+    _pools_class = FreeSpacePools
+
+    def __init__(
+        self,
+        levels: List[ParkingLevel] = None,
+        vectorized_batch_size: Optional[int] = VECTORIZED_BATCH_SIZE,
+        vectorized_free_ratio: Optional[float] = VECTORIZED_FREE_RATIO,
+        metrics: Optional[MetricsSink] = None,
+        rules: PlacementRules = PLACEMENT_RULES,
+        journal: Optional[PlacementLog] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.levels = levels or []
+        self.vectorized_batch_size = vectorized_batch_size
+        self.vectorized_free_ratio = vectorized_free_ratio
+        self.metrics = metrics
+        self.rules = rules
+        self.journal = journal
+        self.clock = clock
+        self._pools = self._pools_class(self.levels)
+        self._tables = rules.compile(self._pools.categories())
+        self._locations: Dict[str, SpaceLocation] = {
+            vehicle_id: (level_index, space_index)
+            for level_index, space_index, vehicle_id in self._occupied_ids()
+        }
+        # Built on the first query, so restoring a snapshot loads no vehicles.
+        self._parked: Optional[ParkedVehicleIndex] = None
+        self._level_counters = self._scan_level_counters()
+        self.counters = SpaceCounters()
+        for level, counters in zip(self.levels, self._level_counters):
+            self.counters.merge(counters)
+            if isinstance(level, ParkingLevel):
+                level.counters = counters
+        if isinstance(self.levels, CompactLevels):
+            self.levels.layout.level_counters = self._level_counters
+        if len(self._locations) < self.counters.occupancy:
+            raise ValueError("The levels hold more than one vehicle with the same ID.")
+        self._reservations: Dict[int, Tuple[Reservation, Category]] = {}
+        self._reserved: Dict[SpaceLocation, int] = {}
+        self._reservation_timers: TimerWheel[int] = TimerWheel()
+        self._reservation_ids = count(1)
+        # Given IDs of the vehicles being placed, held until their batch is parked.
+        self._arriving: Set[str] = set()
+
+    def add_vehicles(
+        self, vehicles: List[Vehicle] = None, strategy: str = GREEDY
+    ) -> List[Vehicle]:
+        """Parks the vehicles and returns those rejected, in arrival order.
+
+        The greedy strategy places vehicles tier by tier in arrival order. The
+        optimal strategy first solves a max-flow over vehicle codes and space
+        categories, so it parks as many vehicles as any arrangement of the batch
+        could while keeping each vehicle in its most preferred tier where possible;
+        it costs a little more per batch and never uses the vectorized engine.
+
+        Raises ValueError without placing any vehicle if a vehicle ID is already
+        parked or appears twice in the batch.
+        """
+        vehicles = list(vehicles or [])
+        with self._arrivals(vehicles):
+            self.expire_reservations()
+            rejected = [vehicles[index] for index in self._allocate(vehicles, strategy)]
+            self._commit(rejected)
+        return rejected
+
+    def add_records(
+        self,
+        types: Sequence[int],
+        permits: Sequence[Union[Permit, int]] = None,
+        vehicle_ids: Sequence[Union[str, bytes]] = None,
+    ) -> RecordPlacements:
+        """Parks arrival rows given as parallel columns of VehicleType values,
+        permits and vehicle IDs, or as one NumPy structured array with vehicle_type,
+        permit and vehicle_id fields, and returns the rejected row indices and the
+        location of every row as arrays. Without vehicle_ids, each parked row's
+        Vehicle generates an ID like any Vehicle created without one.
+
+        Placement runs on vehicle codes computed for the whole batch, vectorized
+        where NumPy is installed. A Vehicle is only created for each parked row, to
+        hold in its space, and for rejected rows when journaling.
+        """
+        if permits is None:
+            records = VehicleRecords.from_structured(types)
+        else:
+            records = VehicleRecords(types, permits, vehicle_ids)
+        if records.codes and max(records.codes) > self._tables.code_mask:
+            records.mask_codes(self._tables.code_mask)
+
+        with self._arrival_ids(records.str_ids()):
+            self.expire_reservations()
+            pending = self._allocate(records)
+            self._commit(
+                [records[index] for index in pending]
+                if self.journal is not None
+                else ()
+            )
+        return RecordPlacements(
+            array("q", pending), records.level_indices, records.space_indices
+        )
+
+    def add_vehicle_stream(
+        self, vehicles: Iterable[Vehicle], batch_size: int = 1
+    ) -> Iterator[Vehicle]:
+        """Places vehicles from any iterable, batch_size at a time, and yields each
+        rejected vehicle as soon as its batch is decided.
+
+        Priority rules apply within a batch, and only one batch is held in memory.
+        Vehicles with no free space left in any category they could use are
+        rejected without running the placement tiers.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        iterator = iter(vehicles)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+
+            with self._arrivals(batch):
+                self.expire_reservations()
+                codes = self._vehicle_codes(batch)
+                candidates = [
+                    index
+                    for index, code in enumerate(codes)
+                    if self._has_reachable_space(code)
+                ]
+                rejected = set(range(len(batch))).difference(candidates)
+                if candidates:
+                    pending = self._allocate([batch[index] for index in candidates])
+                    rejected.update(candidates[index] for index in pending)
+
+                rejected_vehicles = [
+                    vehicle for index, vehicle in enumerate(batch) if index in rejected
+                ]
+                self._commit(rejected_vehicles)
+            yield from rejected_vehicles
+
+    def remove_vehicles(self, vehicle_ids: Iterable[str] = None) -> List[Vehicle]:
+        """Frees the spaces of the given vehicles and returns the vehicles that
+        departed. IDs that are not parked in the garage are ignored."""
+        removed = []
+        for vehicle_id in vehicle_ids or []:
+            location = self._locations.get(vehicle_id)
+            if location is not None:
+                removed.append(self._vacate(*location))
+        self._commit()
+        return removed
+
+    def vacate(self, level_index: int, space_index: int) -> Optional[Vehicle]:
+        """Frees a single space and returns the vehicle that was parked there."""
+        vehicle = self._vacate(level_index, space_index)
+        self._commit()
+        return vehicle
+
+    def locate(self, vehicle_id: str) -> Optional[SpaceLocation]:
+        return self._locations.get(vehicle_id)
+
+    def parked(
+        self,
+        permit: Union[Permit, int] = Permit.NONE,
+        vehicle_type: Optional[VehicleType] = None,
+        level_index: Optional[int] = None,
+    ) -> Iterator[Vehicle]:
+        """Lazily yields the parked vehicles holding every permit in permit, and of
+        vehicle_type and on level_index where given.
+
+        Only the matching groups of the parked-vehicle index are visited; the index
+        is built on the first query. Changing the garage while iterating raises
+        RuntimeError.
+        """
+        for group in self._parked_index().groups(permit, vehicle_type, level_index):
+            yield from group.values()
+
+    def count_parked(
+        self,
+        permit: Union[Permit, int] = Permit.NONE,
+        vehicle_type: Optional[VehicleType] = None,
+        level_index: Optional[int] = None,
+    ) -> int:
+        groups = self._parked_index().groups(permit, vehicle_type, level_index)
+        return sum(map(len, groups))
+
+    def free_spaces(
+        self,
+        compact: Optional[bool] = None,
+        required_permit: Optional[Union[Permit, int]] = None,
+        level_index: Optional[int] = None,
+    ) -> Iterator[SpaceLocation]:
+        """Lazily yields the free spaces, in garage order, of the category and on
+        the level given. Held spaces are not free.
+
+        The free-space heaps are walked in place in O(log n) per space. With
+        level_index, only the spaces of that level are scanned. Changing the garage
+        while iterating raises RuntimeError.
+        """
+        version = self._pools.version
+        categories = self._matching_categories(compact, required_permit)
+        if level_index is None:
+            locations = map(
+                key_location,
+                heapq.merge(
+                    *(self._pools.ordered_keys(category) for category in categories)
+                ),
+            )
+        else:
+            locations = self._free_on_level(level_index, set(categories))
+        for location in locations:
+            if self._pools.version != version:
+                raise RuntimeError("Garage changed during iteration.")
+            yield location
+
+    def count_free(
+        self,
+        compact: Optional[bool] = None,
+        required_permit: Optional[Union[Permit, int]] = None,
+        level_index: Optional[int] = None,
+    ) -> int:
+        """Counts the spaces free_spaces would yield, from the counters."""
+        categories = self._matching_categories(compact, required_permit)
+        if level_index is None:
+            return self._pools.free_count(categories)
+
+        counters = self._level_counters[level_index]
+        return sum(counters.unheld_in(category) for category in categories)
+
+    def reserve(
+        self,
+        deadline: float,
+        vehicle_type: VehicleType = VehicleType.Car,
+        permit: Union[Permit, int] = Permit.NONE,
+    ) -> Optional[Reservation]:
+        """Holds the space a vehicle of this type and permit would be given until
+        deadline, on the garage clock, or returns None if there is none.
+
+        A held space is taken out of its free-space pool, so admission skips it
+        without any scan. Expired holds go back to the pool at the next admission,
+        at most one timer resolution after their deadline.
+        """
+        self.expire_reservations()
+        code = vehicle_code(vehicle_type, permit) & self._tables.code_mask
+        for eligible in self._tables.eligible:
+            location = self._pools.pop(eligible[code])
+            if location is not None:
+                return self._hold(location, deadline)
+        return None
+
+    def claim(self, reservation_id: int, vehicle: Vehicle) -> Optional[SpaceLocation]:
+        """Parks the vehicle in its reserved space and returns the space, or returns
+        None if the reservation is unknown or its deadline has passed."""
+        with self._arrivals([vehicle]):
+            held = self._take_reservation(reservation_id)
+            if held is None:
+                return None
+
+            reservation, category = held
+            if self.clock() >= reservation.deadline:
+                self._pools.push(category, reservation.location)
+                return None
+            if not self.rules.vehicle_may_use(
+                vehicle.vehicle_type, vehicle.permit, category
+            ):
+                self._hold(reservation.location, reservation.deadline, reservation_id)
+                raise ValueError("Vehicle may not use the reserved space.")
+
+            self._park(vehicle, reservation.location)
+            self._commit()
+        return reservation.location
+
+    def cancel(self, reservation_id: int) -> bool:
+        held = self._take_reservation(reservation_id)
+        if held is None:
+            return False
+
+        reservation, category = held
+        self._pools.push(category, reservation.location)
+        return True
+
+    def expire_reservations(self) -> List[Reservation]:
+        """Returns the spaces of expired holds to their pools and returns the holds."""
+        if not self._reservations:
+            return []
+
+        expired = self._take_expired(self.clock())
+        for reservation, category in expired:
+            self._pools.push(category, reservation.location)
+        return [reservation for reservation, _ in expired]
+
+    @property
+    def reserved(self) -> int:
+        return len(self._reservations)
+
+    def add_level(self, level: ParkingLevel) -> int:
+        """Appends a level, with any vehicles already parked on it, and returns its
+        index. Only the new spaces are indexed.
+
+        Layout changes are written through to a SQLite store but not journaled;
+        checkpoint after changing the layout.
+        """
+        with self._layout_change():
+            self._check_arrival_ids(
+                [
+                    space.vehicle.vehicle_id
+                    for space in level.spaces
+                    if space.vehicle is not None
+                ]
+            )
+            level_index = len(self.levels)
+            store = self._layout_store()
+            if store is not None:
+                store.add_level(level_index, level.spaces)
+            if isinstance(self.levels, CompactLevels):
+                layout = self.levels.layout
+                layout.add_level(
+                    compact=[space.compact for space in level.spaces],
+                    required_permits=[space.required_permit for space in level.spaces],
+                )
+                for space_index, space in enumerate(level.spaces):
+                    if space.vehicle is not None:
+                        layout.set_vehicle(
+                            layout.ordinal(level_index, space_index), space.vehicle
+                        )
+                counters = SpaceCounters.from_layout(layout, level_index)
+            else:
+                self.levels.append(level)
+                counters = SpaceCounters.from_spaces(level.spaces)
+                level.counters = counters
+            self._level_counters.append(counters)
+            self.counters.merge(counters)
+
+            for space_index, space in enumerate(self.levels[level_index].spaces):
+                self._index_space(space, (level_index, space_index))
+            self._pools.mark_changed()
+            return level_index
+
+    def remove_level(self, level_index: int):
+        """Removes a level that has no parked vehicles or held spaces.
+
+        Later levels move down one index, so the cost is proportional to the spaces
+        on this level and the levels after it.
+        """
+        with self._layout_change():
+            level = self.levels[level_index]
+            if self._level_counters[level_index].occupancy or any(
+                (level_index, space_index) in self._reserved
+                for space_index in range(len(level.spaces))
+            ):
+                raise ValueError("Level has parked vehicles or held spaces.")
+            store = self._layout_store()
+            if store is not None:
+                store.remove_level(level_index)
+
+            for space_index, space in enumerate(level.spaces):
+                self._pools.discard(space_category(space), (level_index, space_index))
+            for later_index in range(level_index + 1, len(self.levels)):
+                for space_index, space in enumerate(self.levels[later_index].spaces):
+                    self._move_space(
+                        space,
+                        (later_index, space_index),
+                        (later_index - 1, space_index),
+                    )
+
+            if isinstance(self.levels, CompactLevels):
+                self.levels.layout.remove_level(level_index)
+            else:
+                del self.levels[level_index]
+            self.counters.subtract(self._level_counters.pop(level_index))
+            self._pools.mark_changed()
+
+    def add_space(self, level_index: int, space: ParkingSpace) -> int:
+        """Appends a space to a level and returns its space index."""
+        with self._layout_change():
+            if space.vehicle is not None:
+                self._check_arrival_ids([space.vehicle.vehicle_id])
+            store = self._layout_store()
+            if store is not None:
+                store.add_space(
+                    level_index, len(self.levels[level_index].spaces), space
+                )
+            if isinstance(self.levels, CompactLevels):
+                layout = self.levels.layout
+                space_index = layout.insert_space(
+                    level_index, space.compact, space.required_permit
+                )
+                if space.vehicle is not None:
+                    layout.set_vehicle(
+                        layout.ordinal(level_index, space_index), space.vehicle
+                    )
+            else:
+                spaces = self.levels[level_index].spaces
+                spaces.append(space)
+                space_index = len(spaces) - 1
+
+            category = space_category(space)
+            occupied = space.vehicle is not None
+            self._level_counters[level_index].add_space(category, occupied)
+            self.counters.add_space(category, occupied)
+            self._index_space(space, (level_index, space_index))
+            self._pools.mark_changed()
+            return space_index
+
+    def remove_space(self, level_index: int, space_index: int):
+        """Removes a space that has no parked vehicle and is not held.
+
+        Later spaces on the level move down one index, so the cost is proportional
+        to the size of the level.
+        """
+        with self._layout_change():
+            spaces = self.levels[level_index].spaces
+            space = spaces[space_index]
+            if (
+                space.vehicle is not None
+                or (level_index, space_index) in self._reserved
+            ):
+                raise ValueError("Space has a parked vehicle or is held.")
+            store = self._layout_store()
+            if store is not None:
+                store.remove_space(level_index, space_index)
+
+            category = space_category(space)
+            self._pools.discard(category, (level_index, space_index))
+            for later_index in range(space_index + 1, len(spaces)):
+                self._move_space(
+                    spaces[later_index],
+                    (level_index, later_index),
+                    (level_index, later_index - 1),
+                )
+
+            if isinstance(self.levels, CompactLevels):
+                self.levels.layout.remove_space(level_index, space_index)
+            else:
+                del spaces[space_index]
+            self._level_counters[level_index].remove_space(category)
+            self.counters.remove_space(category)
+            self._pools.mark_changed()
+
+    def update_space(
+        self,
+        level_index: int,
+        space_index: int,
+        compact: bool = None,
+        required_permit: Union[Permit, int] = None,
+    ):
+        """Re-stripes a space in O(log n). A parked vehicle stays only if it may
+        use the space afterwards; otherwise ValueError is raised."""
+        with self._layout_change():
+            location = (level_index, space_index)
+            space = self.levels[level_index].spaces[space_index]
+            old_category = space_category(space)
+            if compact is None:
+                compact = space.compact
+            if required_permit is None:
+                required_permit = space.required_permit
+            category = (int(required_permit), bool(compact))
+
+            vehicle = space.vehicle
+            if vehicle is not None and not self.rules.vehicle_may_use(
+                vehicle.vehicle_type, vehicle.permit, category
+            ):
+                raise ValueError("The parked vehicle may not use the re-striped space.")
+            store = self._layout_store()
+            if store is not None:
+                store.update_space(level_index, space_index, compact, required_permit)
+
+            if isinstance(space, ParkingSpace):
+                space.compact = bool(compact)
+                space.required_permit = required_permit
+            else:
+                self.levels.layout.set_flags(space.ordinal, compact, required_permit)
+
+            self._add_category(category)
+            occupied = vehicle is not None
+            self._level_counters[level_index].recategorize(
+                old_category, category, occupied
+            )
+            self.counters.recategorize(old_category, category, occupied)
+
+            reservation_id = self._reserved.get(location)
+            if reservation_id is not None:
+                reservation, _ = self._reservations[reservation_id]
+                self._reservations[reservation_id] = reservation, category
+                self._level_counters[level_index].release_hold(old_category)
+                self._level_counters[level_index].hold(category)
+            elif not occupied:
+                self._pools.discard(old_category, location)
+                self._pools.push(category, location)
+            self._pools.mark_changed()
+
+    def plan(
+        self, vehicles: Iterable[Vehicle], strategy: str = GREEDY
+    ) -> PlacementPlan:
+        """Works out where add_vehicles would place the vehicles without parking
+        any. Like add_vehicles, it first returns expired holds to their pools.
+
+        Placement runs against a copy-on-write overlay of the free-space pools, so
+        only the pools the vehicles take spaces from are copied, and only for the
+        length of the call: the plan holds just the planned locations.
+        """
+        vehicles = list(vehicles)
+        self.expire_reservations()
+        view = _PlanningView(self, vehicles)
+        rejected = view._allocate(vehicles, strategy)
+        return PlacementPlan(
+            vehicles=vehicles,
+            locations=view.locations,
+            rejected=rejected,
+            version=self._pools.version,
+        )
+
+    def apply(self, plan: PlacementPlan) -> bool:
+        """Parks the vehicles of a plan made by this garage and returns True, or
+        returns False without changing anything if any space was taken or freed
+        since the plan was made."""
+        if plan.version != self._pools.version:
+            return False
+        with self._arrivals(plan.vehicles):
+            for vehicle, location in zip(plan.vehicles, plan.locations):
+                if location is not None:
+                    level_index, space_index = location
+                    self._pools.discard(
+                        space_category(self.levels[level_index].spaces[space_index]),
+                        location,
+                    )
+                    self._park(vehicle, location)
+            self._commit([plan.vehicles[index] for index in plan.rejected])
+        return True
+
+    def snapshot(self, path: str):
+        """Writes the layout and occupancy to path in the binary snapshot format."""
+        write_snapshot(self.levels, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "Garage":
+        """Restores a garage from a snapshot written by Garage.snapshot.
+
+        The file is memory-mapped copy-on-write, and space views and parked Vehicle
+        objects are only created when they are accessed.
+        """
+        return cls(levels=SnapshotLayout(path).levels(), **kwargs)
+
+    @classmethod
+    def recover(
+        cls,
+        journal_path: str,
+        snapshot_path: str = None,
+        levels: List[ParkingLevel] = None,
+        **kwargs,
+    ) -> "Garage":
+        """Rebuilds a garage from its journal, replayed onto the snapshot at
+        snapshot_path if one exists or else onto the empty levels, and keeps
+        journaling to the same file.
+
+        Replay sets the recorded occupant of each space directly instead of running
+        placement again.
+        """
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            levels = SnapshotLayout(snapshot_path).levels()
+        if os.path.exists(journal_path):
+            replay_journal(journal_path, levels)
+        return cls(levels=levels, journal=PlacementJournal(journal_path), **kwargs)
+
+    @classmethod
+    def open_sqlite(
+        cls,
+        path: str,
+        levels: List[ParkingLevel] = None,
+        sync: bool = True,
+        **kwargs,
+    ) -> "Garage":
+        """Opens the garage stored in the SQLite database at path, storing levels
+        first if it holds no layout yet, and writes every batch of placements and
+        departures through to it in one transaction.
+
+        Spaces are loaded into a compact layout, so no ParkingSpace objects are
+        created. Layout changes are written through as well.
+        """
+        store = SqliteStore(path, sync=sync)
+        if store.empty and levels is not None:
+            store.write_layout(levels)
+        return cls(levels=store.read_levels(), journal=store, **kwargs)
+
+    def checkpoint(self, snapshot_path: str):
+        """Writes a snapshot and compacts the journal, whose records it now holds.
+
+        The snapshot replaces snapshot_path atomically before the journal is
+        truncated, so a crash in between only leaves records that replay to the
+        state already in the snapshot.
+        """
+        if self.journal is not None:
+            self.journal.flush()
+        temporary_path = f"{snapshot_path}.tmp"
+        self.snapshot(temporary_path)
+        os.replace(temporary_path, snapshot_path)
+        if self.journal is not None:
+            self.journal.truncate()
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes held by the garage by component and by level, from sys.getsizeof
+        walks, plus the bytes tracemalloc attributes to each garage module when it
+        is tracing.
+
+        Walks every space and parked vehicle, so it is meant for diagnostics, not
+        for hot paths.
+        """
+        return measure_memory(
+            self.levels,
+            {
+                "free_pools": [self._pools],
+                "locations": [self._locations],
+                "parked_index": [self._parked],
+                "counters": [self.counters, self._level_counters],
+                "reservations": [
+                    self._reservations,
+                    self._reserved,
+                    self._reservation_timers,
+                ],
+            },
+            space_count=self.counters.capacity,
+            vehicle_count=self.counters.occupancy,
+        )
+
+    def verify_counters(self):
+        """Debug check that recounts every space and raises AssertionError if the
+        maintained counters have drifted, e.g. after editing spaces by hand."""
+        scanned_levels = self._scan_level_counters()
+        scanned = SpaceCounters()
+        for level_index, counters in enumerate(scanned_levels):
+            scanned.merge(counters)
+            if counters != self._level_counters[level_index]:
+                raise AssertionError(
+                    f"Level {level_index} counters {self._level_counters[level_index]} "
+                    f"do not match a full scan {counters}."
+                )
+        if scanned != self.counters:
+            raise AssertionError(
+                f"Garage counters {self.counters} do not match a full scan {scanned}."
+            )
+        if len(self._locations) != scanned.occupancy:
+            raise AssertionError(
+                f"{len(self._locations)} vehicle IDs are indexed for "
+                f"{scanned.occupancy} parked vehicles."
+            )
+
+    def _allocate(self, vehicles: List[Vehicle], strategy: str = GREEDY) -> List[int]:
+        """Places the vehicles and returns the indices of those left without a
+        space, in arrival order."""
+        if strategy == OPTIMAL:
+            if self.metrics is not None:
+                return self._record_phase(
+                    OPTIMAL, lambda stats: self._allocate_optimal(vehicles, stats)
+                )
+            return self._allocate_optimal(vehicles)
+        if strategy != GREEDY:
+            raise ValueError(f"Unknown placement strategy {strategy!r}.")
+
+        if self.metrics is not None:
+            return self._allocate_instrumented(vehicles)
+
+        if self._use_vectorized(len(vehicles)):
+            return self._allocate_vectorized(vehicles)
+
+        codes = self._vehicle_codes(vehicles)
+        pending = list(range(len(vehicles)))
+        for tier_index in range(len(self._tables.tier_names)):
+            if not pending:
+                break
+            pending = self._place_tier(tier_index, vehicles, codes, pending)
+
+        return pending
+
+    def _allocate_optimal(
+        self, vehicles: List[Vehicle], stats: PhaseStats = None
+    ) -> List[int]:
+        codes = self._vehicle_codes(vehicles)
+        supply = {
+            category: self._pools.free_count([category])
+            for category in self._pools.categories()
+        }
+        allotment = optimal_allotment(self._tables, Counter(codes), supply)
+        if stats is not None:
+            stats.considered = len(vehicles)
+
+        pending = list(range(len(vehicles)))
+        for tier_index in range(len(self._tables.tier_names)):
+            if not pending or not allotment.counts:
+                break
+            pending = self._place_tier(
+                tier_index, vehicles, codes, pending, allotment=allotment
+            )
+        return pending
+
+    def _allocate_vectorized(
+        self, vehicles: List[Vehicle], stats: PhaseStats = None
+    ) -> List[int]:
+        placements, pending = self._vectorized_placements(vehicles)
+        for index, location in placements:
+            self._park_row(vehicles, index, location)
+        if stats is not None:
+            stats.considered = len(vehicles)
+        return pending
+
+    def _vectorized_placements(
+        self, vehicles: List[Vehicle]
+    ) -> Tuple[List[Tuple[int, SpaceLocation]], List[int]]:
+        return VectorizedAllocator(self._pools, self._tables).allocate(vehicles)
+
+    def _allocate_instrumented(self, vehicles: List[Vehicle]) -> List[int]:
+        codes = self._vehicle_codes(vehicles)
+        if self._use_vectorized(len(vehicles)):
+            pending = self._record_phase(
+                "vectorized", lambda stats: self._allocate_vectorized(vehicles, stats)
+            )
+        else:
+            pending = list(range(len(vehicles)))
+            for tier_index, tier_name in enumerate(self._tables.tier_names):
+                if not pending:
+                    break
+                pending = self._record_phase(
+                    tier_name,
+                    lambda stats: self._place_tier(
+                        tier_index, vehicles, codes, pending, stats
+                    ),
+                )
+
+        started = perf_counter_ns()
+        reasons = Counter(self._rejection_reason(codes[index]) for index in pending)
+        for reason, rejected in reasons.items():
+            self.metrics.record(f"rejected.{reason}", rejected)
+        self.metrics.record("phase.rejection.ns", perf_counter_ns() - started)
+        return pending
+
+    def _record_phase(
+        self, phase: str, run: Callable[[PhaseStats], List[int]]
+    ) -> List[int]:
+        stats = PhaseStats()
+        occupancy = [counters.occupancy for counters in self._level_counters]
+
+        started = perf_counter_ns()
+        pending = run(stats)
+        elapsed = perf_counter_ns() - started
+
+        metrics = self.metrics
+        metrics.record(f"phase.{phase}.ns", elapsed)
+        metrics.record(f"phase.{phase}.considered", stats.considered)
+        metrics.record(f"phase.{phase}.probed", stats.probed)
+        placed = 0
+        for level_index, counters in enumerate(self._level_counters):
+            level_placed = counters.occupancy - occupancy[level_index]
+            if level_placed:
+                metrics.record(f"phase.{phase}.placed", level_placed, level=level_index)
+                placed += level_placed
+        metrics.record(f"phase.{phase}.placed", placed)
+        return pending
+
+    def _rejection_reason(self, code: int) -> str:
+        if any(eligible[code] for eligible in self._tables.eligible):
+            return "capacity"
+        return "ineligible"
+
+    def _use_vectorized(self, batch_size: int) -> bool:
+        # The numpy engine sorts whole pools, so it only pays off when the batch
+        # takes a good share of the free spaces.
+        return (
+            self.vectorized_batch_size is not None
+            and batch_size >= self.vectorized_batch_size
+            and (
+                self.vectorized_free_ratio is None
+                or self.counters.free_spaces <= batch_size * self.vectorized_free_ratio
+            )
+            and numpy_available()
+        )
+
+    @contextmanager
+    def _arrivals(self, vehicles: Sequence[Vehicle]) -> Iterator[None]:
+        vehicle_ids = [
+            vehicle.assigned_id
+            for vehicle in vehicles
+            if vehicle.assigned_id is not None
+        ]
+        # A vehicle without an ID would be parked twice under the one ID it is
+        # given while parking.
+        if len(vehicle_ids) < len(vehicles) and len(set(map(id, vehicles))) < len(
+            vehicles
+        ):
+            raise ValueError("A vehicle arrives twice.")
+        for vehicle in vehicles:
+            if vehicle.permit > MAX_PERMIT:
+                raise ValueError(
+                    f"Permit {int(vehicle.permit)} does not fit in one byte."
+                )
+        with self._arrival_ids(vehicle_ids):
+            yield
+
+    @contextmanager
+    def _arrival_ids(self, vehicle_ids: List[str]) -> Iterator[None]:
+        # Runs before any state changes, so a batch is never half placed. The IDs
+        # stay held until the batch is parked, so IDs generated while parking skip
+        # them.
+        self._admit_ids(vehicle_ids)
+        try:
+            yield
+        finally:
+            self._release_ids(vehicle_ids)
+
+    def _admit_ids(self, vehicle_ids: List[str]):
+        self._check_arrival_ids(vehicle_ids)
+        self._arriving.update(vehicle_ids)
+
+    def _release_ids(self, vehicle_ids: List[str]):
+        self._arriving.difference_update(vehicle_ids)
+
+    def _check_arrival_ids(self, vehicle_ids: List[str]):
+        unique = set(vehicle_ids)
+        if (
+            len(unique) < len(vehicle_ids)
+            or not self._locations.keys().isdisjoint(unique)
+            or not self._arriving.isdisjoint(unique)
+        ):
+            seen = set()
+            for vehicle_id in vehicle_ids:
+                if (
+                    vehicle_id in seen
+                    or vehicle_id in self._locations
+                    or vehicle_id in self._arriving
+                ):
+                    raise ValueError(
+                        f"Vehicle ID {vehicle_id!r} is already parked or arrives "
+                        "twice."
+                    )
+                seen.add(vehicle_id)
+        if self.journal is not None:
+            self.journal.check_ids(vehicle_ids)
+
+    def _generate_id(self, vehicle: Vehicle) -> str:
+        # The generator may repeat an ID given to another vehicle.
+        vehicle_id = vehicle.vehicle_id
+        while vehicle_id in self._locations or vehicle_id in self._arriving:
+            vehicle.vehicle_id = vehicle_id = next_vehicle_id()
+        return vehicle_id
+
+    def _park(self, vehicle: Vehicle, location: SpaceLocation):
+        level_index, space_index = location
+        space = self.levels[level_index].spaces[space_index]
+        space.vehicle = vehicle
+        vehicle_id = vehicle.assigned_id
+        if vehicle_id is None:
+            vehicle_id = self._generate_id(vehicle)
+        self._locations[vehicle_id] = location
+        if self._parked is not None:
+            self._parked.add(vehicle, level_index)
+        category = space_category(space)
+        self.counters.park(category)
+        self._level_counters[level_index].park(category)
+        if self.journal is not None:
+            self.journal.park(vehicle, location)
+
+    def _park_row(
+        self, vehicles: Sequence[Vehicle], index: int, location: SpaceLocation
+    ):
+        self._park(vehicles[index], location)
+        if isinstance(vehicles, VehicleRecords):
+            vehicles.park(index, location)
+
+    def _vacate(self, level_index: int, space_index: int) -> Optional[Vehicle]:
+        released = self._release(level_index, space_index)
+        if released is None:
+            return None
+
+        vehicle, category = released
+        self._pools.push(category, (level_index, space_index))
+        return vehicle
+
+    def _commit(self, rejected: Sequence[Vehicle] = ()):
+        if self.journal is not None:
+            if rejected:
+                self.journal.reject(rejected)
+            self.journal.commit()
+
+    def _hold(
+        self, location: SpaceLocation, deadline: float, reservation_id: int = None
+    ) -> Reservation:
+        level_index, space_index = location
+        reservation = Reservation(
+            reservation_id=reservation_id or next(self._reservation_ids),
+            location=location,
+            deadline=deadline,
+        )
+        category = space_category(self.levels[level_index].spaces[space_index])
+        self._reservations[reservation.reservation_id] = reservation, category
+        self._reserved[location] = reservation.reservation_id
+        self._level_counters[level_index].hold(category)
+        self._reservation_timers.schedule(deadline, reservation.reservation_id)
+        return reservation
+
+    def _parked_index(self) -> ParkedVehicleIndex:
+        if self._parked is None:
+            parked = ParkedVehicleIndex()
+            for level_index, space_index in self._locations.values():
+                parked.add(
+                    self.levels[level_index].spaces[space_index].vehicle, level_index
+                )
+            self._parked = parked
+        return self._parked
+
+    def _layout_store(self) -> Optional[SqliteStore]:
+        # A store holds placements by (level, space), so it has to follow every
+        # layout change; a journal is replayed onto a checkpointed layout instead.
+        return self.journal if isinstance(self.journal, SqliteStore) else None
+
+    def _layout_change(self) -> ContextManager:
+        return nullcontext()
+
+    def _add_category(self, category: Category):
+        if category not in self._pools.pools:
+            self._pools.add_category(category)
+            self._tables = self.rules.compile(self._pools.categories())
+
+    def _index_space(self, space: ParkingSpace, location: SpaceLocation):
+        category = space_category(space)
+        self._add_category(category)
+        if space.vehicle is None:
+            self._pools.push(category, location)
+        else:
+            self._locations[space.vehicle.vehicle_id] = location
+            if self._parked is not None:
+                self._parked.add(space.vehicle, location[0])
+
+    def _move_space(self, space, old: SpaceLocation, new: SpaceLocation):
+        if space.vehicle is not None:
+            self._locations[space.vehicle.vehicle_id] = new
+            if self._parked is not None:
+                self._parked.move(space.vehicle, old[0], new[0])
+            return
+
+        reservation_id = self._reserved.pop(old, None)
+        if reservation_id is not None:
+            reservation, category = self._reservations[reservation_id]
+            self._reservations[reservation_id] = (
+                reservation._replace(location=new),
+                category,
+            )
+            self._reserved[new] = reservation_id
+            return
+
+        category = space_category(space)
+        self._pools.discard(category, old)
+        self._pools.push(category, new)
+
+    def _take_reservation(
+        self, reservation_id: int
+    ) -> Optional[Tuple[Reservation, Category]]:
+        held = self._reservations.pop(reservation_id, None)
+        if held is not None:
+            self._drop_hold(*held)
+        return held
+
+    def _take_expired(self, now: float) -> List[Tuple[Reservation, Category]]:
+        expired = []
+        for reservation_id in self._reservation_timers.expired(now):
+            held = self._reservations.pop(reservation_id, None)
+            # Claimed and cancelled holds leave their timers behind.
+            if held is not None:
+                self._drop_hold(*held)
+                expired.append(held)
+        return expired
+
+    def _drop_hold(self, reservation: Reservation, category: Category):
+        del self._reserved[reservation.location]
+        self._level_counters[reservation.location[0]].release_hold(category)
+
+    def _matching_categories(
+        self, compact: Optional[bool], required_permit: Optional[Union[Permit, int]]
+    ) -> List[Category]:
+        return [
+            category
+            for category in self._pools.categories()
+            if (required_permit is None or category[0] == required_permit)
+            and (compact is None or category[1] == compact)
+        ]
+
+    def _free_on_level(
+        self, level_index: int, categories: Set[Category]
+    ) -> Iterator[SpaceLocation]:
+        if isinstance(self.levels, CompactLevels):
+            layout = self.levels.layout
+            start = layout.level_offsets[level_index]
+            stop = layout.level_offsets[level_index + 1]
+            free = [
+                slot == FREE and (required_permit, bool(compact)) in categories
+                for slot, required_permit, compact in zip(
+                    layout.occupants[start:stop],
+                    layout.required_permits[start:stop],
+                    layout.compact[start:stop],
+                )
+            ]
+        else:
+            free = [
+                space.vehicle is None and space_category(space) in categories
+                for space in self.levels[level_index].spaces
+            ]
+        for space_index, is_free in enumerate(free):
+            if is_free and (level_index, space_index) not in self._reserved:
+                yield level_index, space_index
+
+    def _scan_level_counters(self) -> List[SpaceCounters]:
+        if isinstance(self.levels, CompactLevels):
+            layout = self.levels.layout
+            return [
+                SpaceCounters.from_layout(layout, level_index)
+                for level_index in range(layout.level_count)
+            ]
+        return [SpaceCounters.from_spaces(level.spaces) for level in self.levels]
+
+    def _release(
+        self, level_index: int, space_index: int
+    ) -> Optional[Tuple[Vehicle, Category]]:
+        space = self.levels[level_index].spaces[space_index]
+        vehicle = space.vehicle
+        if vehicle is None:
+            return None
+
+        space.vehicle = None
+        del self._locations[vehicle.vehicle_id]
+        if self._parked is not None:
+            self._parked.remove(vehicle, level_index)
+        category = space_category(space)
+        self.counters.vacate(category)
+        self._level_counters[level_index].vacate(category)
+        if self.journal is not None:
+            self.journal.depart(vehicle, (level_index, space_index))
+        return vehicle, category
+
+    def _occupied_ids(self) -> Iterator[Tuple[int, int, str]]:
+        if isinstance(self.levels, CompactLevels):
+            yield from self.levels.layout.occupied_ids()
+            return
+
+        for level_index, level in enumerate(self.levels):
+            for space_index, space in enumerate(level.spaces):
+                if space.vehicle is not None:
+                    yield level_index, space_index, space.vehicle.vehicle_id
+
+    def _place_tier(
+        self,
+        tier_index: int,
+        vehicles: List[Vehicle],
+        codes: List[int],
+        pending: List[int],
+        stats: PhaseStats = None,
+        allotment: CategoryAllotment = None,
+    ) -> List[int]:
+        admitted = self._tables.admitted[tier_index]
+        candidates = [index for index in pending if admitted[codes[index]]]
+        prioritized = self._tables.prioritized[tier_index]
+        if prioritized is not None:
+            candidates.sort(key=lambda index: not prioritized[codes[index]])
+        if stats is not None:
+            stats.considered = len(candidates)
+
+        eligible = self._tables.eligible[tier_index]
+        placed = set()
+        for index in candidates:
+            categories = eligible[codes[index]]
+            if allotment is not None:
+                categories = allotment.categories(codes[index], categories)
+            if stats is not None:
+                stats.probed += len(categories)
+            location = self._pools.pop(categories)
+            if location is None:
+                continue
+
+            self._park_row(vehicles, index, location)
+            if allotment is not None:
+                level_index, space_index = location
+                allotment.take(
+                    codes[index],
+                    space_category(self.levels[level_index].spaces[space_index]),
+                )
+            placed.add(index)
+
+        if not placed:
+            return pending
+        return [index for index in pending if index not in placed]
+
+    def _has_reachable_space(self, code: int) -> bool:
+        pools = self._pools.pools
+        return any(
+            pools[category]
+            for eligible in self._tables.eligible
+            for category in eligible[code]
+        )
+
+    def _vehicle_codes(self, vehicles: Sequence[Vehicle]) -> List[int]:
+        if isinstance(vehicles, VehicleRecords):
+            return vehicles.codes
+        code_mask = self._tables.code_mask
+        # The only enum access per vehicle; placement tiers work on the codes.
+        return [
+            vehicle_code(vehicle.vehicle_type, vehicle.permit) & code_mask
+            for vehicle in vehicles
+        ]
+
+
+class _PlanningView(Garage):
+    """Runs the placement pipeline of a garage against copy-on-write pools,
+    recording each placement instead of parking the vehicle."""
+
+    def __init__(self, garage: Garage, vehicles: List[Vehicle]):
+        self.__dict__.update(garage.__dict__)
+        self.metrics = None
+        self.journal = None
+        self._pools = OverlayFreeSpacePools(garage._pools)
+        self.locations: List[Optional[SpaceLocation]] = [None] * len(vehicles)
+        self._indices = {id(vehicle): index for index, vehicle in enumerate(vehicles)}
 
-    def add_vehicles(self, vehicles: List[Vehicle] = None) -> List[Vehicle]:
-        return []
+    def _park(self, vehicle: Vehicle, location: SpaceLocation):
+        self.locations[self._indices[id(vehicle)]] = location
@@ -0,0 +1,213 @@
+import os
+import struct
+import time
+from threading import Lock, Timer
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Union
+
+from garage.compact_layout import CompactLevels
+from garage.free_space_pools import SpaceLocation
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+# A journal file is a header followed by fixed-size, little-endian records:
+#   operation    uint8, one of PARK, REJECT, DEPART
+#   vehicle type uint8
+#   permit       uint8
+#   id length    uint8
+#   level index  uint32
+#   space index  uint32
+#   vehicle id   utf-8, zero padded to ID_SIZE bytes
+MAGIC = b"GRGJ"
+VERSION = 1
+HEADER = struct.Struct("<4sHxx")
+ID_SIZE = 52
+RECORD = struct.Struct(f"<BBBBII{ID_SIZE}s")
+
+PARK = 1
+REJECT = 2
+DEPART = 3
+
+
+def _encoded_id(vehicle_id: Union[str, bytes]) -> bytes:
+    encoded = vehicle_id if isinstance(vehicle_id, bytes) else str(vehicle_id).encode()
+    if len(encoded) > ID_SIZE:
+        raise ValueError(f"Vehicle ID {vehicle_id!r} is longer than {ID_SIZE} bytes.")
+    return encoded
+
+
+def _record(operation: int, vehicle: Vehicle, location: SpaceLocation) -> bytes:
+    vehicle_id = _encoded_id(vehicle.vehicle_id)
+    return RECORD.pack(
+        operation,
+        vehicle.vehicle_type.value,
+        int(vehicle.permit),
+        len(vehicle_id),
+        location[0],
+        location[1],
+        vehicle_id,
+    )
+
+
+class PlacementLog(Protocol):
+    """Receives the placements, rejections and departures of a Garage, which
+    commits once per add_vehicles, remove_vehicles or apply call.
+
+    The Garage passes every arriving vehicle ID to check_ids before it changes any
+    state, so a log that cannot record an ID raises ValueError there.
+    """
+
+    def check_ids(self, vehicle_ids: Iterable[Union[str, bytes]]): ...
+
+    def park(self, vehicle: Vehicle, location: SpaceLocation): ...
+
+    def reject(self, vehicles: Sequence[Vehicle]): ...
+
+    def depart(self, vehicle: Vehicle, location: SpaceLocation): ...
+
+    def commit(self): ...
+
+    def flush(self): ...
+
+    def truncate(self): ...
+
+
+class PlacementJournal:
+    """Append-only write-ahead journal of placements, rejections and departures.
+
+    Records are buffered and written with group commit: the Garage commits once per
+    add_vehicles, remove_vehicles or apply call, and with commit_interval set a
+    commit only reaches the file once that many seconds have passed since the last
+    write; records still buffered when that time is up are written by a timer
+    thread. close() always writes what is buffered. With sync, every write is
+    followed by fsync.
+    """
+
+    path: str
+    commit_interval: Optional[float]
+    sync: bool
+
+    def __init__(self, path: str, commit_interval: float = None, sync: bool = True):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.sync = sync
+        self._file = open(path, "ab")
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+            self._sync()
+        elif (size - HEADER.size) % RECORD.size:
+            # Drop a record cut short by a crash so new records stay aligned.
+            self._file.truncate(size - (size - HEADER.size) % RECORD.size)
+        self._buffer: List[bytes] = []
+        self._lock = Lock()
+        self._last_write = time.monotonic()
+        self._timer: Optional[Timer] = None
+
+    def check_ids(self, vehicle_ids: Iterable[Union[str, bytes]]):
+        """Raises ValueError if any ID is too long to record."""
+        for vehicle_id in vehicle_ids:
+            _encoded_id(vehicle_id)
+
+    def park(self, vehicle: Vehicle, location: SpaceLocation):
+        record = _record(PARK, vehicle, location)
+        with self._lock:
+            self._buffer.append(record)
+
+    def reject(self, vehicles: Sequence[Vehicle]):
+        records = [_record(REJECT, vehicle, (0, 0)) for vehicle in vehicles]
+        with self._lock:
+            self._buffer += records
+
+    def depart(self, vehicle: Vehicle, location: SpaceLocation):
+        record = _record(DEPART, vehicle, location)
+        with self._lock:
+            self._buffer.append(record)
+
+    def commit(self):
+        if self.commit_interval is not None:
+            delay = self._last_write + self.commit_interval - time.monotonic()
+            if delay > 0:
+                with self._lock:
+                    if self._timer is None and self._buffer:
+                        self._timer = Timer(delay, self.flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """Writes the buffered records now, regardless of commit_interval."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            records, self._buffer = self._buffer, []
+            if records:
+                self._file.write(b"".join(records))
+                self._sync()
+            self._last_write = time.monotonic()
+
+    def truncate(self):
+        """Drops every record, once a snapshot holds the state they describe."""
+        with self._lock:
+            self._buffer = []
+            self._file.truncate(HEADER.size)
+            self._sync()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "PlacementJournal":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _sync(self):
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+
+def replay_journal(path: str, levels: Sequence) -> int:
+    """Applies the placements and departures recorded at path to the levels and
+    returns the number of records read.
+
+    Only the final occupant of each space is materialized, and a record cut short
+    by a crash is ignored. Replaying onto a snapshot taken after some of the records
+    gives the same result, since each record sets the state of one space.
+    """
+    with open(path, "rb") as journal:
+        data = journal.read()
+    if len(data) < HEADER.size or HEADER.unpack_from(data) != (MAGIC, VERSION):
+        raise ValueError(f"{path} is not a version {VERSION} garage journal.")
+
+    body = memoryview(data)[HEADER.size :]
+    body = body[: len(body) - len(body) % RECORD.size]
+
+    occupants: Dict[SpaceLocation, Optional[tuple]] = {}
+    for record in RECORD.iter_unpack(body):
+        operation = record[0]
+        if operation == PARK:
+            occupants[record[4], record[5]] = record
+        elif operation == DEPART:
+            occupants[record[4], record[5]] = None
+
+    layout = levels.layout if isinstance(levels, CompactLevels) else None
+    for (level_index, space_index), record in occupants.items():
+        vehicle = None
+        if record is not None:
+            _, vehicle_type, permit, id_length, _, _, vehicle_id = record
+            vehicle = Vehicle(
+                vehicle_type=VehicleType(vehicle_type),
+                vehicle_id=str(vehicle_id[:id_length], "utf-8"),
+                permit=Permit(permit),
+            )
+        if layout is not None:
+            layout.set_vehicle(layout.ordinal(level_index, space_index), vehicle)
+        else:
+            levels[level_index].spaces[space_index].vehicle = vehicle
+
+    return len(body) // RECORD.size
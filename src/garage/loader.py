@@ -0,0 +1,206 @@
+import csv
+import json
+import os
+from functools import lru_cache
+from typing import IO, Dict, Iterable, Iterator
+
+from garage.compact_layout import CompactLayout, CompactLevels
+from garage.garage import Garage
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+# Layout files hold one row per space, grouped by level, with the columns
+#   level, compact, required_permit
+# and arrival files one row per vehicle with the columns
+#   vehicle_id, vehicle_type, permit
+# as CSV with a header row or as JSON Lines. Only level is required in layouts and
+# no column is required in arrivals. Permits are written as names joined by "|",
+# e.g. DISABILITY|PREMIUM, or as ints; vehicle types by name or value.
+ARRIVAL_COLUMNS = ("vehicle_id", "vehicle_type", "permit")
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+LOAD_BATCH_SIZE = 4096
+
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"", "0", "false", "no", "n"}
+
+
+def file_format(path: str) -> str:
+    row_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if row_format is None:
+        raise ValueError(f"{path} is not a CSV or JSON Lines file.")
+    return row_format
+
+
+def read_rows(path: str) -> Iterator[Dict[str, object]]:
+    """Streams the rows of a CSV or JSON Lines file as dicts, one line at a time."""
+    row_format = file_format(path)
+    with open(path, newline="" if row_format == "csv" else None) as rows:
+        if row_format == "csv":
+            yield from csv.DictReader(rows)
+            return
+
+        for line_number, line in enumerate(rows, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"{path}:{line_number}: {error}") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{line_number}: Expected a JSON object.")
+            yield row
+
+
+def field_value(value):
+    """Passes on a str, int or missing field value; JSON rows may hold lists,
+    objects or floats, which no field takes and which the caches cannot hash."""
+    if value is None or isinstance(value, (str, int)):
+        return value
+    raise ValueError(f"Expected a string or integer, got {value!r}.")
+
+
+def parse_permit(value) -> Permit:
+    return _parse_permit(field_value(value))
+
+
+def parse_vehicle_type(value) -> VehicleType:
+    return _parse_vehicle_type(field_value(value))
+
+
+def parse_flag(value) -> bool:
+    return _parse_flag(field_value(value))
+
+
+# Field values repeat heavily, so each distinct one is parsed once.
+@lru_cache(maxsize=256)
+def _parse_permit(value) -> Permit:
+    if value is None or isinstance(value, int):
+        return Permit(value or 0)
+    value = value.strip()
+    if value.isdigit():
+        return Permit(int(value))
+
+    permit = Permit.NONE
+    for name in filter(None, (name.strip() for name in value.upper().split("|"))):
+        try:
+            permit |= Permit[name]
+        except KeyError:
+            raise ValueError(f"Unknown permit {name!r}.") from None
+    return permit
+
+
+def format_permit(permit: int) -> str:
+    """Writes a permit the way parse_permit reads it, e.g. DISABILITY|PREMIUM."""
+    names = [member.name for member in Permit if member and member & permit]
+    return "|".join(names) or Permit.NONE.name
+
+
+@lru_cache(maxsize=256)
+def _parse_vehicle_type(value) -> VehicleType:
+    if value is None or value == "":
+        return VehicleType.Car
+    if isinstance(value, int) or value.strip().isdigit():
+        return VehicleType(int(value))
+    for vehicle_type in VehicleType:
+        if vehicle_type.name.lower() == value.strip().lower():
+            return vehicle_type
+    raise ValueError(f"Unknown vehicle type {value!r}.")
+
+
+@lru_cache(maxsize=256)
+def _parse_flag(value) -> bool:
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    flag = str(value).strip().lower()
+    if flag in _TRUE:
+        return True
+    if flag in _FALSE:
+        return False
+    raise ValueError(f"Expected a true or false flag, got {value!r}.")
+
+
+def load_layout(path: str) -> CompactLevels:
+    """Streams a layout file into a CompactLayout, one level at a time, so no
+    ParkingSpace objects are built."""
+    layout = CompactLayout()
+    seen = set()
+    level = None
+    compact = bytearray()
+    required_permits = bytearray()
+    for row_number, row in enumerate(read_rows(path), 1):
+        try:
+            row_level = field_value(row.get("level"))
+            if row_level is None:
+                raise ValueError("Missing level.")
+            if row_level != level:
+                if row_level in seen:
+                    raise ValueError(f"Level {row_level!r} is not contiguous.")
+                if level is not None:
+                    layout.add_level(compact, required_permits)
+                    compact, required_permits = bytearray(), bytearray()
+                seen.add(row_level)
+                level = row_level
+            compact.append(parse_flag(row.get("compact")))
+            required_permits.append(parse_permit(row.get("required_permit")))
+        except ValueError as error:
+            raise ValueError(f"{path}: row {row_number}: {error}") from None
+    if level is not None:
+        layout.add_level(compact, required_permits)
+    return layout.levels()
+
+
+def read_arrivals(path: str) -> Iterator[Vehicle]:
+    """Lazily yields one Vehicle per arrival row."""
+    for row_number, row in enumerate(read_rows(path), 1):
+        try:
+            yield Vehicle(
+                vehicle_type=parse_vehicle_type(row.get("vehicle_type")),
+                vehicle_id=str(row.get("vehicle_id") or "") or None,
+                permit=parse_permit(row.get("permit")),
+            )
+        except ValueError as error:
+            raise ValueError(f"{path}: row {row_number}: {error}") from None
+
+
+def load_arrivals(
+    garage: Garage, path: str, batch_size: int = LOAD_BATCH_SIZE
+) -> Iterator[Vehicle]:
+    """Places the arrivals in path batch by batch and yields each rejected vehicle
+    as soon as its batch is decided. Only one batch is held in memory."""
+    return garage.add_vehicle_stream(read_arrivals(path), batch_size)
+
+
+class RejectionWriter:
+    """Writes rejected vehicles as arrival rows, in the format of the path."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._format = file_format(path)
+        self._file: IO[str] = open(path, "w", newline="")
+        self._writer = None
+        if self._format == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(ARRIVAL_COLUMNS)
+
+    def write(self, vehicles: Iterable[Vehicle]):
+        for vehicle in vehicles:
+            row = [
+                vehicle.vehicle_id,
+                vehicle.vehicle_type.name,
+                format_permit(vehicle.permit),
+            ]
+            if self._writer is not None:
+                self._writer.writerow(row)
+            else:
+                self._file.write(json.dumps(dict(zip(ARRIVAL_COLUMNS, row))) + "\n")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "RejectionWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,233 @@
+import os
+import sys
+import tracemalloc
+from collections import deque
+from enum import Enum
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Dict, List, Mapping, NamedTuple, Sequence, Set
+
+from garage.compact_layout import FREE, CompactLayout, CompactLevels
+from garage.vehicle import Vehicle
+
+# Components whose bytes grow with the number of spaces, and with the number of
+# parked vehicles.
+SPACE_COMPONENTS = ("levels", "spaces", "layout", "free_pools", "counters")
+VEHICLE_COMPONENTS = ("vehicles", "vehicle_ids", "locations", "parked_index")
+
+_PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Objects owned by the interpreter rather than by any one garage.
+_SHARED_TYPES = (
+    type,
+    ModuleType,
+    FunctionType,
+    BuiltinFunctionType,
+    MethodType,
+    Enum,
+    bool,
+    type(None),
+)
+
+
+class LevelMemory(NamedTuple):
+    # The level object and its list of spaces.
+    level: int
+    spaces: int
+    vehicles: int
+    vehicle_ids: int
+
+    @property
+    def total(self) -> int:
+        return sum(self)
+
+
+class MemoryReport(NamedTuple):
+    space_count: int
+    vehicle_count: int
+    # Bytes by component, each object counted once under the first component
+    # that reaches it.
+    components: Dict[str, int]
+    levels: List[LevelMemory]
+    # Live bytes traced by tracemalloc per garage source file, when tracing. These
+    # cover every garage in the process.
+    allocations: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.components.values())
+
+    @property
+    def bytes_per_space(self) -> float:
+        space_bytes = sum(self.components.get(name, 0) for name in SPACE_COMPONENTS)
+        return space_bytes / self.space_count if self.space_count else 0.0
+
+    @property
+    def bytes_per_vehicle(self) -> float:
+        vehicle_bytes = sum(self.components.get(name, 0) for name in VEHICLE_COMPONENTS)
+        return vehicle_bytes / self.vehicle_count if self.vehicle_count else 0.0
+
+
+def deep_sizeof(root: object, seen: Set[int]) -> int:
+    """Sums sys.getsizeof over root and everything reachable from it through
+    containers, __dict__ and __slots__, skipping objects already in seen and adding
+    the rest to it."""
+    size = 0
+    pending = [root]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or _is_shared(obj):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            # Iterates list subclasses without calling an overridden __getitem__.
+            pending.extend(iter(obj))
+        if hasattr(obj, "__dict__"):
+            pending.append(vars(obj))
+        for cls in type(obj).__mro__:
+            slots = cls.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if hasattr(obj, name):
+                    pending.append(getattr(obj, name))
+    return size
+
+
+def measure_memory(
+    levels: List,
+    indexes: Mapping[str, Sequence[object]],
+    space_count: int,
+    vehicle_count: int,
+) -> MemoryReport:
+    """Breaks down the bytes held by a garage's levels and then by each of its
+    indexes, in the order given."""
+    # Traced before the walk allocates its own bookkeeping.
+    allocations = _traced_allocations()
+    seen: Set[int] = set()
+    layout = levels.layout if isinstance(levels, CompactLevels) else None
+    if layout is None:
+        level_memory = [_measure_level(level, seen) for level in levels]
+    else:
+        level_memory = _measure_layout_levels(layout, seen)
+    components = {
+        "levels": sum(memory.level for memory in level_memory),
+        "spaces": sum(memory.spaces for memory in level_memory),
+        "vehicles": sum(memory.vehicles for memory in level_memory),
+        "vehicle_ids": sum(memory.vehicle_ids for memory in level_memory),
+    }
+
+    for name, roots in indexes.items():
+        components[name] = sum(deep_sizeof(root, seen) for root in roots)
+    if layout is not None:
+        # Walked last, so the vehicles and counters it shares with the garage
+        # are counted under those.
+        components["layout"] = _layout_remainder(levels, seen)
+
+    return MemoryReport(
+        space_count=space_count,
+        vehicle_count=vehicle_count,
+        components=components,
+        levels=level_memory,
+        allocations=allocations,
+    )
+
+
+def _measure_level(level, seen: Set[int]) -> LevelMemory:
+    level_bytes = sys.getsizeof(level) + sys.getsizeof(level.spaces)
+    if hasattr(level, "__dict__"):
+        level_bytes += sys.getsizeof(vars(level))
+    space_bytes = vehicle_bytes = id_bytes = 0
+    for space in level.spaces:
+        space_bytes += sys.getsizeof(space)
+        if not isinstance(space.required_permit, Enum):
+            space_bytes += deep_sizeof(space.required_permit, seen)
+        vehicle = space.vehicle
+        if vehicle is not None:
+            vehicle_bytes += _vehicle_bytes(vehicle, seen)
+            id_bytes += deep_sizeof(vehicle.vehicle_id, seen)
+    return LevelMemory(level_bytes, space_bytes, vehicle_bytes, id_bytes)
+
+
+def _measure_layout_levels(layout: CompactLayout, seen: Set[int]) -> List[LevelMemory]:
+    # Unread vehicles of a snapshot layout live in its mapping as a type byte, a
+    # permit byte and their stored ID.
+    id_offsets = getattr(layout, "id_offsets", None)
+    bytes_per_space = sum(map(_itemsize, _space_columns(layout)))
+
+    level_memory = []
+    offsets = layout.level_offsets
+    for level_index in range(layout.level_count):
+        start, stop = offsets[level_index], offsets[level_index + 1]
+        vehicle_bytes = id_bytes = 0
+        for slot in layout.occupants[start:stop]:
+            if slot == FREE:
+                continue
+            vehicle = list.__getitem__(layout.vehicles, slot)
+            if isinstance(vehicle, Vehicle):
+                vehicle_bytes += _vehicle_bytes(vehicle, seen)
+                id_bytes += deep_sizeof(vehicle.vehicle_id, seen)
+            elif id_offsets is not None:
+                vehicle_bytes += 2
+                id_bytes += id_offsets[slot + 1] - id_offsets[slot]
+        level_memory.append(
+            LevelMemory(
+                level=offsets.itemsize,
+                spaces=(stop - start) * bytes_per_space,
+                vehicles=vehicle_bytes,
+                vehicle_ids=id_bytes,
+            )
+        )
+    return level_memory
+
+
+def _layout_remainder(levels: CompactLevels, seen: Set[int]) -> int:
+    # Column contents are attributed to the levels; the column objects beyond
+    # their contents, and everything else the layout holds, are the layout's.
+    layout = levels.layout
+    columns = _space_columns(layout) + [layout.level_offsets]
+    overhead = sum(
+        max(sys.getsizeof(column) - len(column) * _itemsize(column), 0)
+        for column in columns
+    )
+    seen.update(id(column) for column in columns)
+    return overhead + deep_sizeof(layout, seen) + deep_sizeof(levels, seen)
+
+
+def _space_columns(layout: CompactLayout) -> list:
+    return [layout.compact, layout.required_permits, layout.occupants]
+
+
+def _itemsize(column) -> int:
+    # bytearray columns hold one byte per item but have no itemsize.
+    return getattr(column, "itemsize", 1)
+
+
+def _vehicle_bytes(vehicle: Vehicle, seen: Set[int]) -> int:
+    if id(vehicle) in seen:
+        return 0
+    seen.add(id(vehicle))
+    return sys.getsizeof(vehicle)
+
+
+def _is_shared(obj: object) -> bool:
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        # CPython caches the small ints.
+        return -5 <= obj <= 256
+    if isinstance(obj, str):
+        return not obj
+    return isinstance(obj, _SHARED_TYPES)
+
+
+def _traced_allocations() -> Dict[str, int]:
+    if not tracemalloc.is_tracing():
+        return {}
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(True, os.path.join(_PACKAGE_DIRECTORY, "*"))]
+    )
+    return {
+        os.path.basename(statistic.traceback[0].filename): statistic.size
+        for statistic in snapshot.statistics("filename")
+    }
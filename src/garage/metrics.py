@@ -0,0 +1,37 @@
+from collections import defaultdict
+from typing import Dict, Optional, Protocol, Tuple
+
+
+class MetricsSink(Protocol):
+    """Receives placement pipeline metrics from a Garage.
+
+    Names are dotted, e.g. "phase.premium.placed" or "rejected.capacity". Values
+    recorded with a level index are per-level breakdowns of the same name.
+    """
+
+    def record(self, name: str, value: int, level: Optional[int] = None): ...
+
+
+class PhaseStats:
+    __slots__ = ("considered", "probed")
+
+    def __init__(self):
+        self.considered = 0
+        self.probed = 0
+
+
+class InMemoryMetrics:
+    """MetricsSink that sums every recorded value, for tests and ad-hoc profiling."""
+
+    totals: Dict[str, int]
+    levels: Dict[Tuple[str, int], int]
+
+    def __init__(self):
+        self.totals = defaultdict(int)
+        self.levels = defaultdict(int)
+
+    def record(self, name: str, value: int, level: Optional[int] = None):
+        if level is None:
+            self.totals[name] += value
+        else:
+            self.levels[name, level] += value
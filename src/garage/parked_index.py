@@ -0,0 +1,71 @@
+from typing import Dict, Iterator, Optional, Tuple
+
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+GroupKey = Tuple[VehicleType, Permit]
+
+
+class ParkedVehicleIndex:
+    """Parked vehicles grouped by level index, then by (vehicle type, permit), kept
+    current by the owning Garage on every placement, departure and renumbering.
+
+    There are only a handful of types and permits per level, so a query visits a
+    few groups and then iterates or counts the matching vehicles directly.
+    """
+
+    def __init__(self):
+        self._levels: Dict[int, Dict[GroupKey, Dict[str, Vehicle]]] = {}
+
+    def add(self, vehicle: Vehicle, level_index: int):
+        groups = self._levels.get(level_index)
+        if groups is None:
+            groups = self._levels[level_index] = {}
+        key = vehicle.vehicle_type, vehicle.permit
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {}
+        group[vehicle.vehicle_id] = vehicle
+
+    def remove(self, vehicle: Vehicle, level_index: int):
+        groups = self._levels[level_index]
+        key = vehicle.vehicle_type, vehicle.permit
+        group = groups[key]
+        del group[vehicle.vehicle_id]
+        if not group:
+            del groups[key]
+            if not groups:
+                del self._levels[level_index]
+
+    def move(self, vehicle: Vehicle, old_level_index: int, new_level_index: int):
+        if old_level_index != new_level_index:
+            self.remove(vehicle, old_level_index)
+            self.add(vehicle, new_level_index)
+
+    def groups(
+        self,
+        permit: int = Permit.NONE,
+        vehicle_type: Optional[VehicleType] = None,
+        level_index: Optional[int] = None,
+    ) -> Iterator[Dict[str, Vehicle]]:
+        """Yields the groups of vehicles holding every permit in permit, of
+        vehicle_type and on level_index, where given."""
+        if level_index is None:
+            levels = self._levels.values()
+        else:
+            levels = [self._levels.get(level_index, {})]
+
+        permit = int(permit)
+        # Permit flag arithmetic is slow, so each key is matched once per query.
+        matches: Dict[GroupKey, bool] = {}
+        for groups in levels:
+            for key, group in groups.items():
+                match = matches.get(key)
+                if match is None:
+                    group_type, group_permit = key
+                    match = matches[key] = int(group_permit) & permit == permit and (
+                        vehicle_type is None or group_type is vehicle_type
+                    )
+                if match:
+                    yield group
@@ -1,13 +1,19 @@
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
 from garage.parking_space import ParkingSpace
 
+if TYPE_CHECKING:
+    from garage.space_counters import SpaceCounters
+
 
 class ParkingLevel:
     spaces: List[ParkingSpace]
+    # Maintained by the Garage holding this level.
+    counters: Optional["SpaceCounters"]
 
     def __init__(
         self,
         spaces: List[ParkingSpace] = None,
     ):
         self.spaces = spaces or []
+        self.counters = None
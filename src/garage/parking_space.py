@@ -5,6 +5,8 @@ from garage.vehicle import Vehicle
 
 
 class ParkingSpace:
+    __slots__ = ("compact", "required_permit", "vehicle")
+
     compact: bool
     required_permit: Union[Permit, int]
     vehicle: Vehicle
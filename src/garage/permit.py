@@ -1,5 +1,8 @@
 from enum import IntFlag
 
+# Journals, snapshots, compact layouts and fleet batches hold a permit in one byte.
+MAX_PERMIT = 0xFF
+
 
 class Permit(IntFlag):
     NONE = 0
@@ -0,0 +1,155 @@
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from garage.free_space_pools import Category
+from garage.permit import Permit
+from garage.vehicle_type import VehicleType
+
+# Vehicle codes pack the permit and the vehicle type value into one small int:
+# permit << TYPE_BITS | vehicle type value.
+TYPE_BITS = max(member.value for member in VehicleType).bit_length()
+
+
+def vehicle_code(vehicle_type: VehicleType, permit: int) -> int:
+    return int(permit) << TYPE_BITS | vehicle_type.value
+
+
+class PlacementTier(NamedTuple):
+    name: str
+    # Vehicles enter the tier if they hold every permit in vehicle_permit and, when
+    # vehicle_types is given, are one of those types.
+    vehicle_permit: int = Permit.NONE
+    vehicle_types: Optional[Tuple[VehicleType, ...]] = None
+    # The tier fills spaces requiring every permit in space_permit, or only spaces
+    # requiring no permit when space_permit is NONE; compact narrows by space flag.
+    space_permit: int = Permit.NONE
+    compact: Optional[bool] = None
+    # Vehicles holding this permit are placed first within the tier; ties keep
+    # arrival order.
+    prioritized_permit: int = Permit.NONE
+
+    def admits_vehicle(self, vehicle_type: VehicleType, permit: int) -> bool:
+        return permit & self.vehicle_permit == self.vehicle_permit and (
+            self.vehicle_types is None or vehicle_type in self.vehicle_types
+        )
+
+    def admits_category(self, category: Category) -> bool:
+        required_permit, compact = category
+        if self.space_permit:
+            fills = required_permit & self.space_permit == self.space_permit
+        else:
+            fills = required_permit == Permit.NONE
+        return fills and (self.compact is None or compact == self.compact)
+
+
+class RuleTables(NamedTuple):
+    """PlacementRules compiled against the categories of one garage.
+
+    Every table is indexed by tier, then by vehicle code, so the allocator only
+    does int and list lookups.
+    """
+
+    tier_names: Tuple[str, ...]
+    # Clears the permit bits the tables do not cover from a vehicle code. No tier,
+    # Permit member or space names those bits, so they cannot change placement.
+    code_mask: int
+    admitted: List[bytes]
+    # None for tiers without a prioritized permit.
+    prioritized: List[Optional[bytes]]
+    eligible: List[List[Tuple[Category, ...]]]
+
+
+class PlacementRules(NamedTuple):
+    """Placement rules as data: tiers are tried in order, so their order is the
+    preference order of the space categories each vehicle may use."""
+
+    tiers: Tuple[PlacementTier, ...]
+    # Vehicle types allowed in compact spaces.
+    compact_vehicle_types: Tuple[VehicleType, ...] = (VehicleType.Compact,)
+
+    def vehicle_may_use(
+        self, vehicle_type: VehicleType, permit: int, category: Category
+    ) -> bool:
+        required_permit, compact = category
+        if required_permit & ~permit:
+            return False
+        return not compact or vehicle_type in self.compact_vehicle_types
+
+    def permit_bits(self, categories: Iterable[Category] = ()) -> int:
+        """Number of permit bits the tables cover: every Permit member, every
+        permit named by a tier and every permit a space category requires."""
+        mask = 0
+        for member in Permit:
+            mask |= member.value
+        for tier in self.tiers:
+            mask |= tier.vehicle_permit | tier.space_permit | tier.prioritized_permit
+        for required_permit, _ in categories:
+            mask |= required_permit
+        return int(mask).bit_length()
+
+    def compile(self, categories: Iterable[Category]) -> RuleTables:
+        categories = sorted(categories)
+        permit_bits = self.permit_bits(categories)
+        code_count = 1 << (permit_bits + TYPE_BITS)
+        vehicles = [
+            (vehicle_code(vehicle_type, permit), vehicle_type, permit)
+            for permit in range(1 << permit_bits)
+            for vehicle_type in VehicleType
+        ]
+
+        admitted, prioritized, eligible = [], [], []
+        for tier in self.tiers:
+            tier_admitted = bytearray(code_count)
+            tier_prioritized = bytearray(code_count)
+            tier_eligible: List[Tuple[Category, ...]] = [()] * code_count
+            for code, vehicle_type, permit in vehicles:
+                tier_prioritized[code] = bool(permit & tier.prioritized_permit)
+                if not tier.admits_vehicle(vehicle_type, permit):
+                    continue
+                tier_admitted[code] = True
+                tier_eligible[code] = tuple(
+                    category
+                    for category in categories
+                    if tier.admits_category(category)
+                    and self.vehicle_may_use(vehicle_type, permit, category)
+                )
+            admitted.append(bytes(tier_admitted))
+            prioritized.append(
+                bytes(tier_prioritized) if tier.prioritized_permit else None
+            )
+            eligible.append(tier_eligible)
+
+        return RuleTables(
+            tier_names=tuple(tier.name for tier in self.tiers),
+            code_mask=code_count - 1,
+            admitted=admitted,
+            prioritized=prioritized,
+            eligible=eligible,
+        )
+
+
+PLACEMENT_RULES = PlacementRules(
+    tiers=(
+        PlacementTier(
+            name="disability",
+            vehicle_permit=Permit.DISABILITY,
+            space_permit=Permit.DISABILITY,
+        ),
+        PlacementTier(
+            name="premium",
+            vehicle_permit=Permit.PREMIUM,
+            space_permit=Permit.PREMIUM,
+            prioritized_permit=Permit.DISABILITY,
+        ),
+        PlacementTier(
+            name="compact",
+            vehicle_types=(VehicleType.Compact,),
+            compact=True,
+            prioritized_permit=Permit.PREMIUM,
+        ),
+        PlacementTier(
+            name="standard",
+            compact=False,
+            prioritized_permit=Permit.PREMIUM,
+        ),
+    )
+)
@@ -0,0 +1,258 @@
+import heapq
+import math
+import random
+import time
+from collections import Counter
+from itertools import accumulate, count
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from garage.garage import Garage
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+Payload = TypeVar("Payload")
+
+# (vehicle type, permit) an arrival is counted under.
+VehicleCategory = Tuple[VehicleType, Permit]
+
+# Event kinds, in the order they are handled within one tick: spaces freed by
+# departures can be taken by arrivals of the same tick.
+DEPARTURE = 0
+ARRIVAL = 1
+SAMPLE = 2
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def exponential_dwell(mean: float) -> Callable[[random.Random], float]:
+    """Dwell times in seconds, exponentially distributed around mean."""
+    return lambda rng: rng.expovariate(1.0 / mean)
+
+
+def lognormal_dwell(median: float, sigma: float) -> Callable[[random.Random], float]:
+    """Dwell times in seconds with a long tail, as seen for commuter parking."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+class TrafficMix(NamedTuple):
+    # A constant rate, or hourly rates for one day that repeat every day.
+    arrivals_per_hour: Union[float, Sequence[float]] = 1000.0
+    vehicle_types: Dict[VehicleType, float] = {
+        VehicleType.Car: 0.7,
+        VehicleType.Truck: 0.1,
+        VehicleType.Compact: 0.2,
+    }
+    permits: Dict[Permit, float] = {
+        Permit.NONE: 0.8,
+        Permit.DISABILITY: 0.05,
+        Permit.PREMIUM: 0.13,
+        Permit.DISABILITY | Permit.PREMIUM: 0.02,
+    }
+    dwell: Callable[[random.Random], float] = exponential_dwell(2 * HOUR)
+
+    def rate_at(self, seconds: float) -> float:
+        """Arrivals per second at a time of the simulation."""
+        rates = self.arrivals_per_hour
+        if isinstance(rates, (int, float)):
+            return rates / HOUR
+        return rates[int(seconds % DAY // HOUR) % len(rates)] / HOUR
+
+
+class SimulationReport(NamedTuple):
+    duration: float
+    wall_seconds: float
+    arrivals: Dict[VehicleCategory, int]
+    rejections: Dict[VehicleCategory, int]
+    departures: int
+    # (seconds, parked vehicles) every sample interval.
+    occupancy: List[Tuple[float, int]]
+
+    @property
+    def events(self) -> int:
+        return sum(self.arrivals.values()) + self.departures
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def rejection_rates(self) -> Dict[VehicleCategory, float]:
+        return {
+            category: self.rejections.get(category, 0) / arrivals
+            for category, arrivals in self.arrivals.items()
+        }
+
+
+class EventScheduler(Generic[Payload]):
+    """Events bucketed by (tick, kind), with a heap over the distinct buckets.
+
+    Everything scheduled for the same tick and kind pops as one batch, so a busy
+    tick costs one heap push and pop however many events it holds.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[Payload]] = {}
+        self._heap: List[Tuple[int, int]] = []
+
+    def schedule(self, tick: int, kind: int, payload: Payload = None):
+        key = tick, kind
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = []
+            heapq.heappush(self._heap, key)
+        bucket.append(payload)
+
+    @property
+    def next_tick(self) -> Optional[int]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self) -> Tuple[int, int, List[Payload]]:
+        key = heapq.heappop(self._heap)
+        return key[0], key[1], self._buckets.pop(key)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+
+class Simulation:
+    """Replays generated traffic through a Garage on a simulated clock.
+
+    Arrivals form a Poisson process at the mix's rate. Time advances in ticks, and
+    the arrivals of each tick are placed with one add_vehicles call at its end;
+    each parked vehicle then departs after a dwell drawn from the mix, rounded up
+    to a tick, with every departure of a tick in one remove_vehicles call.
+    """
+
+    def __init__(
+        self,
+        garage: Garage,
+        mix: TrafficMix = TrafficMix(),
+        seed: int = 0,
+        tick: float = 60.0,
+        sample_interval: float = 15 * 60.0,
+    ):
+        if tick <= 0 or sample_interval <= 0:
+            raise ValueError("tick and sample_interval must be positive.")
+        self.garage = garage
+        self.mix = mix
+        self.tick = tick
+        self.sample_ticks = max(1, round(sample_interval / tick))
+        self._rng = random.Random(seed)
+        self._categories = [
+            (vehicle_type, permit)
+            for vehicle_type in mix.vehicle_types
+            for permit in mix.permits
+        ]
+        self._weights = list(
+            accumulate(
+                type_weight * permit_weight
+                for type_weight in mix.vehicle_types.values()
+                for permit_weight in mix.permits.values()
+            )
+        )
+        self._vehicle_ids = count()
+        self._tick = 0
+        self._scheduler: EventScheduler[str] = EventScheduler()
+        self._scheduler.schedule(0, SAMPLE)
+        self._scheduler.schedule(1, ARRIVAL)
+
+    @property
+    def now(self) -> float:
+        """Seconds simulated so far."""
+        return self._tick * self.tick
+
+    def run(self, duration: float) -> SimulationReport:
+        """Simulates the next duration seconds of traffic and reports on them.
+
+        Vehicles still parked at the end depart in a later run.
+        """
+        last_tick = self._tick + math.ceil(duration / self.tick)
+        scheduler = self._scheduler
+        arrivals: Counter = Counter()
+        rejections: Counter = Counter()
+        departures = 0
+        occupancy = []
+
+        started = time.perf_counter()
+        while scheduler.next_tick is not None and scheduler.next_tick <= last_tick:
+            tick, kind, payloads = scheduler.pop()
+            if kind == DEPARTURE:
+                departures += len(self.garage.remove_vehicles(payloads))
+            elif kind == ARRIVAL:
+                self._arrive(tick, scheduler, arrivals, rejections)
+                scheduler.schedule(tick + 1, ARRIVAL)
+            else:
+                occupancy.append((tick * self.tick, self.garage.counters.occupancy))
+                scheduler.schedule(tick + self.sample_ticks, SAMPLE)
+
+        duration = (last_tick - self._tick) * self.tick
+        self._tick = last_tick
+        return SimulationReport(
+            duration=duration,
+            wall_seconds=time.perf_counter() - started,
+            arrivals=dict(arrivals),
+            rejections=dict(rejections),
+            departures=departures,
+            occupancy=occupancy,
+        )
+
+    def _arrive(
+        self,
+        tick: int,
+        scheduler: EventScheduler[str],
+        arrivals: Counter,
+        rejections: Counter,
+    ):
+        rng = self._rng
+        start = (tick - 1) * self.tick
+        rate = self.mix.rate_at(start)
+        if rate <= 0:
+            return
+
+        # Arrival times within the tick, from exponential gaps.
+        times = []
+        arrival_time = start + rng.expovariate(rate)
+        end = start + self.tick
+        while arrival_time < end:
+            times.append(arrival_time)
+            arrival_time += rng.expovariate(rate)
+        if not times:
+            return
+
+        categories = rng.choices(
+            self._categories, cum_weights=self._weights, k=len(times)
+        )
+        vehicles = [
+            Vehicle(
+                vehicle_type=vehicle_type,
+                vehicle_id=f"sim-{next(self._vehicle_ids)}",
+                permit=permit,
+            )
+            for vehicle_type, permit in categories
+        ]
+        arrivals.update(categories)
+
+        rejected = {id(vehicle) for vehicle in self.garage.add_vehicles(vehicles)}
+        dwell = self.mix.dwell
+        for vehicle, arrival_time, category in zip(vehicles, times, categories):
+            if id(vehicle) in rejected:
+                rejections[category] += 1
+                continue
+            departure_tick = math.ceil((arrival_time + dwell(rng)) / self.tick)
+            scheduler.schedule(
+                max(departure_tick, tick + 1), DEPARTURE, vehicle.vehicle_id
+            )
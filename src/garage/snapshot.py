@@ -0,0 +1,169 @@
+import mmap
+import struct
+from array import array
+from typing import BinaryIO, Iterator, List, Sequence, Tuple
+
+from garage.compact_layout import FREE, CompactLayout, CompactLevels
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+# Layout of a snapshot file, little-endian, every section padded to 8 bytes:
+#   header           magic, version, level, space and vehicle counts, id heap size
+#   level_offsets    int64 x (levels + 1)
+#   occupants        int64 x spaces, index into the vehicle columns or -1
+#   compact          uint8 x spaces
+#   required_permits uint8 x spaces
+#   vehicle_types    uint8 x vehicles
+#   vehicle_permits  uint8 x vehicles
+#   id_offsets       int64 x (vehicles + 1), into the utf-8 id heap
+#   id_heap          bytes
+MAGIC = b"GRGS"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxqqqq")
+ALIGNMENT = 8
+
+_UNLOADED = object()
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _write_section(output: BinaryIO, data: bytes):
+    output.write(data)
+    output.write(bytes(_padding(len(data))))
+
+
+def write_snapshot(levels: Sequence, path: str):
+    """Writes the layout and occupancy of the levels to path."""
+    if isinstance(levels, CompactLevels):
+        layout = levels.layout
+    else:
+        layout = CompactLayout.from_levels(levels)
+
+    occupants = array("q", [FREE]) * layout.space_count
+    vehicles: List[Vehicle] = []
+    for ordinal, slot in enumerate(layout.occupants):
+        if slot != FREE:
+            occupants[ordinal] = len(vehicles)
+            vehicles.append(layout.vehicles[slot])
+
+    ids = [vehicle.vehicle_id.encode() for vehicle in vehicles]
+    id_offsets = array("q", [0])
+    for encoded in ids:
+        id_offsets.append(id_offsets[-1] + len(encoded))
+
+    with open(path, "wb") as output:
+        output.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                layout.level_count,
+                layout.space_count,
+                len(vehicles),
+                id_offsets[-1],
+            )
+        )
+        _write_section(output, array("q", layout.level_offsets).tobytes())
+        _write_section(output, occupants.tobytes())
+        _write_section(output, bytes(layout.compact))
+        _write_section(output, bytes(layout.required_permits))
+        _write_section(
+            output, bytes(vehicle.vehicle_type.value for vehicle in vehicles)
+        )
+        _write_section(output, bytes(int(vehicle.permit) for vehicle in vehicles))
+        _write_section(output, id_offsets.tobytes())
+        _write_section(output, b"".join(ids))
+
+
+class SnapshotVehicles(list):
+    """Vehicle slots of a snapshot, materialized into Vehicle objects on first
+    access."""
+
+    def __init__(self, layout: "SnapshotLayout", count: int):
+        super().__init__([_UNLOADED] * count)
+        self._layout = layout
+
+    def __getitem__(self, slot):
+        vehicle = super().__getitem__(slot)
+        if vehicle is _UNLOADED:
+            layout = self._layout
+            vehicle = Vehicle(
+                vehicle_type=VehicleType(layout.vehicle_types[slot]),
+                vehicle_id=layout.stored_vehicle_id(slot),
+                permit=Permit(layout.vehicle_permits[slot]),
+            )
+            super().__setitem__(slot, vehicle)
+        return vehicle
+
+
+class SnapshotLayout(CompactLayout):
+    """CompactLayout whose columns are views into a memory-mapped snapshot.
+
+    The mapping is copy-on-write, so placements and departures never touch the file.
+    Adding or removing levels or spaces copies the columns into regular arrays first.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        with open(path, "rb") as snapshot:
+            self._mapping = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        view = memoryview(self._mapping)
+        magic, version, level_count, space_count, vehicle_count, heap_size = (
+            HEADER.unpack_from(view)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} garage snapshot.")
+
+        position = HEADER.size
+
+        def section(size: int) -> memoryview:
+            nonlocal position
+            start = position
+            position += size + _padding(size)
+            return view[start : start + size]
+
+        self.level_offsets = section(8 * (level_count + 1)).cast("q")
+        self.occupants = section(8 * space_count).cast("q")
+        self.compact = section(space_count)
+        self.required_permits = section(space_count)
+        self.vehicle_types = section(vehicle_count)
+        self.vehicle_permits = section(vehicle_count)
+        self.id_offsets = section(8 * (vehicle_count + 1)).cast("q")
+        self.id_heap = section(heap_size)
+        self.vehicles = SnapshotVehicles(self, vehicle_count)
+
+    def stored_vehicle_id(self, slot: int) -> str:
+        return str(
+            self.id_heap[self.id_offsets[slot] : self.id_offsets[slot + 1]], "utf-8"
+        )
+
+    def vehicle_id(self, slot: int) -> str:
+        if list.__getitem__(self.vehicles, slot) is _UNLOADED:
+            return self.stored_vehicle_id(slot)
+        return super().vehicle_id(slot)
+
+    def occupied_ids(self) -> Iterator[Tuple[int, int, str]]:
+        # Decodes the id heap in one pass instead of slicing the mapping per vehicle.
+        heap = bytes(self.id_heap)
+        offsets = self.id_offsets.tolist()
+        stored_ids = [
+            str(heap[start:stop], "utf-8") for start, stop in zip(offsets, offsets[1:])
+        ]
+        for level_index, space_index, slot in self._occupied_slots():
+            if (
+                slot < len(stored_ids)
+                and list.__getitem__(self.vehicles, slot) is _UNLOADED
+            ):
+                yield level_index, space_index, stored_ids[slot]
+            else:
+                yield level_index, space_index, super().vehicle_id(slot)
+
+    def _detach(self):
+        if isinstance(self.compact, memoryview):
+            self.compact = bytearray(self.compact)
+            self.required_permits = bytearray(self.required_permits)
+            self.occupants = array("q", self.occupants)
+            self.level_offsets = array("q", self.level_offsets)
@@ -0,0 +1,130 @@
+from collections import Counter
+from typing import Dict, Iterable
+
+from garage.compact_layout import FREE, CompactLayout
+from garage.free_space_pools import Category, space_category
+from garage.parking_space import ParkingSpace
+
+
+class SpaceCounters:
+    """Capacity, occupancy and free spaces per (required permit, compact) category,
+    kept current by the owning Garage on every placement and departure."""
+
+    __slots__ = ("capacity", "occupancy", "free", "held")
+
+    capacity: int
+    occupancy: int
+    free: Dict[Category, int]
+    # Free spaces held by reservations, which count as free above.
+    held: Dict[Category, int]
+
+    def __init__(self):
+        self.capacity = 0
+        self.occupancy = 0
+        self.free = {}
+        self.held = {}
+
+    @classmethod
+    def from_spaces(cls, spaces: Iterable[ParkingSpace]) -> "SpaceCounters":
+        counters = cls()
+        for space in spaces:
+            counters.add_space(space_category(space), space.vehicle is not None)
+        return counters
+
+    @classmethod
+    def from_layout(cls, layout: CompactLayout, level_index: int) -> "SpaceCounters":
+        start = layout.level_offsets[level_index]
+        stop = layout.level_offsets[level_index + 1]
+        categories = list(
+            zip(
+                layout.required_permits[start:stop],
+                map(bool, layout.compact[start:stop]),
+            )
+        )
+        counters = cls()
+        counters.capacity = stop - start
+        counters.free = dict.fromkeys(categories, 0)
+        counters.free.update(
+            Counter(
+                category
+                for category, slot in zip(categories, layout.occupants[start:stop])
+                if slot == FREE
+            )
+        )
+        counters.occupancy = counters.capacity - sum(counters.free.values())
+        return counters
+
+    @property
+    def free_spaces(self) -> int:
+        return self.capacity - self.occupancy
+
+    def free_in(self, category: Category) -> int:
+        return self.free.get(category, 0)
+
+    def unheld_in(self, category: Category) -> int:
+        return self.free.get(category, 0) - self.held.get(category, 0)
+
+    def hold(self, category: Category):
+        self.held[category] = self.held.get(category, 0) + 1
+
+    def release_hold(self, category: Category):
+        self.held[category] -= 1
+
+    def add_space(self, category: Category, occupied: bool = False):
+        self.capacity += 1
+        self.free.setdefault(category, 0)
+        if occupied:
+            self.occupancy += 1
+        else:
+            self.free[category] += 1
+
+    def remove_space(self, category: Category, occupied: bool = False):
+        self.capacity -= 1
+        if occupied:
+            self.occupancy -= 1
+        else:
+            self.free[category] -= 1
+
+    def recategorize(self, old: Category, new: Category, occupied: bool = False):
+        self.free.setdefault(new, 0)
+        if not occupied:
+            self.free[old] -= 1
+            self.free[new] += 1
+
+    def merge(self, other: "SpaceCounters"):
+        self.capacity += other.capacity
+        self.occupancy += other.occupancy
+        for category, free in other.free.items():
+            self.free[category] = self.free.get(category, 0) + free
+
+    def subtract(self, other: "SpaceCounters"):
+        self.capacity -= other.capacity
+        self.occupancy -= other.occupancy
+        for category, free in other.free.items():
+            self.free[category] -= free
+
+    def park(self, category: Category):
+        self.occupancy += 1
+        self.free[category] -= 1
+
+    def vacate(self, category: Category):
+        self.occupancy -= 1
+        self.free[category] += 1
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SpaceCounters):
+            return NotImplemented
+        # Categories with no free spaces may linger after layout changes. Holds
+        # are not part of a scan, so they are not compared.
+        return (
+            self.capacity == other.capacity
+            and self.occupancy == other.occupancy
+            and {category: free for category, free in self.free.items() if free}
+            == {category: free for category, free in other.free.items() if free}
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"SpaceCounters(capacity={self.capacity}, occupancy={self.occupancy}, "
+            f"free={self.free})"
+        )
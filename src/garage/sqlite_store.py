@@ -0,0 +1,383 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from garage.compact_layout import CompactLayout, CompactLevels
+from garage.free_space_pools import SpaceLocation
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+READER_POOL_SIZE = 4
+
+# free mirrors vehicle_id IS NULL so that free spaces of a category are one index
+# range.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS levels (
+    level INTEGER PRIMARY KEY,
+    space_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spaces (
+    level INTEGER NOT NULL,
+    space INTEGER NOT NULL,
+    required_permit INTEGER NOT NULL,
+    compact INTEGER NOT NULL,
+    free INTEGER NOT NULL,
+    vehicle_id TEXT,
+    vehicle_type INTEGER,
+    permit INTEGER,
+    PRIMARY KEY (level, space)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS spaces_category_free
+    ON spaces (required_permit, compact, free);
+CREATE INDEX IF NOT EXISTS spaces_vehicle_id
+    ON spaces (vehicle_id) WHERE vehicle_id IS NOT NULL;
+"""
+
+INSERT_SPACE = "INSERT INTO spaces VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+SET_OCCUPANT = (
+    "UPDATE spaces SET free = ?, vehicle_id = ?, vehicle_type = ?, permit = ? "
+    "WHERE level = ? AND space = ?"
+)
+
+# (free, vehicle id, vehicle type, permit, level index, space index)
+OccupantRow = Tuple[int, Optional[str], Optional[int], Optional[int], int, int]
+
+
+def _occupant_row(vehicle: Optional[Vehicle], location: SpaceLocation) -> OccupantRow:
+    if vehicle is None:
+        return 1, None, None, None, location[0], location[1]
+    return (
+        0,
+        vehicle.vehicle_id,
+        vehicle.vehicle_type.value,
+        int(vehicle.permit),
+        location[0],
+        location[1],
+    )
+
+
+class ConnectionPool:
+    """Read-only connections to one database, reused across calls and shared by
+    reader threads. At most size connections are open or in use at once."""
+
+    def __init__(self, path: Union[str, Path], size: int = READER_POOL_SIZE):
+        self._uri = f"{Path(path).absolute().as_uri()}?mode=ro"
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                # Autocommit, so every query reads the latest committed state.
+                connection = sqlite3.connect(
+                    self._uri, uri=True, isolation_level=None, check_same_thread=False
+                )
+            try:
+                yield connection
+            finally:
+                self._idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class SqliteStore:
+    """Garage layout and occupancy kept in a SQLite database.
+
+    A Garage opened with Garage.open_sqlite records placements and departures here
+    in place of a journal: every add_vehicles, remove_vehicles or apply call commits
+    its changes as one transaction of a single executemany. The database is in WAL
+    mode, so other connections and processes can query it while a garage writes;
+    the query methods use a pool of read-only connections. The garage also writes
+    each layout change through, in its own transaction. Reservations are not
+    stored.
+    """
+
+    path: str
+    sync: bool
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        sync: bool = True,
+        reader_pool_size: int = READER_POOL_SIZE,
+    ):
+        self.path = str(path)
+        self.sync = sync
+        self._writer = sqlite3.connect(self.path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._writer.execute(f"PRAGMA synchronous = {'FULL' if sync else 'NORMAL'}")
+        self._writer.executescript(SCHEMA)
+        self._readers = ConnectionPool(self.path, reader_pool_size)
+        self._buffer: List[OccupantRow] = []
+        self._lock = Lock()
+
+    @property
+    def empty(self) -> bool:
+        """Whether no layout has been written yet."""
+        return self._writer.execute("SELECT 1 FROM levels LIMIT 1").fetchone() is None
+
+    def write_layout(self, levels: Sequence):
+        """Replaces the stored layout and occupancy with levels in one
+        transaction."""
+        with self._lock, self._writer:
+            self._buffer = []
+            self._writer.execute("DELETE FROM spaces")
+            self._writer.execute("DELETE FROM levels")
+            self._writer.executemany(
+                "INSERT INTO levels VALUES (?, ?)",
+                (
+                    (level_index, len(level.spaces))
+                    for level_index, level in enumerate(levels)
+                ),
+            )
+            self._writer.executemany(INSERT_SPACE, _space_rows(levels))
+
+    def add_level(self, level_index: int, spaces: Sequence[ParkingSpace]):
+        """Stores a level appended to the layout, with any vehicles on it.
+
+        Like every layout change, it is committed in one transaction with the
+        placements and departures still buffered, which it follows.
+        """
+        with self._lock, self._writer:
+            self._writer.executemany(SET_OCCUPANT, self._take_buffer())
+            self._writer.execute(
+                "INSERT INTO levels VALUES (?, ?)", (level_index, len(spaces))
+            )
+            self._writer.executemany(
+                INSERT_SPACE,
+                (
+                    _space_row(level_index, space_index, space)
+                    for space_index, space in enumerate(spaces)
+                ),
+            )
+
+    def remove_level(self, level_index: int):
+        """Deletes a level and moves the later levels down one index."""
+        with self._lock, self._writer:
+            self._writer.executemany(SET_OCCUPANT, self._take_buffer())
+            for table in ("spaces", "levels"):
+                self._writer.execute(
+                    f"DELETE FROM {table} WHERE level = ?", (level_index,)
+                )
+                # Renumbered through negative keys, so no two rows ever share one.
+                self._writer.execute(
+                    f"UPDATE {table} SET level = -level WHERE level > ?",
+                    (level_index,),
+                )
+                self._writer.execute(
+                    f"UPDATE {table} SET level = -level - 1 WHERE level < 0"
+                )
+
+    def add_space(self, level_index: int, space_index: int, space: ParkingSpace):
+        """Stores a space appended to a level."""
+        with self._lock, self._writer:
+            self._writer.executemany(SET_OCCUPANT, self._take_buffer())
+            self._writer.execute(
+                INSERT_SPACE, _space_row(level_index, space_index, space)
+            )
+            self._resize_level(level_index, 1)
+
+    def remove_space(self, level_index: int, space_index: int):
+        """Deletes a space and moves the later spaces of its level down one index."""
+        with self._lock, self._writer:
+            self._writer.executemany(SET_OCCUPANT, self._take_buffer())
+            self._writer.execute(
+                "DELETE FROM spaces WHERE level = ? AND space = ?",
+                (level_index, space_index),
+            )
+            self._writer.execute(
+                "UPDATE spaces SET space = -space WHERE level = ? AND space > ?",
+                (level_index, space_index),
+            )
+            self._writer.execute(
+                "UPDATE spaces SET space = -space - 1 WHERE level = ? AND space < 0",
+                (level_index,),
+            )
+            self._resize_level(level_index, -1)
+
+    def update_space(
+        self,
+        level_index: int,
+        space_index: int,
+        compact: bool,
+        required_permit: Union[Permit, int],
+    ):
+        """Stores the new flags of a re-striped space."""
+        with self._lock, self._writer:
+            self._writer.executemany(SET_OCCUPANT, self._take_buffer())
+            self._writer.execute(
+                "UPDATE spaces SET compact = ?, required_permit = ? "
+                "WHERE level = ? AND space = ?",
+                (int(bool(compact)), int(required_permit), level_index, space_index),
+            )
+
+    def read_levels(self) -> CompactLevels:
+        """Loads the stored layout into a compact layout, creating Vehicle objects
+        for the parked vehicles only."""
+        layout = CompactLayout()
+        level_rows = self._writer.execute(
+            "SELECT level, space_count FROM levels ORDER BY level"
+        ).fetchall()
+        for level_index, space_count in level_rows:
+            flags = self._writer.execute(
+                "SELECT compact, required_permit FROM spaces WHERE level = ? "
+                "ORDER BY space",
+                (level_index,),
+            ).fetchall()
+            if len(flags) != space_count:
+                raise ValueError(
+                    f"{self.path} holds {len(flags)} spaces for level {level_index}, "
+                    f"not {space_count}."
+                )
+            layout.add_level(
+                compact=[compact for compact, _ in flags],
+                required_permits=[required_permit for _, required_permit in flags],
+            )
+
+        occupants = self._writer.execute(
+            "SELECT level, space, vehicle_id, vehicle_type, permit FROM spaces "
+            "WHERE free = 0"
+        )
+        for level_index, space_index, vehicle_id, vehicle_type, permit in occupants:
+            layout.set_vehicle(
+                layout.ordinal(level_index, space_index),
+                Vehicle(
+                    vehicle_type=VehicleType(vehicle_type),
+                    vehicle_id=vehicle_id,
+                    permit=Permit(permit),
+                ),
+            )
+        return layout.levels()
+
+    def locate(self, vehicle_id: str) -> Optional[SpaceLocation]:
+        with self._readers.connection() as connection:
+            row = connection.execute(
+                "SELECT level, space FROM spaces WHERE vehicle_id = ?", (vehicle_id,)
+            ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def count_free(
+        self,
+        compact: Optional[bool] = None,
+        required_permit: Optional[Union[Permit, int]] = None,
+    ) -> int:
+        """Counts the stored free spaces of a category, from the (category, free)
+        index."""
+        conditions = ["free = 1"]
+        parameters = []
+        if required_permit is not None:
+            conditions.append("required_permit = ?")
+            parameters.append(int(required_permit))
+        if compact is not None:
+            conditions.append("compact = ?")
+            parameters.append(int(compact))
+        with self._readers.connection() as connection:
+            return connection.execute(
+                f"SELECT count(*) FROM spaces WHERE {' AND '.join(conditions)}",
+                parameters,
+            ).fetchone()[0]
+
+    def count_parked(self) -> int:
+        with self._readers.connection() as connection:
+            return connection.execute(
+                "SELECT count(*) FROM spaces WHERE free = 0"
+            ).fetchone()[0]
+
+    def check_ids(self, vehicle_ids: Iterable[Union[str, bytes]]):
+        """IDs are stored as TEXT of any length."""
+
+    def park(self, vehicle: Vehicle, location: SpaceLocation):
+        row = _occupant_row(vehicle, location)
+        with self._lock:
+            self._buffer.append(row)
+
+    def reject(self, vehicles: Sequence[Vehicle]):
+        """Rejections leave no state behind, so nothing is stored."""
+
+    def depart(self, vehicle: Vehicle, location: SpaceLocation):
+        row = _occupant_row(None, location)
+        with self._lock:
+            self._buffer.append(row)
+
+    def commit(self):
+        self.flush()
+
+    def flush(self):
+        """Writes the buffered changes in one transaction, in the order they were
+        made."""
+        with self._lock:
+            rows = self._take_buffer()
+            if rows:
+                with self._writer:
+                    self._writer.executemany(SET_OCCUPANT, rows)
+
+    def truncate(self):
+        """Nothing to compact: the store holds the state itself, not a log of it."""
+
+    def close(self):
+        self.flush()
+        self._readers.close()
+        self._writer.close()
+
+    def _take_buffer(self) -> List[OccupantRow]:
+        rows, self._buffer = self._buffer, []
+        return rows
+
+    def _resize_level(self, level_index: int, change: int):
+        self._writer.execute(
+            "UPDATE levels SET space_count = space_count + ? WHERE level = ?",
+            (change, level_index),
+        )
+
+    def __enter__(self) -> "SqliteStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _space_rows(levels: Sequence) -> Iterator[tuple]:
+    # Reads compact layouts from their columns so no space views are created.
+    if isinstance(levels, CompactLevels):
+        layout = levels.layout
+        offsets = layout.level_offsets
+        for level_index in range(layout.level_count):
+            start = offsets[level_index]
+            for ordinal in range(start, offsets[level_index + 1]):
+                occupant = _occupant_row(
+                    layout.vehicle(ordinal), (level_index, ordinal - start)
+                )
+                yield (
+                    level_index,
+                    ordinal - start,
+                    layout.required_permits[ordinal],
+                    layout.compact[ordinal],
+                ) + occupant[:4]
+        return
+
+    for level_index, level in enumerate(levels):
+        for space_index, space in enumerate(level.spaces):
+            yield _space_row(level_index, space_index, space)
+
+
+def _space_row(level_index: int, space_index: int, space: ParkingSpace) -> tuple:
+    occupant = _occupant_row(space.vehicle, (level_index, space_index))
+    return (
+        level_index,
+        space_index,
+        int(space.required_permit),
+        int(space.compact),
+    ) + occupant[:4]
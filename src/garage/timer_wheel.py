@@ -0,0 +1,49 @@
+import heapq
+import math
+from typing import Dict, Generic, Iterator, List, TypeVar
+
+Key = TypeVar("Key")
+
+# Default bucket width, in seconds.
+TIMER_RESOLUTION = 0.1
+
+
+class TimerWheel(Generic[Key]):
+    """Expiry timers bucketed by deadline tick.
+
+    A timer joins the bucket of the first tick at or after its deadline, and a
+    bucket fires as a whole once the clock reaches its tick, so timers fire at most
+    one resolution late. Scheduling is O(1) into an existing bucket, and only the
+    distinct ticks are kept in a heap, so expiring n timers costs O(n) plus one heap
+    pop per bucket. Cancelled timers are not removed; callers skip keys that are no
+    longer live when they fire.
+    """
+
+    resolution: float
+
+    def __init__(self, resolution: float = TIMER_RESOLUTION):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive.")
+        self.resolution = resolution
+        self._buckets: Dict[int, List[Key]] = {}
+        self._ticks: List[int] = []
+
+    def schedule(self, deadline: float, key: Key):
+        tick = math.ceil(deadline / self.resolution)
+        if tick * self.resolution < deadline:
+            # Rounding put the tick just before the deadline.
+            tick += 1
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = []
+            heapq.heappush(self._ticks, tick)
+        bucket.append(key)
+
+    def expired(self, now: float) -> Iterator[Key]:
+        """Removes and yields the keys of every bucket whose tick has passed."""
+        ticks = self._ticks
+        while ticks and ticks[0] * self.resolution <= now:
+            yield from self._buckets.pop(heapq.heappop(ticks))
+
+    def __len__(self) -> int:
+        return sum(map(len, self._buckets.values()))
@@ -0,0 +1,170 @@
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None
+
+from garage.free_space_pools import (
+    LEVEL_SHIFT,
+    SPACE_MASK,
+    Category,
+    FreeSpacePools,
+    SpaceLocation,
+)
+from garage.placement_rules import TYPE_BITS, RuleTables
+from garage.vehicle import Vehicle
+from garage.vehicle_records import VehicleRecords
+
+# Popping a key off a heap costs about this many times as much as copying and
+# sorting one, so pools this much larger than the batch's demand are popped.
+WALK_RATIO = 16
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class VectorizedAllocator:
+    """Batch allocation that assigns each placement tier in a few numpy passes.
+
+    Within a tier, consecutive candidates that share the same eligible pools always
+    take the smallest free spaces of those pools, so every such run is assigned by
+    prefix. The result is identical to placing the vehicles one at a time.
+    """
+
+    def __init__(self, pools: FreeSpacePools, tables: RuleTables):
+        if np is None:
+            raise ImportError("VectorizedAllocator requires numpy.")
+        self.pools = pools
+        self.tables = tables
+
+    def allocate(
+        self, vehicles: Sequence[Vehicle]
+    ) -> Tuple[List[Tuple[int, SpaceLocation]], List[int]]:
+        """Returns (vehicle index, location) placements and the indices of vehicles
+        left without a space, in arrival order."""
+        count = len(vehicles)
+        if isinstance(vehicles, VehicleRecords):
+            vehicle_codes = vehicles.code_array
+        else:
+            types = np.fromiter(
+                (vehicle.vehicle_type.value for vehicle in vehicles), np.int64, count
+            )
+            permits = np.fromiter(
+                (vehicle.permit for vehicle in vehicles), np.int64, count
+            )
+            vehicle_codes = permits << TYPE_BITS | types
+        codes, inverse, code_counts = np.unique(
+            vehicle_codes & self.tables.code_mask,
+            return_inverse=True,
+            return_counts=True,
+        )
+        inverse = inverse.reshape(-1)
+
+        free = {}
+        popped = set()
+        for category, demand in self._demand(codes, code_counts).items():
+            if demand * WALK_RATIO < self.pools.free_count([category]):
+                # The head of a large pool is popped off its heap, and whatever
+                # is left of it is pushed back below.
+                keys = self.pools.pop_smallest(category, demand)
+                popped.add(category)
+            else:
+                keys = self.pools.free_keys(category)
+            free[category] = np.fromiter(keys, np.int64, len(keys))
+            if category not in popped:
+                free[category].sort()
+        taken = dict.fromkeys(free, 0)
+        assigned = np.full(count, -1, np.int64)
+        pending = np.ones(count, bool)
+
+        for tier_index in range(len(self.tables.tier_names)):
+            admitted, set_ids, category_sets = self._tier_tables(tier_index, codes)
+            candidates = np.flatnonzero(pending & admitted[inverse])
+            if not candidates.size:
+                continue
+
+            prioritized = self.tables.prioritized[tier_index]
+            if prioritized is not None:
+                lacks_priority = (
+                    np.frombuffer(prioritized, np.uint8)[codes[inverse[candidates]]]
+                    == 0
+                )
+                candidates = candidates[np.argsort(lacks_priority, kind="stable")]
+
+            candidate_sets = set_ids[inverse[candidates]]
+            run_starts = np.flatnonzero(
+                np.concatenate(([True], candidate_sets[1:] != candidate_sets[:-1]))
+            )
+            run_ends = np.append(run_starts[1:], candidates.size)
+
+            for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+                set_id = candidate_sets[start]
+                if set_id < 0:
+                    continue
+                categories = category_sets[set_id]
+                placed = self._take_prefix(free, taken, categories, end - start)
+                run = candidates[start : start + placed.size]
+                assigned[run] = placed
+                pending[run] = False
+
+        for category, count_taken in taken.items():
+            if category in popped:
+                self.pools.push_keys(category, free[category][count_taken:].tolist())
+            elif count_taken:
+                self.pools.pop_smallest(category, count_taken)
+
+        placed_indices = np.flatnonzero(assigned >= 0)
+        keys = assigned[placed_indices]
+        placements = list(
+            zip(
+                placed_indices.tolist(),
+                zip((keys >> LEVEL_SHIFT).tolist(), (keys & SPACE_MASK).tolist()),
+            )
+        )
+        return placements, np.flatnonzero(pending).tolist()
+
+    def _demand(self, codes, code_counts) -> Dict[Category, int]:
+        """The most spaces the batch could take from each pool: the number of its
+        vehicles that may use the category in any tier."""
+        demand: Dict[Category, int] = {}
+        for code, code_count in zip(codes.tolist(), code_counts.tolist()):
+            categories = set()
+            for eligible in self.tables.eligible:
+                categories.update(eligible[code])
+            for category in categories:
+                demand[category] = demand.get(category, 0) + code_count
+        return demand
+
+    def _tier_tables(self, tier_index, codes):
+        tier_admitted = self.tables.admitted[tier_index]
+        tier_eligible = self.tables.eligible[tier_index]
+        admitted = np.zeros(codes.size, bool)
+        set_ids = np.full(codes.size, -1, np.int64)
+        category_sets: List[Tuple[Category, ...]] = []
+        known: Dict[Tuple[Category, ...], int] = {}
+
+        for position, code in enumerate(codes.tolist()):
+            admitted[position] = tier_admitted[code]
+            categories = tier_eligible[code]
+            if categories:
+                if categories not in known:
+                    known[categories] = len(category_sets)
+                    category_sets.append(categories)
+                set_ids[position] = known[categories]
+
+        return admitted, set_ids, category_sets
+
+    @staticmethod
+    def _take_prefix(free, taken, categories, count):
+        heads = [
+            free[category][taken[category] : taken[category] + count]
+            for category in categories
+        ]
+        merged = np.sort(np.concatenate(heads))[:count]
+        if merged.size:
+            last = merged[-1]
+            for category, head in zip(categories, heads):
+                taken[category] += int(np.searchsorted(head, last, side="right"))
+        return merged
@@ -1,13 +1,14 @@
-from uuid import uuid4
-from typing import Union
+from typing import Optional, Union
 
 from garage.permit import Permit
+from garage.vehicle_id import next_vehicle_id
 from garage.vehicle_type import VehicleType
 
 
 class Vehicle:
+    __slots__ = ("vehicle_type", "_vehicle_id", "permit")
+
     vehicle_type: VehicleType
-    vehicle_id: str
     permit: Permit
 
     def __init__(
@@ -17,5 +18,21 @@ class Vehicle:
         permit: Union[Permit, int] = None,
     ):
         self.vehicle_type = vehicle_type or VehicleType.Car
-        self.vehicle_id = vehicle_id or str(uuid4())
+        self._vehicle_id = vehicle_id or None
         self.permit = permit or Permit.NONE
+
+    @property
+    def vehicle_id(self) -> str:
+        # Generated on first access so vehicles whose ID is never read skip the cost.
+        if self._vehicle_id is None:
+            self._vehicle_id = next_vehicle_id()
+        return self._vehicle_id
+
+    @property
+    def assigned_id(self) -> Optional[str]:
+        """The ID if one was given or has been generated, without generating one."""
+        return self._vehicle_id
+
+    @vehicle_id.setter
+    def vehicle_id(self, vehicle_id: str):
+        self._vehicle_id = vehicle_id or None
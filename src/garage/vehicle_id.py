@@ -0,0 +1,40 @@
+from itertools import count
+from typing import Callable
+from uuid import uuid4
+
+VehicleIdGenerator = Callable[[], str]
+
+
+def uuid_vehicle_id() -> str:
+    return str(uuid4())
+
+
+class CounterVehicleIds:
+    """Monotonic IDs such as "gate-1", "gate-2", ... for replaying arrival feeds."""
+
+    prefix: str
+
+    def __init__(self, prefix: str = "", start: int = 1):
+        self.prefix = prefix
+        self._counter = count(start)
+
+    def __call__(self) -> str:
+        return f"{self.prefix}{next(self._counter)}"
+
+
+_generator: VehicleIdGenerator = uuid_vehicle_id
+
+
+def next_vehicle_id() -> str:
+    return _generator()
+
+
+def set_vehicle_id_generator(
+    generator: VehicleIdGenerator = None,
+) -> VehicleIdGenerator:
+    """Installs the generator used for vehicles created without an ID and returns
+    the previous one. Passing None restores the uuid4 default."""
+    global _generator
+    previous = _generator
+    _generator = generator or uuid_vehicle_id
+    return previous
@@ -0,0 +1,142 @@
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None
+
+from garage.free_space_pools import SpaceLocation
+from garage.permit import MAX_PERMIT, Permit
+from garage.placement_rules import TYPE_BITS
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+RECORD_FIELDS = ("vehicle_type", "permit", "vehicle_id")
+
+_VEHICLE_TYPES: Dict[int, VehicleType] = {
+    member.value: member for member in VehicleType
+}
+_PERMITS: Dict[int, Permit] = {}
+
+
+class RecordPlacements(NamedTuple):
+    # Row indices of the rejected records, in arrival order.
+    rejected: array
+    # Level and space index of each record, -1 for rejected records.
+    level_indices: array
+    space_indices: array
+
+
+class VehicleRecords(Sequence[Vehicle]):
+    """Arrival rows held as parallel columns of VehicleType values, permits and IDs.
+    Without vehicle_ids, each Vehicle generates its ID like any Vehicle created
+    without one.
+
+    Placement reads only the vehicle codes, computed for the whole batch at once.
+    A Vehicle is created for a row the first time it is accessed, which the Garage
+    only does to store a parked vehicle or to journal a rejection.
+    """
+
+    codes: List[int]
+    # The codes as a NumPy array, where NumPy is installed.
+    code_array: Optional["np.ndarray"]
+    # Vehicles created so far, by row index.
+    created: Dict[int, Vehicle]
+    # Level and space index each row was parked at, -1 until it is parked.
+    level_indices: array
+    space_indices: array
+
+    def __init__(
+        self,
+        types: Sequence[int],
+        permits: Sequence[Union[Permit, int]],
+        vehicle_ids: Optional[Sequence[Union[str, bytes]]] = None,
+    ):
+        if len(types) != len(permits) or (
+            vehicle_ids is not None and len(vehicle_ids) != len(types)
+        ):
+            raise ValueError("types, permits and vehicle_ids differ in length.")
+        self.types = types
+        self.permits = permits
+        self.vehicle_ids = vehicle_ids
+        self.created = {}
+        self.level_indices = array("q", [-1]) * len(types)
+        self.space_indices = array("q", [-1]) * len(types)
+        self.code_array = None
+        if np is not None:
+            type_array = np.asarray(types, np.int64)
+            permit_array = np.asarray(permits, np.int64)
+            if type_array.size and not np.isin(type_array, list(_VEHICLE_TYPES)).all():
+                raise ValueError("types holds values that are not vehicle types.")
+            if permit_array.size and permit_array.min() < 0:
+                raise ValueError("permits must not be negative.")
+            if permit_array.size and permit_array.max() > MAX_PERMIT:
+                raise ValueError("permits must fit in one byte.")
+            self.code_array = permit_array << TYPE_BITS | type_array
+            self.codes = self.code_array.tolist()
+        else:
+            if not set(types) <= _VEHICLE_TYPES.keys():
+                raise ValueError("types holds values that are not vehicle types.")
+            if permits and min(permits) < 0:
+                raise ValueError("permits must not be negative.")
+            if permits and max(permits) > MAX_PERMIT:
+                raise ValueError("permits must fit in one byte.")
+            self.codes = [
+                int(permit) << TYPE_BITS | vehicle_type
+                for vehicle_type, permit in zip(types, permits)
+            ]
+
+    @classmethod
+    def from_structured(cls, records) -> "VehicleRecords":
+        """Columns of a NumPy structured array with RECORD_FIELDS fields."""
+        missing = set(RECORD_FIELDS).difference(records.dtype.names or ())
+        if missing:
+            raise ValueError(f"records lack the fields {', '.join(sorted(missing))}.")
+        return cls(records["vehicle_type"], records["permit"], records["vehicle_id"])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Vehicle:
+        vehicle = self.created.get(index)
+        if vehicle is None:
+            vehicle = self.created[index] = Vehicle(
+                _VEHICLE_TYPES[self.types[index]],
+                None if self.vehicle_ids is None else _str_id(self.vehicle_ids[index]),
+                _permit(self.permits[index]),
+            )
+        return vehicle
+
+    def mask_codes(self, code_mask: int):
+        """Clears the bits outside code_mask from every code."""
+        if self.code_array is not None:
+            self.code_array &= code_mask
+            self.codes = self.code_array.tolist()
+        else:
+            self.codes = [code & code_mask for code in self.codes]
+
+    def park(self, index: int, location: SpaceLocation):
+        self.level_indices[index], self.space_indices[index] = location
+
+    def str_ids(self) -> List[str]:
+        """The given vehicle IDs as the str a Vehicle of each row holds."""
+        if self.vehicle_ids is None:
+            return []
+        return [_str_id(vehicle_id) for vehicle_id in self.vehicle_ids]
+
+
+def _str_id(vehicle_id: Union[str, bytes]) -> str:
+    if type(vehicle_id) is str:
+        return vehicle_id
+    if isinstance(vehicle_id, bytes):
+        return vehicle_id.decode()
+    return str(vehicle_id)
+
+
+def _permit(value: int) -> Permit:
+    # Permit(value) goes through the enum machinery; rows repeat a few permits.
+    permit = _PERMITS.get(value)
+    if permit is None:
+        permit = _PERMITS[int(value)] = Permit(int(value))
+    return permit
@@ -0,0 +1,127 @@
+import pytest
+
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_id import CounterVehicleIds, set_vehicle_id_generator
+from test.utils import TestHelpers
+
+
+def test_removed_vehicles_free_their_parking_spaces():
+    parking_level_1 = ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])
+    parking_level_2 = ParkingLevel(spaces=[ParkingSpace()])
+
+    garage = Garage(levels=[parking_level_1, parking_level_2])
+
+    vehicle_1 = Vehicle(vehicle_id="1")
+    vehicle_2 = Vehicle(vehicle_id="2")
+    vehicle_3 = Vehicle(vehicle_id="3")
+
+    garage.add_vehicles([vehicle_1, vehicle_2, vehicle_3])
+    removed_vehicles = garage.remove_vehicles(["3", "1", "unknown"])
+
+    assert removed_vehicles == [vehicle_3, vehicle_1]
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[None, vehicle_2], [None]]
+    )
+    assert garage.locate("1") is None
+    assert garage.locate("2") == (0, 1)
+
+
+def test_freed_parking_spaces_are_reused_in_garage_order():
+    parking_space_a = ParkingSpace(required_permit=Permit.PREMIUM)
+    parking_space_b = ParkingSpace()
+    parking_space_c = ParkingSpace()
+
+    garage = Garage(
+        levels=[
+            ParkingLevel(spaces=[parking_space_a, parking_space_b, parking_space_c])
+        ]
+    )
+
+    vehicle_1 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_2 = Vehicle()
+    vehicle_3 = Vehicle()
+    vehicle_4 = Vehicle()
+    vehicle_5 = Vehicle(permit=Permit.PREMIUM)
+
+    garage.add_vehicles([vehicle_1, vehicle_2, vehicle_3])
+    garage.remove_vehicles([vehicle_2.vehicle_id, vehicle_1.vehicle_id])
+    actual_rejected_vehicles = garage.add_vehicles([vehicle_4, vehicle_5])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[vehicle_5, vehicle_4, vehicle_3]]
+    )
+    assert actual_rejected_vehicles == []
+
+
+def test_vehicles_parked_before_the_garage_was_built_can_depart():
+    parked_vehicle = Vehicle(vehicle_id="early")
+    parking_space = ParkingSpace(vehicle=parked_vehicle)
+
+    garage = Garage(levels=[ParkingLevel(spaces=[parking_space])])
+
+    assert garage.vacate(0, 0) is parked_vehicle
+    assert garage.vacate(0, 0) is None
+
+    vehicle = Vehicle()
+    garage.add_vehicles([vehicle])
+
+    assert parking_space.vehicle is vehicle
+
+
+def test_duplicate_vehicle_ids_are_refused_before_any_placement():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(4)])])
+    garage.add_vehicles([Vehicle(vehicle_id="X")])
+
+    with pytest.raises(ValueError):
+        garage.add_vehicles([Vehicle(vehicle_id="a"), Vehicle(vehicle_id="X")])
+    with pytest.raises(ValueError):
+        garage.add_vehicles([Vehicle(vehicle_id="b"), Vehicle(vehicle_id="b")])
+    with pytest.raises(ValueError):
+        garage.add_records([1, 1], [0, 0], [b"c", "c"])
+    with pytest.raises(ValueError):
+        Garage(
+            levels=[
+                ParkingLevel(
+                    spaces=[
+                        ParkingSpace(vehicle=Vehicle(vehicle_id="d")),
+                        ParkingSpace(vehicle=Vehicle(vehicle_id="d")),
+                    ]
+                )
+            ]
+        )
+
+    assert garage.count_parked() == TestHelpers.garage_occupancy(garage) == 1
+    assert garage.vacate(0, 0).vehicle_id == "X"
+    assert garage.locate("X") is None
+    garage.verify_counters()
+
+
+def test_generated_ids_skip_ids_given_to_other_vehicles():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(4)])])
+    previous = set_vehicle_id_generator(CounterVehicleIds(prefix="v"))
+    try:
+        garage.add_vehicles([Vehicle(vehicle_id="v1")])
+        garage.add_vehicles([Vehicle(), Vehicle(vehicle_id="v3")])
+    finally:
+        set_vehicle_id_generator(previous)
+
+    assert garage.count_parked() == 3
+    garage.verify_counters()
+    assert [vehicle.vehicle_id for vehicle in garage.remove_vehicles(["v1"])] == ["v1"]
+    assert garage.locate("v2") == (0, 1)
+    assert garage.locate("v3") == (0, 2)
+
+
+def test_the_same_vehicle_is_refused_twice_in_a_batch():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])])
+    vehicle = Vehicle()
+
+    with pytest.raises(ValueError):
+        garage.add_vehicles([vehicle, vehicle])
+
+    assert garage.count_parked() == 0
+    garage.verify_counters()
@@ -0,0 +1,64 @@
+import pytest
+
+from garage.compact_layout import CompactLayout
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+STANDARD = (Permit.NONE, False)
+COMPACT = (Permit.NONE, True)
+PREMIUM = (Permit.PREMIUM, False)
+
+
+def build_levels():
+    return [
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(required_permit=Permit.PREMIUM),
+                ParkingSpace(compact=True),
+            ]
+        ),
+        ParkingLevel(
+            spaces=[ParkingSpace(), ParkingSpace(), ParkingSpace(vehicle=Vehicle())]
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "levels", [build_levels(), CompactLayout.from_levels(build_levels()).levels()]
+)
+def test_counters_follow_placements_and_departures(levels):
+    garage = Garage(levels=levels)
+
+    vehicle_1 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_2 = Vehicle(vehicle_type=VehicleType.Compact)
+    vehicle_3 = Vehicle()
+
+    garage.add_vehicles([vehicle_1, vehicle_2, vehicle_3])
+
+    assert garage.counters.capacity == TestHelpers.garage_capacity(garage) == 5
+    assert garage.counters.occupancy == TestHelpers.garage_occupancy(garage) == 4
+    assert garage.counters.free_in(STANDARD) == 1
+    assert garage.levels[0].counters.free_spaces == 0
+    assert garage.levels[1].counters.occupancy == 2
+
+    garage.remove_vehicles([vehicle_1.vehicle_id])
+
+    assert garage.counters.free_in(PREMIUM) == 1
+    assert garage.levels[0].counters.occupancy == 1
+    assert garage.counters.free_in(COMPACT) == 0
+    garage.verify_counters()
+
+
+def test_counter_drift_is_detected():
+    parking_space = ParkingSpace()
+    garage = Garage(levels=[ParkingLevel(spaces=[parking_space])])
+
+    parking_space.vehicle = Vehicle()
+
+    with pytest.raises(AssertionError):
+        garage.verify_counters()
@@ -0,0 +1,68 @@
+import pytest
+
+from garage.garage import Garage
+from garage.metrics import InMemoryMetrics
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+
+def test_metrics_are_reported_per_phase_and_level():
+    metrics = InMemoryMetrics()
+    parking_level_1 = ParkingLevel(
+        spaces=[ParkingSpace(required_permit=Permit.PREMIUM), ParkingSpace()]
+    )
+    parking_level_2 = ParkingLevel(spaces=[ParkingSpace(compact=True)])
+
+    garage = Garage(levels=[parking_level_1, parking_level_2], metrics=metrics)
+
+    garage.add_vehicles(
+        [
+            Vehicle(permit=Permit.PREMIUM),
+            Vehicle(vehicle_type=VehicleType.Compact),
+            Vehicle(),
+            Vehicle(),
+            Vehicle(vehicle_type=VehicleType.Truck, permit=Permit.DISABILITY),
+        ]
+    )
+
+    assert metrics.totals["phase.disability.considered"] == 1
+    assert metrics.totals["phase.disability.placed"] == 0
+    assert metrics.totals["phase.premium.placed"] == 1
+    assert metrics.totals["phase.compact.placed"] == 1
+    assert metrics.totals["phase.standard.considered"] == 3
+    assert metrics.totals["phase.standard.placed"] == 1
+    assert metrics.levels["phase.premium.placed", 0] == 1
+    assert metrics.levels["phase.compact.placed", 1] == 1
+    assert metrics.totals["rejected.capacity"] == 2
+    assert metrics.totals["phase.standard.ns"] > 0
+
+
+def test_rejections_without_any_usable_category_are_ineligible():
+    metrics = InMemoryMetrics()
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace(compact=True)])], metrics=metrics
+    )
+
+    garage.add_vehicles([Vehicle(vehicle_type=VehicleType.Truck)])
+
+    assert metrics.totals["rejected.ineligible"] == 1
+
+
+def test_vectorized_batches_are_reported_as_one_phase():
+    pytest.importorskip("numpy")
+    metrics = InMemoryMetrics()
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])],
+        vectorized_batch_size=0,
+        vectorized_free_ratio=None,
+        metrics=metrics,
+    )
+
+    garage.add_vehicles([Vehicle(), Vehicle(), Vehicle()])
+
+    assert metrics.totals["phase.vectorized.considered"] == 3
+    assert metrics.totals["phase.vectorized.placed"] == 2
+    assert metrics.totals["rejected.capacity"] == 1
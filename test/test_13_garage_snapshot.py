@@ -0,0 +1,93 @@
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.snapshot import _UNLOADED
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+
+def build_garage() -> Garage:
+    return Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(required_permit=Permit.DISABILITY),
+                    ParkingSpace(compact=True),
+                ]
+            ),
+            ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()]),
+        ]
+    )
+
+
+def test_snapshot_restores_layout_and_occupancy(tmp_path):
+    garage = build_garage()
+    garage.add_vehicles(
+        [
+            Vehicle(vehicle_id="d", permit=Permit.DISABILITY),
+            Vehicle(vehicle_id="c", vehicle_type=VehicleType.Compact),
+            Vehicle(vehicle_id="t", vehicle_type=VehicleType.Truck),
+        ]
+    )
+    garage.snapshot(tmp_path / "garage.snapshot")
+
+    restored = Garage.load(tmp_path / "garage.snapshot")
+
+    assert [
+        [(space.compact, space.required_permit) for space in level.spaces]
+        for level in restored.levels
+    ] == [
+        [(False, Permit.DISABILITY), (True, Permit.NONE)],
+        [(False, Permit.NONE), (False, Permit.NONE)],
+    ]
+    assert [
+        [space.vehicle and space.vehicle.vehicle_id for space in level.spaces]
+        for level in restored.levels
+    ] == [["d", "c"], ["t", None]]
+    assert restored.levels[0].spaces[1].vehicle.vehicle_type is VehicleType.Compact
+    assert restored.levels[0].spaces[0].vehicle.permit is Permit.DISABILITY
+    assert restored.locate("t") == (1, 0)
+    restored.verify_counters()
+
+
+def test_restored_garage_keeps_serving_without_touching_the_snapshot(tmp_path):
+    build_garage().snapshot(tmp_path / "garage.snapshot")
+    restored = Garage.load(tmp_path / "garage.snapshot")
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle()
+    vehicle_3 = Vehicle()
+
+    actual_rejected_vehicles = restored.add_vehicles([vehicle_1, vehicle_2, vehicle_3])
+    restored.remove_vehicles([vehicle_1.vehicle_id])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=restored.levels, expected_levels=[[None, None], [None, vehicle_2]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_3]
+    )
+    assert TestHelpers.garage_occupancy(Garage.load(tmp_path / "garage.snapshot")) == 0
+
+
+def test_loading_a_snapshot_leaves_vehicles_unloaded(tmp_path):
+    garage = build_garage()
+    garage.add_vehicles(
+        [
+            Vehicle(vehicle_id="d", permit=Permit.DISABILITY),
+            Vehicle(vehicle_id="t", vehicle_type=VehicleType.Truck),
+        ]
+    )
+    garage.snapshot(tmp_path / "garage.snapshot")
+
+    restored = Garage.load(tmp_path / "garage.snapshot")
+
+    vehicles = restored.levels.layout.vehicles
+    assert all(
+        list.__getitem__(vehicles, slot) is _UNLOADED for slot in range(len(vehicles))
+    )
+    assert restored.locate("t") == (1, 0)
+    assert restored.count_parked(permit=Permit.DISABILITY) == 1
+    assert [vehicle.vehicle_id for vehicle in restored.parked(level_index=1)] == ["t"]
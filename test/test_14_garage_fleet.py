@@ -0,0 +1,130 @@
+import pytest
+
+from garage.fleet import (
+    FleetPlacementError,
+    GarageFleet,
+    decode_vehicles,
+    encode_vehicles,
+)
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.placement_rules import PLACEMENT_RULES, PlacementRules, PlacementTier
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+EV_CHARGING = 4
+
+
+class FailingGarage(Garage):
+    def add_vehicles(self, vehicles=None, strategy=None):
+        raise RuntimeError("Garage is closed.")
+
+
+def test_vehicle_batches_round_trip_through_the_encoding():
+    vehicles = [
+        Vehicle(vehicle_id="a"),
+        Vehicle(
+            vehicle_type=VehicleType.Compact,
+            vehicle_id="b\n☃",
+            permit=Permit.DISABILITY | Permit.PREMIUM,
+        ),
+    ]
+
+    decoded = decode_vehicles(encode_vehicles(vehicles))
+
+    assert [
+        (vehicle.vehicle_type, vehicle.vehicle_id, vehicle.permit)
+        for vehicle in decoded
+    ] == [
+        (VehicleType.Car, "a", Permit.NONE),
+        (VehicleType.Compact, "b\n☃", Permit.DISABILITY | Permit.PREMIUM),
+    ]
+
+
+def test_fleet_routes_arrivals_and_overflows_rejections(tmp_path):
+    garage_a = Garage(levels=[ParkingLevel(spaces=[ParkingSpace()])])
+    garage_b = Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[ParkingSpace(required_permit=Permit.PREMIUM), ParkingSpace()]
+            )
+        ]
+    )
+
+    vehicle_1 = Vehicle(vehicle_id="1")
+    vehicle_2 = Vehicle(vehicle_id="2")
+    vehicle_3 = Vehicle(vehicle_id="3", permit=Permit.PREMIUM)
+    vehicle_4 = Vehicle(vehicle_id="4")
+
+    with GarageFleet([garage_a, garage_b], workers=2, overflow={0: [1]}) as fleet:
+        result = fleet.add_vehicles(
+            [(0, vehicle_1), (0, vehicle_2), (1, vehicle_3), (0, vehicle_4)]
+        )
+        fleet.snapshot(1, tmp_path / "b.snapshot")
+
+    assert result.locations == [(0, 0, 0), (1, 0, 1), (1, 0, 0), None]
+    assert [vehicle.vehicle_id for vehicle in result.rejected] == ["4"]
+    assert Garage.load(tmp_path / "b.snapshot").locate("2") == (0, 1)
+
+
+def test_workers_keep_each_garages_rules(tmp_path):
+    ev_rules = PlacementRules(
+        tiers=(
+            PlacementTier(
+                name="ev_charging", vehicle_permit=EV_CHARGING, space_permit=EV_CHARGING
+            ),
+        )
+        + PLACEMENT_RULES.tiers
+    )
+    ev_garage = Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[ParkingSpace(), ParkingSpace(required_permit=EV_CHARGING)]
+            )
+        ],
+        rules=ev_rules,
+    )
+    vehicle = Vehicle(vehicle_id="ev", permit=EV_CHARGING)
+
+    with GarageFleet([ev_garage], workers=1) as fleet:
+        result = fleet.add_vehicles([(0, vehicle)])
+
+    assert result.locations == [(0, 0, 1)]
+
+
+def test_refused_ids_are_raised_before_any_garage_parks():
+    garage_a = Garage(levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])])
+    garage_b = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace(vehicle=Vehicle(vehicle_id="b"))])]
+    )
+
+    with GarageFleet([garage_a, garage_b], workers=2, overflow={0: [1]}) as fleet:
+        with pytest.raises(ValueError):
+            fleet.add_vehicles(
+                [(0, Vehicle(vehicle_id="a")), (0, Vehicle(vehicle_id="b"))]
+            )
+        with pytest.raises(ValueError):
+            fleet.add_vehicles(
+                [(0, Vehicle(vehicle_id="a")), (1, Vehicle(vehicle_id="a"))]
+            )
+        result = fleet.add_vehicles([(0, Vehicle(vehicle_id="a"))])
+        with pytest.raises(ValueError):
+            fleet.add_vehicles([(0, Vehicle(vehicle_id="a"))])
+
+    assert result.locations == [(0, 0, 0)]
+
+
+def test_failed_workers_report_the_placements_already_made():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace()])])
+    failing = FailingGarage(levels=[ParkingLevel(spaces=[ParkingSpace()])])
+
+    with GarageFleet([garage, failing], workers=2) as fleet:
+        with pytest.raises(FleetPlacementError) as raised:
+            fleet.add_vehicles(
+                [(0, Vehicle(vehicle_id="a")), (1, Vehicle(vehicle_id="b"))]
+            )
+
+    assert raised.value.locations == [(0, 0, 0), None]
+    assert list(raised.value.errors) == [1]
@@ -0,0 +1,109 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from garage.concurrent_garage import ConcurrentGarage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import PERMITS, TestHelpers
+
+THREADS = 8
+ROUNDS = 40
+
+
+def build_levels() -> List[ParkingLevel]:
+    rng = random.Random(0)
+    return [
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(
+                    compact=rng.random() < 0.2,
+                    required_permit=rng.choice(
+                        [Permit.NONE, Permit.NONE, Permit.DISABILITY, Permit.PREMIUM]
+                    ),
+                )
+                for _ in range(100)
+            ]
+        )
+        for _ in range(5)
+    ]
+
+
+def gate(garage: ConcurrentGarage, gate_index: int, batch_size: int) -> List[Vehicle]:
+    rng = random.Random(gate_index)
+    parked: List[Vehicle] = []
+    for round_index in range(ROUNDS):
+        batch = [
+            Vehicle(
+                vehicle_type=rng.choice(list(VehicleType)),
+                vehicle_id=f"{gate_index}-{round_index}-{index}",
+                permit=rng.choice(PERMITS),
+            )
+            for index in range(rng.randint(1, batch_size))
+        ]
+        rejected = {id(vehicle) for vehicle in garage.add_vehicles(batch)}
+        parked += [vehicle for vehicle in batch if id(vehicle) not in rejected]
+
+        departing = parked[: len(parked) // 3]
+        parked = parked[len(parked) // 3 :]
+        assert (
+            garage.remove_vehicles([vehicle.vehicle_id for vehicle in departing])
+            == departing
+        )
+    return parked
+
+
+@pytest.mark.parametrize("batch_size", [10, 600])
+def test_concurrent_gates_never_double_book_a_space(batch_size: int):
+    if batch_size >= 512:
+        pytest.importorskip("numpy")
+        # Forces the numpy engine, which the free-ratio gate would skip here.
+        garage = ConcurrentGarage(
+            levels=build_levels(), vectorized_batch_size=1, vectorized_free_ratio=None
+        )
+    else:
+        garage = ConcurrentGarage(levels=build_levels())
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        parked = [
+            vehicle
+            for vehicles in executor.map(
+                lambda gate_index: gate(garage, gate_index, batch_size), range(THREADS)
+            )
+            for vehicle in vehicles
+        ]
+
+    garage_vehicles = TestHelpers.garage_vehicles(garage)
+    assert len(garage_vehicles) == len({id(vehicle) for vehicle in garage_vehicles})
+    assert {id(vehicle) for vehicle in garage_vehicles} == {
+        id(vehicle) for vehicle in parked
+    }
+    for vehicle in parked:
+        level_index, space_index = garage.locate(vehicle.vehicle_id)
+        space = garage.levels[level_index].spaces[space_index]
+        assert space.vehicle is vehicle
+        assert space.required_permit & vehicle.permit == space.required_permit
+        assert not space.compact or vehicle.vehicle_type is VehicleType.Compact
+    garage.verify_counters()
+
+
+def test_concurrent_gates_never_park_the_same_id_twice():
+    garage = ConcurrentGarage(levels=build_levels())
+
+    def arrive(round_index: int) -> bool:
+        try:
+            garage.add_vehicles([Vehicle(vehicle_id=f"car-{round_index // THREADS}")])
+        except ValueError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        parked = sum(executor.map(arrive, range(THREADS * ROUNDS)))
+
+    assert parked == garage.count_parked() == ROUNDS
+    garage.verify_counters()
@@ -0,0 +1,127 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from garage.async_garage import AsyncGarage
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+
+
+class RecordingGarage(Garage):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches: List[List[Vehicle]] = []
+
+    def add_vehicles(self, vehicles: List[Vehicle] = None) -> List[Vehicle]:
+        self.batches.append(list(vehicles))
+        return super().add_vehicles(vehicles)
+
+
+def test_concurrent_admissions_are_placed_as_one_batch():
+    parking_space_a = ParkingSpace(required_permit=Permit.PREMIUM)
+    parking_space_b = ParkingSpace()
+    garage = RecordingGarage(
+        levels=[ParkingLevel(spaces=[parking_space_a, parking_space_b])]
+    )
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_3 = Vehicle(permit=Permit.PREMIUM)
+
+    async def run():
+        async with AsyncGarage(garage, max_batch_size=3, max_delay=0.01) as gateway:
+            return await asyncio.gather(
+                gateway.admit(vehicle_1),
+                gateway.admit(vehicle_2),
+                gateway.admit(vehicle_3),
+            )
+
+    locations = asyncio.run(run())
+
+    assert garage.batches == [[vehicle_1, vehicle_2, vehicle_3]]
+    assert locations == [None, (0, 0), (0, 1)]
+
+
+def test_partial_batch_is_placed_after_the_deadline():
+    garage = RecordingGarage(levels=[ParkingLevel(spaces=[ParkingSpace()])])
+    vehicle = Vehicle()
+
+    async def run():
+        async with AsyncGarage(garage, max_batch_size=100, max_delay=0.01) as gateway:
+            return await asyncio.wait_for(gateway.admit(vehicle), 1)
+
+    assert asyncio.run(run()) == (0, 0)
+    assert garage.batches == [[vehicle]]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    garage = RecordingGarage(
+        levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(10)])]
+    )
+    vehicles = [Vehicle() for _ in range(7)]
+
+    async def run():
+        async with AsyncGarage(garage, max_batch_size=3, max_delay=0.01) as gateway:
+            return await asyncio.gather(*map(gateway.admit, vehicles))
+
+    locations = asyncio.run(run())
+
+    assert [len(batch) for batch in garage.batches] == [3, 3, 1]
+    assert locations == [(0, space_index) for space_index in range(7)]
+
+
+def test_admit_waits_while_the_queue_is_full():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(10)])])
+
+    async def run():
+        gateway = AsyncGarage(garage, max_batch_size=2, max_delay=0.01, max_pending=2)
+        admissions = [asyncio.ensure_future(gateway.admit(Vehicle())) for _ in range(5)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        queued = gateway.pending
+        await gateway.close()
+        return queued, await asyncio.gather(*admissions)
+
+    queued, locations = asyncio.run(run())
+
+    assert queued <= 2
+    assert None not in locations
+
+
+def test_admit_after_close_raises():
+    gateway = AsyncGarage(Garage(levels=[ParkingLevel(spaces=[ParkingSpace()])]))
+
+    async def run():
+        await gateway.close()
+        await gateway.admit(Vehicle())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_a_refused_id_fails_only_its_own_admission():
+    garage = RecordingGarage(
+        levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(3)])]
+    )
+    garage.add_vehicles([Vehicle(vehicle_id="x")])
+
+    async def run():
+        async with AsyncGarage(garage, max_batch_size=4, max_delay=0.01) as gateway:
+            return await asyncio.gather(
+                gateway.admit(Vehicle(vehicle_id="a")),
+                gateway.admit(Vehicle(vehicle_id="x")),
+                gateway.admit(Vehicle(vehicle_id="b")),
+                gateway.admit(Vehicle(vehicle_id="b")),
+                return_exceptions=True,
+            )
+
+    location_a, error_x, location_b, error_b = asyncio.run(run())
+
+    assert (location_a, location_b) == ((0, 1), (0, 2))
+    assert isinstance(error_x, ValueError)
+    assert isinstance(error_b, ValueError)
+    assert garage.count_parked() == 3
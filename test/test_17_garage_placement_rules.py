@@ -0,0 +1,157 @@
+import pytest
+
+from garage.garage import Garage
+from garage.journal import PlacementJournal
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.placement_rules import (
+    PLACEMENT_RULES,
+    PlacementRules,
+    PlacementTier,
+    vehicle_code,
+)
+from garage.vectorized_allocator import numpy_available
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+EV_CHARGING = 4
+
+EV_RULES = PlacementRules(
+    tiers=(
+        PlacementTier(
+            name="ev_charging",
+            vehicle_permit=EV_CHARGING,
+            space_permit=EV_CHARGING,
+            prioritized_permit=Permit.DISABILITY,
+        ),
+    )
+    + PLACEMENT_RULES.tiers
+)
+
+
+def test_default_rules_compile_to_tier_tables():
+    categories = [(0, False), (0, True), (1, False), (1, True), (2, False)]
+    tables = PLACEMENT_RULES.compile(categories)
+
+    compact_with_disability = vehicle_code(VehicleType.Compact, Permit.DISABILITY)
+    truck_with_premium = vehicle_code(VehicleType.Truck, Permit.PREMIUM)
+
+    assert tables.tier_names == ("disability", "premium", "compact", "standard")
+    assert tables.eligible[0][compact_with_disability] == ((1, False), (1, True))
+    assert not tables.admitted[1][compact_with_disability]
+    assert tables.eligible[2][compact_with_disability] == ((0, True),)
+    assert tables.eligible[1][truck_with_premium] == ((2, False),)
+    assert tables.eligible[2][truck_with_premium] == ()
+    assert tables.prioritized[0] is None
+    assert tables.prioritized[3][truck_with_premium]
+
+
+@pytest.mark.parametrize("vectorized_batch_size", [None, 1])
+def test_new_permit_only_needs_a_rule_entry(vectorized_batch_size):
+    if vectorized_batch_size and not numpy_available():
+        pytest.skip("numpy is not installed")
+
+    parking_space_a = ParkingSpace()
+    parking_space_b = ParkingSpace(required_permit=EV_CHARGING)
+    parking_space_c = ParkingSpace(required_permit=EV_CHARGING)
+
+    garage = Garage(
+        levels=[
+            ParkingLevel(spaces=[parking_space_a, parking_space_b, parking_space_c])
+        ],
+        vectorized_batch_size=vectorized_batch_size,
+        vectorized_free_ratio=None,
+        rules=EV_RULES,
+    )
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(permit=EV_CHARGING)
+    vehicle_3 = Vehicle(permit=EV_CHARGING | Permit.DISABILITY)
+    vehicle_4 = Vehicle()
+
+    actual_rejected_vehicles = garage.add_vehicles(
+        [vehicle_1, vehicle_2, vehicle_3, vehicle_4]
+    )
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[vehicle_1, vehicle_3, vehicle_2]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_4]
+    )
+
+
+@pytest.mark.parametrize("vectorized_batch_size", [None, 1])
+def test_permit_bits_no_rule_or_space_names_are_ignored(vectorized_batch_size):
+    if vectorized_batch_size and not numpy_available():
+        pytest.skip("numpy is not installed")
+
+    garage = Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(required_permit=Permit.PREMIUM),
+                    ParkingSpace(),
+                    ParkingSpace(),
+                ]
+            )
+        ],
+        vectorized_batch_size=vectorized_batch_size,
+        vectorized_free_ratio=None,
+    )
+    vehicle_1 = Vehicle(permit=EV_CHARGING)
+    vehicle_2 = Vehicle(permit=EV_CHARGING | Permit.PREMIUM)
+
+    actual_rejected_vehicles = garage.add_vehicles([vehicle_1, vehicle_2])
+    placements = garage.add_records([VehicleType.Car.value], [EV_CHARGING])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels,
+        expected_levels=[[vehicle_2, vehicle_1, garage.levels[0].spaces[2].vehicle]],
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[]
+    )
+    assert list(placements.space_indices) == [2]
+    garage.remove_vehicles([vehicle_1.vehicle_id])
+    assert garage.reserve(deadline=60, permit=EV_CHARGING).location == (0, 1)
+
+
+def test_spaces_requiring_a_permit_no_rule_names_are_covered():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace()])])
+    garage.add_space(0, ParkingSpace(required_permit=EV_CHARGING | Permit.PREMIUM))
+    vehicle_1 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_2 = Vehicle(permit=EV_CHARGING | Permit.PREMIUM)
+
+    actual_rejected_vehicles = garage.add_vehicles([vehicle_1, vehicle_2])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[vehicle_1, vehicle_2]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[]
+    )
+
+
+def test_permits_that_do_not_fit_in_a_byte_are_refused_before_placing(tmp_path):
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(3)])],
+        journal=PlacementJournal(tmp_path / "garage.journal"),
+    )
+
+    with pytest.raises(ValueError):
+        garage.add_vehicles(
+            [
+                Vehicle(vehicle_id="a"),
+                Vehicle(vehicle_id="b", permit=256),
+                Vehicle(vehicle_id="c"),
+            ]
+        )
+    with pytest.raises(ValueError):
+        garage.add_records([VehicleType.Car.value], [256], ["d"])
+    garage.journal.close()
+
+    assert garage.count_parked() == 0
+    garage.snapshot(tmp_path / "garage.snapshot")
@@ -0,0 +1,147 @@
+import random
+from typing import List
+
+import pytest
+
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vectorized_allocator import numpy_available
+from garage.vehicle import Vehicle
+from test.utils import TestHelpers
+
+
+def build_levels() -> List[ParkingLevel]:
+    rng = random.Random(0)
+    return [
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(
+                    compact=rng.random() < 0.2,
+                    required_permit=rng.choice(
+                        [Permit.NONE, Permit.NONE, Permit.DISABILITY, Permit.PREMIUM]
+                    ),
+                )
+                for _ in range(100)
+            ]
+        )
+        for _ in range(4)
+    ]
+
+
+def occupancy(garage: Garage):
+    return [[space.vehicle for space in level.spaces] for level in garage.levels]
+
+
+@pytest.mark.parametrize("vectorized_batch_size", [None, 1])
+def test_plan_matches_add_vehicles_without_changing_the_garage(vectorized_batch_size):
+    if vectorized_batch_size and not numpy_available():
+        pytest.skip("numpy is not installed")
+
+    garage = Garage(
+        levels=build_levels(),
+        vectorized_batch_size=vectorized_batch_size,
+        vectorized_free_ratio=None,
+    )
+    reference = Garage(
+        levels=build_levels(),
+        vectorized_batch_size=vectorized_batch_size,
+        vectorized_free_ratio=None,
+    )
+    vehicles = TestHelpers.random_vehicles(500, seed=1)
+    before = occupancy(garage)
+
+    plan = garage.plan(vehicles)
+    rejected = reference.add_vehicles(vehicles)
+
+    assert occupancy(garage) == before
+    assert garage.counters.occupancy == 0
+    assert [vehicles[index] for index in plan.rejected] == rejected
+    assert plan.locations == [
+        reference.locate(vehicle.vehicle_id) for vehicle in vehicles
+    ]
+
+
+def test_apply_parks_the_planned_vehicles():
+    parking_space_a = ParkingSpace(required_permit=Permit.PREMIUM)
+    parking_space_b = ParkingSpace()
+    garage = Garage(levels=[ParkingLevel(spaces=[parking_space_a, parking_space_b])])
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_3 = Vehicle()
+
+    plan = garage.plan([vehicle_1, vehicle_2, vehicle_3])
+
+    assert plan.locations == [(0, 1), (0, 0), None]
+    assert plan.rejected == [2]
+    assert garage.apply(plan)
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[vehicle_2, vehicle_1]]
+    )
+    assert garage.locate(vehicle_1.vehicle_id) == (0, 1)
+    assert garage.add_vehicles([Vehicle()]) != []
+    garage.verify_counters()
+
+
+def test_applied_plans_leave_the_pools_as_add_vehicles_does():
+    garage = Garage(levels=build_levels())
+    reference = Garage(levels=build_levels())
+    vehicles = TestHelpers.random_vehicles(300, seed=3)
+    later_vehicles = TestHelpers.random_vehicles(100, seed=4)
+
+    plan = garage.plan(vehicles)
+
+    assert garage.apply(plan)
+    reference.add_vehicles(vehicles)
+    assert list(garage.free_spaces()) == list(reference.free_spaces())
+    garage.add_vehicles(later_vehicles)
+    reference.add_vehicles(later_vehicles)
+    assert occupancy(garage) == occupancy(reference)
+    garage.verify_counters()
+
+
+def test_plans_see_expired_holds_as_free():
+    now = [0.0]
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace()])], clock=lambda: now[0]
+    )
+    garage.reserve(deadline=10)
+    now[0] = 20.0
+
+    plan = garage.plan([Vehicle()])
+
+    assert plan.locations == [(0, 0)]
+    assert garage.reserved == 0
+    assert garage.apply(plan)
+
+
+def test_stale_plans_are_not_applied():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])])
+    planned_vehicle = Vehicle()
+    plan = garage.plan([planned_vehicle])
+
+    other_vehicle = Vehicle()
+    garage.add_vehicles([other_vehicle])
+
+    assert not garage.apply(plan)
+    assert garage.locate(planned_vehicle.vehicle_id) is None
+    assert occupancy(garage) == [[other_vehicle, None]]
+
+    plan = garage.plan([planned_vehicle])
+    assert garage.apply(plan)
+    assert not garage.apply(plan)
+    assert not Garage(levels=build_levels()).apply(plan)
+
+
+def test_concurrent_garage_plans_and_applies():
+    garage = ConcurrentGarage(levels=build_levels())
+    vehicles = TestHelpers.random_vehicles(300, seed=2)
+
+    plan = garage.plan(vehicles)
+
+    assert garage.apply(plan)
+    assert garage.counters.occupancy == len(vehicles) - len(plan.rejected)
+    garage.verify_counters()
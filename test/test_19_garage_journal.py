@@ -0,0 +1,159 @@
+import os
+import time
+
+import pytest
+
+from garage.garage import Garage
+from garage.journal import HEADER, RECORD, PlacementJournal
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+
+def record_count(path) -> int:
+    return (os.path.getsize(path) - HEADER.size) // RECORD.size
+
+
+def test_journal_replays_placements_and_departures(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    garage = Garage(
+        levels=TestHelpers.mixed_levels(), journal=PlacementJournal(journal_path)
+    )
+    garage.add_vehicles(
+        [
+            Vehicle(vehicle_id="d", permit=Permit.DISABILITY),
+            Vehicle(vehicle_id="c", vehicle_type=VehicleType.Compact),
+            Vehicle(vehicle_id="t", vehicle_type=VehicleType.Truck),
+            Vehicle(vehicle_id="a"),
+            Vehicle(vehicle_id="r"),
+        ]
+    )
+    garage.remove_vehicles(["t"])
+    garage.journal.close()
+
+    # Five placement outcomes and one departure.
+    assert record_count(journal_path) == 6
+
+    recovered = Garage.recover(journal_path, levels=TestHelpers.mixed_levels())
+
+    assert TestHelpers.occupant_ids(recovered) == [["d", "c"], [None, "a"]]
+    assert recovered.levels[0].spaces[0].vehicle.permit is Permit.DISABILITY
+    assert recovered.levels[0].spaces[1].vehicle.vehicle_type is VehicleType.Compact
+    assert recovered.locate("a") == (1, 1)
+    recovered.verify_counters()
+
+
+def test_records_are_group_committed(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    journal = PlacementJournal(journal_path, commit_interval=3600)
+    garage = Garage(levels=TestHelpers.mixed_levels(), journal=journal)
+
+    garage.add_vehicles([Vehicle(), Vehicle()])
+    garage.add_vehicles([Vehicle()])
+
+    assert record_count(journal_path) == 0
+
+    journal.close()
+
+    assert record_count(journal_path) == 3
+
+
+def test_buffered_records_are_written_when_the_commit_interval_ends(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    journal = PlacementJournal(journal_path, commit_interval=0.05)
+    garage = Garage(levels=TestHelpers.mixed_levels(), journal=journal)
+
+    garage.add_vehicles([Vehicle(), Vehicle()])
+
+    assert record_count(journal_path) == 0
+
+    deadline = time.monotonic() + 5
+    while record_count(journal_path) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert record_count(journal_path) == 2
+    journal.close()
+
+
+def test_an_id_too_long_to_journal_rejects_the_whole_batch(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    garage = Garage(
+        levels=TestHelpers.mixed_levels(), journal=PlacementJournal(journal_path)
+    )
+    vehicles = [
+        Vehicle(vehicle_id="a"),
+        Vehicle(vehicle_id="x" * 60),
+        Vehicle(vehicle_id="b"),
+    ]
+
+    with pytest.raises(ValueError):
+        garage.add_vehicles(vehicles)
+    with pytest.raises(ValueError):
+        list(garage.add_vehicle_stream(vehicles, batch_size=3))
+    with pytest.raises(ValueError):
+        garage.add_records(
+            [1, 1, 1], [0, 0, 0], [vehicle.vehicle_id for vehicle in vehicles]
+        )
+
+    assert TestHelpers.occupant_ids(garage) == [[None, None], [None, None]]
+
+    garage.add_vehicles([vehicles[0], vehicles[2]])
+    garage.journal.close()
+
+    recovered = Garage.recover(journal_path, levels=TestHelpers.mixed_levels())
+
+    assert (
+        TestHelpers.occupant_ids(recovered)
+        == TestHelpers.occupant_ids(garage)
+        == [
+            [None, None],
+            ["a", "b"],
+        ]
+    )
+
+
+def test_checkpoint_compacts_the_journal(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    snapshot_path = tmp_path / "garage.snapshot"
+    garage = Garage(
+        levels=TestHelpers.mixed_levels(), journal=PlacementJournal(journal_path)
+    )
+    garage.add_vehicles([Vehicle(vehicle_id="a"), Vehicle(vehicle_id="b")])
+
+    garage.checkpoint(snapshot_path)
+
+    assert record_count(journal_path) == 0
+
+    garage.remove_vehicles(["a"])
+    garage.add_vehicles([Vehicle(vehicle_id="c")])
+    garage.journal.close()
+
+    recovered = Garage.recover(journal_path, snapshot_path=snapshot_path)
+
+    assert TestHelpers.occupant_ids(recovered) == TestHelpers.occupant_ids(garage)
+    recovered.verify_counters()
+
+
+def test_replay_ignores_a_record_cut_short(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    garage = Garage(
+        levels=TestHelpers.mixed_levels(), journal=PlacementJournal(journal_path)
+    )
+    garage.add_vehicles([Vehicle(vehicle_id="a"), Vehicle(vehicle_id="b")])
+    garage.journal.close()
+
+    with open(journal_path, "r+b") as journal:
+        journal.truncate(os.path.getsize(journal_path) - RECORD.size // 2)
+
+    recovered = Garage.recover(journal_path, levels=TestHelpers.mixed_levels())
+    recovered.add_vehicles([Vehicle(vehicle_id="c")])
+    recovered.journal.close()
+
+    assert TestHelpers.occupant_ids(recovered) == [[None, None], ["a", "c"]]
+    assert TestHelpers.occupant_ids(
+        Garage.recover(journal_path, levels=TestHelpers.mixed_levels())
+    ) == [
+        [None, None],
+        ["a", "c"],
+    ]
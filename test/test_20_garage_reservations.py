@@ -0,0 +1,108 @@
+import pytest
+
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.timer_wheel import TimerWheel
+from garage.vehicle import Vehicle
+from test.utils import TestHelpers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def build_garage(clock: FakeClock) -> Garage:
+    return Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(required_permit=Permit.PREMIUM),
+                    ParkingSpace(),
+                    ParkingSpace(),
+                ]
+            )
+        ],
+        clock=clock,
+    )
+
+
+def test_reserved_spaces_are_skipped_by_admission():
+    clock = FakeClock()
+    garage = build_garage(clock)
+
+    reservation = garage.reserve(deadline=60, permit=Permit.PREMIUM)
+
+    assert reservation.location == (0, 0)
+
+    vehicle_1 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_2 = Vehicle()
+    vehicle_3 = Vehicle()
+
+    actual_rejected_vehicles = garage.add_vehicles([vehicle_1, vehicle_2, vehicle_3])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[None, vehicle_1, vehicle_2]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_3]
+    )
+    assert garage.reserved == 1
+
+
+def test_claim_parks_in_the_reserved_space():
+    clock = FakeClock()
+    garage = build_garage(clock)
+    reservation = garage.reserve(deadline=60, permit=Permit.PREMIUM)
+    vehicle = Vehicle(permit=Permit.PREMIUM)
+
+    with pytest.raises(ValueError):
+        garage.claim(reservation.reservation_id, Vehicle())
+
+    clock.now = 30
+
+    assert garage.claim(reservation.reservation_id, vehicle) == (0, 0)
+    assert garage.locate(vehicle.vehicle_id) == (0, 0)
+    assert garage.claim(reservation.reservation_id, Vehicle()) is None
+    assert garage.reserved == 0
+    garage.verify_counters()
+
+
+def test_expired_holds_go_straight_back_to_admission():
+    clock = FakeClock()
+    garage = build_garage(clock)
+    held = [garage.reserve(deadline=10) for _ in range(2)]
+    cancelled = garage.reserve(deadline=5, permit=Permit.PREMIUM)
+
+    assert garage.reserve(deadline=10) is None
+    assert garage.cancel(cancelled.reservation_id)
+    assert not garage.cancel(cancelled.reservation_id)
+
+    clock.now = 9
+    assert garage.add_vehicles([Vehicle()]) != []
+
+    clock.now = 10
+    vehicle = Vehicle()
+    assert garage.add_vehicles([vehicle]) == []
+    assert garage.locate(vehicle.vehicle_id) == (0, 1)
+    assert garage.claim(held[1].reservation_id, Vehicle()) is None
+    assert garage.reserved == 0
+
+
+def test_timer_wheel_fires_buckets_once_their_tick_passes():
+    wheel = TimerWheel(resolution=1.0)
+    wheel.schedule(0.5, "a")
+    wheel.schedule(1.0, "b")
+    wheel.schedule(1.5, "c")
+    wheel.schedule(7.0, "d")
+
+    assert list(wheel.expired(0.9)) == []
+    assert sorted(wheel.expired(1.0)) == ["a", "b"]
+    assert list(wheel.expired(1.7)) == []
+    assert list(wheel.expired(6.0)) == ["c"]
+    assert len(wheel) == 1
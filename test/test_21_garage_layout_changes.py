@@ -0,0 +1,146 @@
+import pytest
+
+from garage.compact_layout import CompactLayout
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+
+def build_garage(compact_layout: bool) -> Garage:
+    levels = [
+        ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()]),
+        ParkingLevel(spaces=[ParkingSpace(required_permit=Permit.PREMIUM)]),
+    ]
+    if compact_layout:
+        return Garage(levels=CompactLayout.from_levels(levels).levels())
+    return Garage(levels=levels)
+
+
+@pytest.mark.parametrize("compact_layout", [False, True])
+def test_added_levels_and_spaces_take_vehicles(compact_layout):
+    garage = build_garage(compact_layout)
+    vehicle_1 = Vehicle()
+    garage.add_vehicles([vehicle_1, Vehicle()])
+
+    parked_vehicle = Vehicle(vehicle_id="parked")
+    level_index = garage.add_level(
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(compact=True),
+                ParkingSpace(vehicle=parked_vehicle),
+            ]
+        )
+    )
+    space_index = garage.add_space(0, ParkingSpace())
+
+    assert (level_index, space_index) == (2, 2)
+    assert garage.locate("parked") == (2, 1)
+
+    vehicle_3 = Vehicle()
+    vehicle_4 = Vehicle(vehicle_type=VehicleType.Compact)
+    vehicle_5 = Vehicle()
+    rejected = garage.add_vehicles([vehicle_3, vehicle_4, vehicle_5])
+
+    assert garage.locate(vehicle_3.vehicle_id) == (0, 2)
+    assert garage.locate(vehicle_4.vehicle_id) == (2, 0)
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=rejected, expected=[vehicle_5]
+    )
+    garage.verify_counters()
+
+
+@pytest.mark.parametrize("compact_layout", [False, True])
+def test_removal_renumbers_later_spaces(compact_layout):
+    garage = build_garage(compact_layout)
+    garage.add_level(ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()]))
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(permit=Permit.PREMIUM)
+    garage.add_vehicles([vehicle_1])
+    garage.add_vehicles([vehicle_2])
+
+    with pytest.raises(ValueError):
+        garage.remove_level(1)
+    with pytest.raises(ValueError):
+        garage.remove_space(0, 0)
+
+    garage.remove_vehicles([vehicle_2.vehicle_id])
+    garage.remove_level(1)
+    garage.remove_space(0, 1)
+
+    assert len(garage.levels) == 2
+    assert [len(level.spaces) for level in garage.levels] == [1, 2]
+    assert garage.locate(vehicle_1.vehicle_id) == (0, 0)
+
+    vehicle_3 = Vehicle()
+    vehicle_4 = Vehicle()
+    vehicle_5 = Vehicle()
+    rejected = garage.add_vehicles([vehicle_3, vehicle_4, vehicle_5])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels,
+        expected_levels=[[vehicle_1], [vehicle_3, vehicle_4]],
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=rejected, expected=[vehicle_5]
+    )
+    garage.verify_counters()
+
+
+@pytest.mark.parametrize("compact_layout", [False, True])
+def test_restriped_spaces_change_category(compact_layout):
+    garage = build_garage(compact_layout)
+    parked_vehicle = Vehicle()
+    garage.add_vehicles([parked_vehicle])
+
+    with pytest.raises(ValueError):
+        garage.update_space(0, 0, required_permit=Permit.DISABILITY)
+
+    garage.update_space(0, 1, required_permit=Permit.DISABILITY)
+    garage.update_space(1, 0, required_permit=Permit.NONE)
+
+    assert garage.levels[0].spaces[1].required_permit == Permit.DISABILITY
+
+    vehicle_2 = Vehicle()
+    vehicle_3 = Vehicle()
+    vehicle_4 = Vehicle(permit=Permit.DISABILITY)
+    rejected = garage.add_vehicles([vehicle_2, vehicle_3, vehicle_4])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels,
+        expected_levels=[[parked_vehicle, vehicle_4], [vehicle_2]],
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=rejected, expected=[vehicle_3]
+    )
+    garage.verify_counters()
+
+
+def test_held_spaces_follow_layout_changes():
+    garage = ConcurrentGarage(
+        levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])],
+        clock=lambda: 0.0,
+    )
+    garage.add_level(ParkingLevel(spaces=[ParkingSpace()]))
+    garage.add_level(
+        ParkingLevel(spaces=[ParkingSpace(required_permit=Permit.PREMIUM)])
+    )
+    reservation = garage.reserve(deadline=60, permit=Permit.PREMIUM)
+
+    assert reservation.location == (2, 0)
+
+    garage.remove_level(1)
+    garage.update_space(1, 0, required_permit=Permit.NONE)
+
+    with pytest.raises(ValueError):
+        garage.remove_space(1, 0)
+
+    vehicle = Vehicle()
+
+    assert garage.claim(reservation.reservation_id, vehicle) == (1, 0)
+    assert garage.add_vehicles([Vehicle(), Vehicle(), Vehicle()]) != []
+    garage.verify_counters()
@@ -0,0 +1,144 @@
+import pytest
+
+from garage.compact_layout import CompactLayout
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+
+def build_levels():
+    return [
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(required_permit=Permit.PREMIUM),
+                ParkingSpace(compact=True),
+                ParkingSpace(),
+            ]
+        ),
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(required_permit=Permit.PREMIUM),
+                ParkingSpace(compact=True),
+                ParkingSpace(compact=True),
+            ]
+        ),
+    ]
+
+
+@pytest.mark.parametrize("compact_layout", [False, True])
+def test_parked_vehicles_are_queried_by_permit_type_and_level(compact_layout):
+    levels = build_levels()
+    if compact_layout:
+        levels = CompactLayout.from_levels(levels).levels()
+    garage = Garage(levels=levels)
+    premium_car = Vehicle(vehicle_id="p1", permit=Permit.PREMIUM)
+    premium_compact = Vehicle(
+        vehicle_id="p2",
+        vehicle_type=VehicleType.Compact,
+        permit=Permit.PREMIUM | Permit.DISABILITY,
+    )
+    compact = Vehicle(vehicle_id="c", vehicle_type=VehicleType.Compact)
+    car = Vehicle(vehicle_id="a")
+    garage.add_vehicles([premium_car, premium_compact, compact, car])
+
+    assert garage.locate("p1") == (1, 0)
+    assert garage.count_parked() == 4
+    assert garage.count_parked(permit=Permit.PREMIUM) == 2
+    assert garage.count_parked(permit=Permit.PREMIUM, level_index=1) == 1
+    assert list(garage.parked(permit=Permit.PREMIUM, level_index=1)) == [premium_car]
+    assert set(garage.parked(vehicle_type=VehicleType.Compact)) == {
+        premium_compact,
+        compact,
+    }
+    assert list(garage.parked(level_index=0, vehicle_type=VehicleType.Truck)) == []
+
+    garage.remove_vehicles(["p1"])
+
+    assert garage.count_parked(permit=Permit.PREMIUM, level_index=1) == 0
+    assert garage.count_parked(level_index=0) == 3
+
+
+def test_free_spaces_are_yielded_in_garage_order():
+    garage = Garage(levels=build_levels(), clock=lambda: 0.0)
+    garage.add_vehicles([Vehicle(vehicle_type=VehicleType.Compact)])
+    reservation = garage.reserve(deadline=60)
+
+    assert reservation.location == (0, 2)
+    assert list(garage.free_spaces(compact=True)) == [(1, 1), (1, 2)]
+    assert list(garage.free_spaces(level_index=1)) == [(1, 0), (1, 1), (1, 2)]
+    assert list(garage.free_spaces(required_permit=Permit.PREMIUM)) == [
+        (0, 0),
+        (1, 0),
+    ]
+    assert garage.count_free() == 4
+    assert garage.count_free(compact=True) == 2
+    assert garage.count_free(level_index=0) == 1
+    assert garage.count_free(compact=False, required_permit=0, level_index=0) == 0
+
+
+@pytest.mark.parametrize("compact_layout", [False, True])
+def test_level_queries_match_the_whole_garage_queries(compact_layout):
+    levels = build_levels()
+    if compact_layout:
+        levels = CompactLayout.from_levels(levels).levels()
+    now = [0.0]
+    garage = Garage(levels=levels, clock=lambda: now[0])
+    garage.add_vehicles([Vehicle(vehicle_type=VehicleType.Compact)])
+    kept = garage.reserve(deadline=60, permit=Permit.PREMIUM)
+    cancelled = garage.reserve(deadline=60)
+    garage.reserve(deadline=10, vehicle_type=VehicleType.Compact)
+    garage.update_space(*kept.location, compact=True)
+    garage.cancel(cancelled.reservation_id)
+    now[0] = 30.0
+    garage.expire_reservations()
+
+    for level_index in range(len(garage.levels)):
+        for compact in [None, False, True]:
+            expected = [
+                location
+                for location in garage.free_spaces(compact=compact)
+                if location[0] == level_index
+            ]
+            assert (
+                list(garage.free_spaces(compact=compact, level_index=level_index))
+                == expected
+            )
+            assert garage.count_free(compact=compact, level_index=level_index) == len(
+                expected
+            )
+
+
+def test_changing_the_garage_while_iterating_raises():
+    garage = Garage(levels=build_levels())
+    garage.add_vehicles([Vehicle(), Vehicle(permit=Permit.PREMIUM)])
+
+    free_spaces = garage.free_spaces()
+    next(free_spaces)
+    garage.add_vehicles([Vehicle(vehicle_type=VehicleType.Compact)])
+
+    with pytest.raises(RuntimeError):
+        list(free_spaces)
+
+    parked = garage.parked()
+    next(parked)
+    garage.add_vehicles([Vehicle(permit=Permit.PREMIUM)])
+
+    with pytest.raises(RuntimeError):
+        list(parked)
+
+
+def test_concurrent_garage_queries_return_copies():
+    garage = ConcurrentGarage(levels=build_levels())
+    garage.add_vehicles([Vehicle(), Vehicle(permit=Permit.PREMIUM)])
+
+    free_spaces = garage.free_spaces()
+    parked = garage.parked()
+    garage.add_vehicles([Vehicle(vehicle_type=VehicleType.Compact)])
+
+    assert list(free_spaces) == [(0, 1), (1, 0), (1, 1), (1, 2)]
+    assert len(list(parked)) == 2
+    assert garage.count_free() == 3
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from garage.cli import main
+from garage.garage import Garage
+from garage.loader import load_arrivals, load_layout, read_arrivals
+from garage.permit import Permit
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+LAYOUT_CSV = """level,compact,required_permit
+P1,false,DISABILITY
+P1,true,
+P2,0,premium
+P2,1,0
+P2,,
+"""
+
+ARRIVALS = [
+    {"vehicle_id": "a", "vehicle_type": "Car", "permit": "DISABILITY"},
+    {"vehicle_id": "b", "vehicle_type": "compact"},
+    {"vehicle_id": "c", "permit": "DISABILITY|PREMIUM"},
+    {"vehicle_id": "d"},
+    {"vehicle_id": "e", "vehicle_type": 2},
+    {"vehicle_id": "f", "vehicle_type": "Compact"},
+]
+
+
+def write_files(tmp_path):
+    layout_path = tmp_path / "layout.csv"
+    layout_path.write_text(LAYOUT_CSV)
+    arrivals_path = tmp_path / "arrivals.jsonl"
+    arrivals_path.write_text("".join(json.dumps(row) + "\n" for row in ARRIVALS))
+    return str(layout_path), str(arrivals_path)
+
+
+def test_layout_and_arrivals_are_loaded_in_batches(tmp_path):
+    layout_path, arrivals_path = write_files(tmp_path)
+
+    garage = Garage(levels=load_layout(layout_path))
+
+    assert [len(level.spaces) for level in garage.levels] == [2, 3]
+    assert garage.levels[0].spaces[0].required_permit == Permit.DISABILITY
+    assert garage.levels[1].spaces[1].compact
+
+    rejected = list(load_arrivals(garage, arrivals_path, batch_size=2))
+
+    assert TestHelpers.occupant_ids(garage) == [["a", "b"], ["c", "f", "d"]]
+    assert [vehicle.vehicle_id for vehicle in rejected] == ["e"]
+    assert rejected[0].vehicle_type is VehicleType.Truck
+    garage.verify_counters()
+
+
+def test_cli_writes_rejections_and_reports_throughput(tmp_path, capsys):
+    layout_path, arrivals_path = write_files(tmp_path)
+    rejected_path = tmp_path / "rejected.csv"
+
+    assert (
+        main(["load", layout_path, arrivals_path, "--rejected", str(rejected_path)])
+        == 0
+    )
+
+    assert rejected_path.read_text().splitlines() == [
+        "vehicle_id,vehicle_type,permit",
+        "e,Truck,NONE",
+    ]
+    report = capsys.readouterr().err
+    assert "5 spaces" in report
+    assert "6 rows" in report
+    assert "5 parked, 1 rejected" in report
+    assert [vehicle.vehicle_id for vehicle in read_arrivals(str(rejected_path))] == [
+        "e"
+    ]
+
+
+def test_malformed_rows_name_the_row(tmp_path):
+    layout_path = tmp_path / "layout.csv"
+    layout_path.write_text("level,compact\n1,true\n2,maybe\n")
+
+    with pytest.raises(ValueError, match="row 2"):
+        load_layout(str(layout_path))
+
+    layout_path.write_text("level\n1\n2\n1\n")
+
+    with pytest.raises(ValueError, match="not contiguous"):
+        load_layout(str(layout_path))
+
+    layout_path.write_text("level\n1\n")
+    arrivals_path = tmp_path / "arrivals.jsonl"
+    arrivals_path.write_text('{"permit": "GOLD"}\n')
+
+    with pytest.raises(SystemExit, match="1"):
+        main(["load", str(layout_path), str(arrivals_path)])
+
+
+def test_unhashable_values_name_the_row(tmp_path, capsys):
+    layout_path = tmp_path / "layout.jsonl"
+    layout_path.write_text('{"level": 1}\n{"level": [1]}\n')
+
+    with pytest.raises(ValueError, match="row 2"):
+        load_layout(str(layout_path))
+
+    layout_path.write_text('{"level": 1}\n')
+    arrivals_path = tmp_path / "arrivals.jsonl"
+    arrivals_path.write_text('{"vehicle_type": "car"}\n{"permit": [1]}\n')
+
+    with pytest.raises(SystemExit, match="1"):
+        main(["load", str(layout_path), str(arrivals_path)])
+    assert f"garage: {arrivals_path}: row 2: " in capsys.readouterr().err
@@ -0,0 +1,92 @@
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.simulation import (
+    ARRIVAL,
+    DAY,
+    DEPARTURE,
+    HOUR,
+    EventScheduler,
+    Simulation,
+    TrafficMix,
+    exponential_dwell,
+)
+from garage.vehicle_type import VehicleType
+
+
+def build_garage(space_count: int) -> Garage:
+    return Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(space_count)])]
+    )
+
+
+def test_scheduler_pops_simultaneous_events_as_one_batch():
+    scheduler = EventScheduler()
+    scheduler.schedule(5, ARRIVAL, "c")
+    scheduler.schedule(5, DEPARTURE, "a")
+    scheduler.schedule(2, ARRIVAL, "x")
+    scheduler.schedule(5, DEPARTURE, "b")
+
+    assert scheduler.next_tick == 2
+    assert scheduler.pop() == (2, ARRIVAL, ["x"])
+    assert scheduler.pop() == (5, DEPARTURE, ["a", "b"])
+    assert scheduler.pop() == (5, ARRIVAL, ["c"])
+    assert not scheduler
+    assert scheduler.next_tick is None
+
+
+def test_simulation_reaches_a_steady_state():
+    garage = build_garage(500)
+    mix = TrafficMix(
+        arrivals_per_hour=100,
+        vehicle_types={VehicleType.Car: 1.0},
+        permits={Permit.NONE: 1.0},
+        dwell=exponential_dwell(2 * HOUR),
+    )
+
+    report = Simulation(garage, mix, seed=1).run(DAY)
+
+    arrival_count = report.arrivals[VehicleType.Car, Permit.NONE]
+    assert 2000 < arrival_count < 2800
+    assert report.rejections == {}
+    assert report.events == arrival_count + report.departures
+    assert report.occupancy[0] == (0.0, 0)
+    assert len(report.occupancy) == 24 * 4 + 1
+    # Little's law: 100 arrivals an hour staying 2 hours keep about 200 parked.
+    steady = [parked for seconds, parked in report.occupancy if seconds >= 8 * HOUR]
+    assert 150 < sum(steady) / len(steady) < 250
+    assert garage.counters.occupancy == arrival_count - report.departures
+    garage.verify_counters()
+
+
+def test_rejection_rates_are_reported_per_category():
+    garage = build_garage(50)
+    mix = TrafficMix(
+        arrivals_per_hour=[0] * 8 + [600] * 4 + [0] * 12,
+        dwell=lambda rng: DAY,
+    )
+    simulation = Simulation(garage, mix, seed=2)
+
+    morning = simulation.run(8 * HOUR)
+
+    assert morning.arrivals == {}
+    assert simulation.now == 8 * HOUR
+
+    report = simulation.run(4 * HOUR)
+
+    assert garage.counters.occupancy == 50
+    assert sum(report.rejections.values()) == sum(report.arrivals.values()) - 50
+    assert report.rejection_rates[VehicleType.Truck, Permit.PREMIUM] > 0.9
+    assert all(0 <= rate <= 1 for rate in report.rejection_rates.values())
+
+
+def test_same_seed_gives_the_same_report():
+    reports = [
+        Simulation(build_garage(100), TrafficMix(arrivals_per_hour=200), seed=3).run(
+            6 * HOUR
+        )
+        for _ in range(2)
+    ]
+
+    assert reports[0]._replace(wall_seconds=0) == reports[1]._replace(wall_seconds=0)
@@ -0,0 +1,105 @@
+import pytest
+
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import GREEDY, OPTIMAL, Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.placement_rules import PLACEMENT_RULES
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+
+def assert_valid_placements(garage: Garage):
+    for level in garage.levels:
+        for space in level.spaces:
+            vehicle = space.vehicle
+            if vehicle is not None:
+                assert PLACEMENT_RULES.vehicle_may_use(
+                    vehicle.vehicle_type,
+                    vehicle.permit,
+                    (int(space.required_permit), space.compact),
+                )
+    garage.verify_counters()
+
+
+def test_optimal_parks_vehicles_greedy_placement_rejects():
+    premium_space = ParkingSpace(required_permit=Permit.PREMIUM)
+    compact_space = ParkingSpace(compact=True)
+    garage = Garage(levels=[ParkingLevel(spaces=[premium_space, compact_space])])
+
+    premium_compact = Vehicle(vehicle_type=VehicleType.Compact, permit=Permit.PREMIUM)
+    premium_car = Vehicle(permit=Permit.PREMIUM)
+
+    rejected = garage.plan([premium_compact, premium_car]).rejected
+    actual_rejected_vehicles = garage.add_vehicles(
+        [premium_compact, premium_car], strategy=OPTIMAL
+    )
+
+    assert rejected == [1]
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[premium_car, premium_compact]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[]
+    )
+
+
+def test_optimal_keeps_tier_preferences_when_nothing_is_rejected():
+    garage = Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(),
+                    ParkingSpace(required_permit=Permit.DISABILITY),
+                    ParkingSpace(compact=True),
+                ]
+            )
+        ]
+    )
+    disability_compact = Vehicle(
+        vehicle_type=VehicleType.Compact, permit=Permit.DISABILITY
+    )
+    car = Vehicle()
+
+    assert garage.add_vehicles([car, disability_compact], strategy=OPTIMAL) == []
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[car, disability_compact, None]]
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_optimal_never_parks_fewer_vehicles_than_greedy(seed):
+    greedy = Garage(
+        levels=TestHelpers.random_levels(seed, level_count=3, space_count=40),
+        vectorized_batch_size=None,
+    )
+    optimal = Garage(
+        levels=TestHelpers.random_levels(seed, level_count=3, space_count=40)
+    )
+    vehicles = TestHelpers.random_vehicles(150, seed)
+
+    greedy_rejected = greedy.add_vehicles(vehicles, strategy=GREEDY)
+    optimal_rejected = optimal.add_vehicles(vehicles, strategy=OPTIMAL)
+
+    assert len(optimal_rejected) <= len(greedy_rejected)
+    assert optimal.counters.occupancy + len(optimal_rejected) == len(vehicles)
+    assert_valid_placements(optimal)
+
+
+def test_concurrent_garage_and_plans_support_the_optimal_strategy():
+    garage = ConcurrentGarage(
+        levels=TestHelpers.random_levels(7, level_count=3, space_count=40)
+    )
+    vehicles = TestHelpers.random_vehicles(100, seed=7)
+
+    plan = garage.plan(vehicles, strategy=OPTIMAL)
+    rejected = garage.add_vehicles(vehicles, strategy=OPTIMAL)
+
+    assert [vehicles[index] for index in plan.rejected] == rejected
+    assert plan.locations == [garage.locate(vehicle.vehicle_id) for vehicle in vehicles]
+    assert_valid_placements(garage)
+
+    with pytest.raises(ValueError):
+        garage.add_vehicles([Vehicle()], strategy="fastest")
@@ -0,0 +1,88 @@
+import sys
+import tracemalloc
+
+from garage.compact_layout import CompactLayout
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import Garage
+from garage.memory_report import deep_sizeof
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.vehicle import Vehicle
+
+
+def build_levels():
+    return [
+        ParkingLevel(spaces=[ParkingSpace() for _ in range(6)]),
+        ParkingLevel(spaces=[ParkingSpace(compact=True) for _ in range(4)]),
+    ]
+
+
+def build_vehicles():
+    return [Vehicle(vehicle_id=f"vehicle-{index:04}") for index in range(5)]
+
+
+def test_memory_is_broken_down_by_component_and_level():
+    levels = build_levels()
+    garage = Garage(levels=levels)
+    vehicles = build_vehicles()
+    garage.add_vehicles(vehicles)
+
+    report = garage.memory_report()
+
+    space_size = sys.getsizeof(levels[0].spaces[0])
+    vehicle_size = sys.getsizeof(vehicles[0])
+    id_size = sys.getsizeof(vehicles[0].vehicle_id)
+    assert (report.space_count, report.vehicle_count) == (10, 5)
+    assert [level.spaces for level in report.levels] == [
+        6 * space_size,
+        4 * space_size,
+    ]
+    assert [level.vehicles for level in report.levels] == [5 * vehicle_size, 0]
+    assert report.levels[0].vehicle_ids == 5 * id_size
+    assert report.components["vehicles"] == 5 * vehicle_size
+    assert report.components["vehicle_ids"] == 5 * id_size
+    assert report.components["levels"] == sum(level.level for level in report.levels)
+    assert report.total == sum(report.components.values())
+    assert report.bytes_per_vehicle > vehicle_size + id_size
+    assert report.allocations == {}
+
+
+def test_vehicle_ids_shared_by_indexes_are_counted_once():
+    garage = Garage(levels=build_levels())
+    vehicles = build_vehicles()
+    garage.add_vehicles(vehicles)
+
+    report = garage.memory_report()
+
+    # The location index is keyed by the same ID strings the vehicles hold.
+    seen = set()
+    for vehicle in vehicles:
+        deep_sizeof(vehicle.vehicle_id, seen)
+    assert report.components["locations"] == deep_sizeof(garage._locations, seen)
+
+
+def test_compact_layouts_report_their_columns_per_level():
+    layout = CompactLayout.from_levels(build_levels())
+    garage = Garage(levels=layout.levels())
+    garage.add_vehicles(build_vehicles())
+
+    report = garage.memory_report()
+
+    # A compact byte, a permit byte and an 8-byte occupant slot per space.
+    assert [level.spaces for level in report.levels] == [6 * 10, 4 * 10]
+    assert report.components["vehicles"] == 5 * sys.getsizeof(layout.vehicles[0])
+    assert report.components["layout"] > 0
+    object_report = Garage(levels=build_levels()).memory_report()
+    assert report.components["spaces"] < object_report.components["spaces"]
+
+
+def test_traced_allocations_are_reported_per_module():
+    tracemalloc.start()
+    try:
+        garage = ConcurrentGarage(levels=build_levels())
+        report = garage.memory_report()
+    finally:
+        tracemalloc.stop()
+
+    assert report.allocations["free_space_pools.py"] > 0
+    assert "memory_report.py" not in report.allocations
@@ -0,0 +1,135 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from garage.compact_layout import CompactLevels
+from garage.concurrent_garage import ConcurrentGarage
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.sqlite_store import SqliteStore
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+
+def build_levels():
+    return TestHelpers.mixed_levels() + [ParkingLevel()]
+
+
+def test_garage_state_survives_reopening(tmp_path):
+    path = tmp_path / "garage.db"
+    garage = Garage.open_sqlite(path, levels=build_levels())
+    garage.add_vehicles(
+        [
+            Vehicle(vehicle_id="d", permit=Permit.DISABILITY),
+            Vehicle(vehicle_id="c", vehicle_type=VehicleType.Compact),
+            Vehicle(vehicle_id="t", vehicle_type=VehicleType.Truck),
+            Vehicle(vehicle_id="a"),
+            Vehicle(vehicle_id="r"),
+        ]
+    )
+    garage.remove_vehicles(["t"])
+    garage.journal.close()
+
+    reopened = Garage.open_sqlite(path, levels=[ParkingLevel()])
+
+    assert isinstance(reopened.levels, CompactLevels)
+    assert TestHelpers.occupant_ids(reopened) == [["d", "c"], [None, "a"], []]
+    assert reopened.levels[0].spaces[0].vehicle.permit is Permit.DISABILITY
+    assert reopened.levels[0].spaces[1].vehicle.vehicle_type is VehicleType.Compact
+    assert reopened.levels[0].spaces[0].required_permit == Permit.DISABILITY
+    assert reopened.locate("a") == (1, 1)
+    reopened.verify_counters()
+    reopened.journal.close()
+
+
+def test_each_batch_is_committed_as_one_transaction(tmp_path):
+    path = tmp_path / "garage.db"
+    garage = Garage.open_sqlite(path, levels=build_levels())
+    connection = sqlite3.connect(path)
+    statements = []
+    garage.journal._writer.set_trace_callback(statements.append)
+
+    garage.add_vehicles([Vehicle(vehicle_id="a"), Vehicle(vehicle_id="b")])
+
+    assert [statement.split()[0] for statement in statements] == [
+        "BEGIN",
+        "UPDATE",
+        "UPDATE",
+        "COMMIT",
+    ]
+    assert connection.execute(
+        "SELECT vehicle_id FROM spaces WHERE free = 0 ORDER BY level, space"
+    ).fetchall() == [("a",), ("b",)]
+    connection.close()
+    garage.journal.close()
+
+
+def test_other_stores_query_the_state_a_garage_writes(tmp_path):
+    path = tmp_path / "garage.db"
+    garage = ConcurrentGarage.open_sqlite(path, levels=build_levels())
+    garage.add_vehicles(
+        [Vehicle(vehicle_id=f"v{index}") for index in range(2)]
+        + [Vehicle(vehicle_id="c", vehicle_type=VehicleType.Compact)]
+    )
+
+    with SqliteStore(path, reader_pool_size=2) as reader:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            locations = list(executor.map(reader.locate, ["v0", "v1", "c", "x"] * 4))
+        assert locations[:4] == [(1, 0), (1, 1), (0, 1), None]
+        assert locations[4:] == locations[:4] * 3
+        assert reader.count_parked() == 3
+        assert reader.count_free() == 1
+        assert reader.count_free(required_permit=Permit.DISABILITY) == 1
+        assert reader.count_free(compact=True) == 0
+
+        garage.remove_vehicles(["v0"])
+
+        assert reader.locate("v0") is None
+        assert reader.count_free(compact=False, required_permit=Permit.NONE) == 1
+    garage.journal.close()
+
+
+def test_layout_changes_are_written_through(tmp_path):
+    path = tmp_path / "garage.db"
+    garage = Garage.open_sqlite(path, levels=build_levels())
+    garage.add_vehicles([Vehicle(vehicle_id="a"), Vehicle(vehicle_id="b")])
+    garage.add_level(
+        ParkingLevel(
+            spaces=[
+                ParkingSpace(compact=True),
+                ParkingSpace(vehicle=Vehicle(vehicle_id="c")),
+            ]
+        )
+    )
+    garage.add_space(2, ParkingSpace(required_permit=Permit.PREMIUM))
+    garage.remove_space(0, 0)
+    garage.remove_vehicles(["a"])
+    garage.update_space(1, 0, required_permit=Permit.PREMIUM)
+    garage.remove_level(2)
+    garage.add_vehicles([Vehicle(vehicle_id="d", vehicle_type=VehicleType.Compact)])
+    garage.journal.close()
+
+    reopened = Garage.open_sqlite(path)
+
+    assert (
+        TestHelpers.occupant_ids(reopened)
+        == TestHelpers.occupant_ids(garage)
+        == [
+            ["d"],
+            [None, "b"],
+            [None, "c"],
+        ]
+    )
+    assert [
+        [(space.compact, space.required_permit) for space in level.spaces]
+        for level in reopened.levels
+    ] == [
+        [(True, Permit.NONE)],
+        [(False, Permit.PREMIUM), (False, Permit.NONE)],
+        [(True, Permit.NONE), (False, Permit.NONE)],
+    ]
+    assert reopened.locate("c") == (2, 1)
+    reopened.verify_counters()
+    reopened.journal.close()
@@ -0,0 +1,149 @@
+import random
+
+import pytest
+
+from garage.garage import Garage
+from garage.journal import PlacementJournal
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import PERMITS, TestHelpers
+
+
+def build_columns(count: int, seed: int):
+    rng = random.Random(seed)
+    types = [rng.choice(list(VehicleType)).value for _ in range(count)]
+    permits = [int(rng.choice(PERMITS)) for _ in range(count)]
+    vehicle_ids = [f"r{index}" for index in range(count)]
+    return types, permits, vehicle_ids
+
+
+@pytest.mark.parametrize("vectorized_batch_size", [None, 1])
+def test_records_are_placed_like_vehicles(vectorized_batch_size):
+    if vectorized_batch_size is not None:
+        pytest.importorskip("numpy")
+    types, permits, vehicle_ids = build_columns(250, seed=1)
+    vehicle_garage = Garage(
+        levels=TestHelpers.random_levels(1, level_count=4, space_count=50)
+    )
+    record_garage = Garage(
+        levels=TestHelpers.random_levels(1, level_count=4, space_count=50),
+        vectorized_batch_size=vectorized_batch_size,
+        vectorized_free_ratio=None,
+    )
+    vehicles = [
+        Vehicle(
+            vehicle_type=VehicleType(vehicle_type),
+            vehicle_id=vehicle_id,
+            permit=Permit(permit),
+        )
+        for vehicle_type, permit, vehicle_id in zip(types, permits, vehicle_ids)
+    ]
+
+    rejected_vehicles = vehicle_garage.add_vehicles(vehicles)
+    placements = record_garage.add_records(types, permits, vehicle_ids)
+
+    assert list(placements.rejected) == [
+        vehicles.index(vehicle) for vehicle in rejected_vehicles
+    ]
+    for index, vehicle_id in enumerate(vehicle_ids):
+        location = vehicle_garage.locate(vehicle_id)
+        assert record_garage.locate(vehicle_id) == location
+        assert (placements.level_indices[index], placements.space_indices[index]) == (
+            location or (-1, -1)
+        )
+    parked = record_garage.levels[0].spaces[0].vehicle
+    assert parked is None or isinstance(parked.vehicle_type, VehicleType)
+    record_garage.verify_counters()
+
+
+def test_structured_arrays_are_accepted():
+    np = pytest.importorskip("numpy")
+    records = np.array(
+        [
+            (VehicleType.Compact.value, int(Permit.PREMIUM), b"c"),
+            (VehicleType.Truck.value, int(Permit.NONE), b"t"),
+            (VehicleType.Car.value, int(Permit.NONE), b"x"),
+        ],
+        dtype=[("vehicle_type", "u1"), ("permit", "u1"), ("vehicle_id", "S8")],
+    )
+    garage = Garage(
+        levels=[
+            ParkingLevel(
+                spaces=[ParkingSpace(required_permit=Permit.PREMIUM), ParkingSpace()]
+            )
+        ]
+    )
+
+    placements = garage.add_records(records)
+
+    assert list(placements.rejected) == [2]
+    assert list(placements.level_indices) == [0, 0, -1]
+    assert list(placements.space_indices) == [0, 1, -1]
+    vehicle = garage.levels[0].spaces[0].vehicle
+    assert (vehicle.vehicle_id, vehicle.vehicle_type, vehicle.permit) == (
+        "c",
+        VehicleType.Compact,
+        Permit.PREMIUM,
+    )
+
+    with pytest.raises(ValueError):
+        garage.add_records(records[["vehicle_type", "permit"]])
+
+
+def test_rejected_records_are_journaled(tmp_path):
+    journal_path = tmp_path / "garage.journal"
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace()])],
+        journal=PlacementJournal(journal_path),
+    )
+
+    placements = garage.add_records([1, 1], [0, 0], ["a", "b"])
+    garage.journal.close()
+
+    assert list(placements.rejected) == [1]
+    recovered = Garage.recover(
+        journal_path, levels=[ParkingLevel(spaces=[ParkingSpace()])]
+    )
+    assert recovered.locate("a") == (0, 0)
+
+
+def test_invalid_columns_raise():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace()])])
+
+    with pytest.raises(ValueError):
+        garage.add_records([1, 2], [0], ["a", "b"])
+    with pytest.raises(ValueError):
+        garage.add_records([7], [0], ["a"])
+    assert garage.counters.occupancy == 0
+
+
+def test_rows_without_ids_are_given_generated_ids():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])])
+
+    placements = garage.add_records([1, 1, 1], [0, 0, 0])
+
+    assert list(placements.rejected) == [2]
+    assert list(placements.level_indices) == [0, 0, -1]
+    assert list(placements.space_indices) == [0, 1, -1]
+    first, second = (space.vehicle for space in garage.levels[0].spaces)
+    assert first.vehicle_id != second.vehicle_id
+    assert garage.locate(second.vehicle_id) == (0, 1)
+
+
+def test_locations_are_those_each_row_was_parked_at(tmp_path):
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace()])],
+        journal=PlacementJournal(tmp_path / "garage.journal"),
+    )
+
+    placements = garage.add_records([1, 1], [0, 0], ["a", "b"])
+    garage.remove_vehicles(["a"])
+    second = garage.add_records([1, 1], [0, 0], ["c", "a"])
+    garage.journal.close()
+
+    assert list(placements.level_indices) == [0, -1]
+    assert list(second.level_indices) == [0, -1]
+    assert list(second.rejected) == [1]
@@ -0,0 +1,78 @@
+from typing import List
+
+from garage.free_space_pools import FreeSpacePools
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from test.utils import TestHelpers
+
+
+def test_free_space_pools_pop_spaces_in_garage_order():
+    parking_level_1 = ParkingLevel(
+        spaces=[ParkingSpace(), ParkingSpace(required_permit=Permit.PREMIUM)]
+    )
+    parking_level_2 = ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])
+
+    pools = FreeSpacePools(levels=[parking_level_1, parking_level_2])
+    standard = (Permit.NONE, False)
+    premium = (Permit.PREMIUM, False)
+
+    assert pools.pop([standard, premium]) == (0, 0)
+    assert pools.pop([standard, premium]) == (0, 1)
+    assert pools.pop([standard]) == (1, 0)
+
+    pools.push(standard, (0, 0))
+
+    assert pools.pop([standard]) == (0, 0)
+    assert pools.pop([standard]) == (1, 1)
+    assert pools.pop([standard]) is None
+
+
+def test_occupied_parking_spaces_are_skipped():
+    parked_vehicle = Vehicle()
+    parking_level_1 = ParkingLevel(
+        spaces=[ParkingSpace(vehicle=parked_vehicle), ParkingSpace()]
+    )
+
+    garage = Garage(levels=[parking_level_1])
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle()
+
+    actual_rejected_vehicles = garage.add_vehicles([vehicle_1, vehicle_2])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[parked_vehicle, vehicle_1]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_2]
+    )
+
+
+def test_consecutive_batches_continue_filling_the_garage():
+    parking_level_1 = ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])
+    parking_level_2 = ParkingLevel(spaces=[ParkingSpace()])
+
+    garage = Garage(levels=[parking_level_1, parking_level_2])
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle()
+    vehicle_3 = Vehicle()
+    vehicle_4 = Vehicle()
+
+    expected_vehicles_on_level_1: List[Vehicle] = [vehicle_1, vehicle_2]
+    expected_vehicles_on_level_2: List[Vehicle] = [vehicle_3]
+
+    garage.add_vehicles([vehicle_1])
+    garage.add_vehicles([vehicle_2, vehicle_3])
+    actual_rejected_vehicles = garage.add_vehicles([vehicle_4])
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels,
+        expected_levels=[expected_vehicles_on_level_1, expected_vehicles_on_level_2],
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_4]
+    )
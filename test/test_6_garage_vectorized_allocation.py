@@ -0,0 +1,154 @@
+import random
+
+import pytest
+
+from garage.garage import Garage
+from garage.metrics import InMemoryMetrics
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from test.utils import PERMITS, TestHelpers
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_vectorized_allocation_matches_per_vehicle_allocation(seed: int):
+    vehicles = TestHelpers.random_vehicles(random.Random(seed).randint(0, 300), seed)
+
+    per_vehicle_garage = Garage(
+        levels=TestHelpers.random_levels(seed), vectorized_batch_size=None
+    )
+    vectorized_garage = Garage(
+        levels=TestHelpers.random_levels(seed),
+        vectorized_batch_size=0,
+        vectorized_free_ratio=None,
+    )
+
+    expected_rejected_vehicles = per_vehicle_garage.add_vehicles(vehicles[:150])
+    expected_rejected_vehicles += per_vehicle_garage.add_vehicles(vehicles[150:])
+    actual_rejected_vehicles = vectorized_garage.add_vehicles(vehicles[:150])
+    actual_rejected_vehicles += vectorized_garage.add_vehicles(vehicles[150:])
+
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=expected_rejected_vehicles
+    )
+    TestHelpers.assert_expected_parking_placement(
+        levels=vectorized_garage.levels,
+        expected_levels=[
+            TestHelpers.vehicles_on_level(level) for level in per_vehicle_garage.levels
+        ],
+    )
+
+
+def test_vectorized_allocation_follows_priority_rules():
+    parking_space_a = ParkingSpace(required_permit=Permit.PREMIUM)
+    parking_space_b = ParkingSpace()
+    parking_space_c = ParkingSpace()
+    parking_space_d = ParkingSpace(required_permit=Permit.PREMIUM)
+    parking_space_e = ParkingSpace()
+    parking_space_f = ParkingSpace()
+
+    parking_level_1 = ParkingLevel(spaces=[parking_space_a, parking_space_b])
+    parking_level_2 = ParkingLevel(spaces=[parking_space_c, parking_space_d])
+    parking_level_3 = ParkingLevel(spaces=[parking_space_e, parking_space_f])
+
+    garage = Garage(
+        levels=[parking_level_1, parking_level_2, parking_level_3],
+        vectorized_batch_size=0,
+        vectorized_free_ratio=None,
+    )
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_3 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_4 = Vehicle()
+    vehicle_5 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_6 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_7 = Vehicle(permit=Permit.PREMIUM)
+
+    actual_rejected_vehicles = garage.add_vehicles(
+        [vehicle_1, vehicle_2, vehicle_3, vehicle_4, vehicle_5, vehicle_6, vehicle_7]
+    )
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels,
+        expected_levels=[
+            [vehicle_2, vehicle_5],
+            [vehicle_6, vehicle_3],
+            [vehicle_7, vehicle_1],
+        ],
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_4]
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_allocation_takes_only_the_head_of_large_pools(seed: int):
+    def build_garage(**kwargs) -> Garage:
+        rng = random.Random(seed)
+        garage = Garage(
+            levels=[
+                ParkingLevel(
+                    spaces=[
+                        ParkingSpace(
+                            compact=rng.random() < 0.3,
+                            required_permit=rng.choice(PERMITS),
+                        )
+                        for _ in range(200)
+                    ]
+                )
+                for _ in range(10)
+            ],
+            **kwargs,
+        )
+        # Leaves stale entries in the pools.
+        for space_index in range(0, 100, 3):
+            garage.remove_space(0, space_index)
+        return garage
+
+    vehicles = TestHelpers.random_vehicles(30, seed)
+    per_vehicle_garage = build_garage(vectorized_batch_size=None)
+    vectorized_garage = build_garage(
+        vectorized_batch_size=0, vectorized_free_ratio=None
+    )
+
+    plan = vectorized_garage.plan(vehicles[:10])
+    expected_rejected_vehicles = per_vehicle_garage.add_vehicles(vehicles[:10])
+    expected_rejected_vehicles += per_vehicle_garage.add_vehicles(vehicles[10:])
+    actual_rejected_vehicles = vectorized_garage.add_vehicles(vehicles[:10])
+    actual_rejected_vehicles += vectorized_garage.add_vehicles(vehicles[10:])
+
+    assert plan.locations == [
+        per_vehicle_garage.locate(vehicle.vehicle_id) for vehicle in vehicles[:10]
+    ]
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=expected_rejected_vehicles
+    )
+    TestHelpers.assert_expected_parking_placement(
+        levels=vectorized_garage.levels,
+        expected_levels=[
+            TestHelpers.vehicles_on_level(level) for level in per_vehicle_garage.levels
+        ],
+    )
+    assert list(vectorized_garage.free_spaces()) == list(
+        per_vehicle_garage.free_spaces()
+    )
+
+
+def test_engine_is_chosen_by_batch_size_relative_to_free_spaces():
+    metrics = InMemoryMetrics()
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace() for _ in range(10)])],
+        vectorized_batch_size=2,
+        vectorized_free_ratio=2,
+        metrics=metrics,
+    )
+
+    garage.add_vehicles([Vehicle(), Vehicle()])
+    assert "phase.vectorized.considered" not in metrics.totals
+
+    garage.add_vehicles([Vehicle() for _ in range(4)])
+    assert metrics.totals["phase.vectorized.considered"] == 4
@@ -0,0 +1,73 @@
+from garage.compact_layout import CompactLayout
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+from test.utils import TestHelpers
+
+
+def test_compact_layout_spaces_read_like_parking_spaces():
+    parked_vehicle = Vehicle()
+    layout = CompactLayout.from_levels(
+        [
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(compact=True),
+                    ParkingSpace(required_permit=Permit.PREMIUM),
+                ]
+            ),
+            ParkingLevel(spaces=[ParkingSpace(vehicle=parked_vehicle)]),
+        ]
+    )
+
+    levels = layout.levels()
+
+    assert len(levels) == 2
+    assert [len(level.spaces) for level in levels] == [2, 1]
+    assert levels[0].spaces[0].compact
+    assert levels[0].spaces[1].required_permit is Permit.PREMIUM
+    assert levels[0].spaces[1].vehicle is None
+    assert levels[1].spaces[0].vehicle is parked_vehicle
+
+    levels[1].spaces[0].vehicle = None
+
+    assert levels[1].spaces[0].vehicle is None
+
+
+def test_vehicles_are_added_to_compact_layout_garage():
+    layout = CompactLayout()
+    layout.add_level(
+        compact=[False, False],
+        required_permits=[Permit.DISABILITY, Permit.NONE],
+    )
+    layout.add_level(compact=[True, False])
+    layout.add_level(compact=[False, True], required_permits=[Permit.DISABILITY, 0])
+
+    garage = Garage(levels=layout.levels())
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(vehicle_type=VehicleType.Compact, permit=Permit.DISABILITY)
+    vehicle_3 = Vehicle(vehicle_type=VehicleType.Compact, permit=Permit.DISABILITY)
+    vehicle_4 = Vehicle(vehicle_type=VehicleType.Compact)
+    vehicle_5 = Vehicle(vehicle_type=VehicleType.Compact)
+    vehicle_6 = Vehicle(vehicle_type=VehicleType.Compact, permit=Permit.DISABILITY)
+    vehicle_7 = Vehicle()
+
+    actual_rejected_vehicles = garage.add_vehicles(
+        [vehicle_1, vehicle_2, vehicle_3, vehicle_4, vehicle_5, vehicle_6, vehicle_7]
+    )
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels,
+        expected_levels=[
+            [vehicle_2, vehicle_1],
+            [vehicle_4, vehicle_6],
+            [vehicle_3, vehicle_5],
+        ],
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_7]
+    )
+    assert TestHelpers.garage_occupancy(garage) == 6
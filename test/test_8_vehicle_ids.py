@@ -0,0 +1,35 @@
+from garage.parking_space import ParkingSpace
+from garage.vehicle import Vehicle
+from garage.vehicle_id import CounterVehicleIds, set_vehicle_id_generator
+
+
+def test_generated_vehicle_ids_are_stable():
+    vehicle = Vehicle()
+
+    assert vehicle.vehicle_id == vehicle.vehicle_id, "Vehicle ID changed between reads."
+    assert vehicle.vehicle_id != Vehicle().vehicle_id, "Vehicle IDs are not unique."
+
+
+def test_given_vehicle_ids_are_kept():
+    vehicle = Vehicle(vehicle_id="ABC-123")
+
+    assert vehicle.vehicle_id == "ABC-123", "Given vehicle ID was replaced."
+
+
+def test_vehicle_ids_can_come_from_a_counter():
+    previous = set_vehicle_id_generator(CounterVehicleIds(prefix="gate-"))
+    try:
+        vehicle_1 = Vehicle()
+        vehicle_2 = Vehicle()
+
+        assert vehicle_1.vehicle_id == "gate-1"
+        assert vehicle_2.vehicle_id == "gate-2"
+    finally:
+        set_vehicle_id_generator(previous)
+
+
+def test_vehicles_and_parking_spaces_do_not_carry_instance_dicts():
+    assert not hasattr(Vehicle(), "__dict__"), "Vehicle has an instance __dict__."
+    assert not hasattr(
+        ParkingSpace(), "__dict__"
+    ), "ParkingSpace has an instance __dict__."
@@ -0,0 +1,78 @@
+from typing import Iterator, List
+
+import pytest
+
+from garage.garage import Garage
+from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
+from garage.vehicle import Vehicle
+from test.utils import TestHelpers
+
+
+def test_rejections_are_yielded_before_the_stream_is_exhausted():
+    garage = Garage(levels=[ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()])])
+    consumed: List[Vehicle] = []
+
+    def arrivals() -> Iterator[Vehicle]:
+        while True:
+            vehicle = Vehicle()
+            consumed.append(vehicle)
+            yield vehicle
+
+    rejections = garage.add_vehicle_stream(arrivals())
+    first_rejected = next(rejections)
+
+    assert first_rejected is consumed[2], "Unexpected vehicle was rejected first."
+    assert len(consumed) == 3, "Stream was read ahead of the rejection."
+    assert next(rejections) is consumed[3]
+
+
+def test_priority_rules_apply_within_a_stream_batch():
+    parking_space_a = ParkingSpace(required_permit=Permit.PREMIUM)
+    parking_space_b = ParkingSpace()
+
+    garage = Garage(levels=[ParkingLevel(spaces=[parking_space_a, parking_space_b])])
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_3 = Vehicle(permit=Permit.PREMIUM)
+    vehicle_4 = Vehicle(permit=Permit.DISABILITY)
+
+    actual_rejected_vehicles = list(
+        garage.add_vehicle_stream(
+            iter([vehicle_1, vehicle_2, vehicle_3, vehicle_4]), batch_size=3
+        )
+    )
+
+    TestHelpers.assert_expected_parking_placement(
+        levels=garage.levels, expected_levels=[[vehicle_2, vehicle_3]]
+    )
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_1, vehicle_4]
+    )
+
+
+def test_vehicles_without_reachable_spaces_are_rejected_in_arrival_order():
+    garage = Garage(
+        levels=[ParkingLevel(spaces=[ParkingSpace(compact=True), ParkingSpace()])]
+    )
+
+    vehicle_1 = Vehicle()
+    vehicle_2 = Vehicle()
+    vehicle_3 = Vehicle()
+
+    actual_rejected_vehicles = list(
+        garage.add_vehicle_stream(
+            (vehicle for vehicle in [vehicle_1, vehicle_2, vehicle_3]), batch_size=2
+        )
+    )
+
+    TestHelpers.assert_expected_vehicles_are_rejected(
+        actual=actual_rejected_vehicles, expected=[vehicle_2, vehicle_3]
+    )
+
+
+def test_stream_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        list(Garage().add_vehicle_stream([Vehicle()], batch_size=0))
@@ -1,11 +1,73 @@
-from typing import List
+import random
+from typing import List, Optional
 
 from garage.garage import Garage
 from garage.parking_level import ParkingLevel
+from garage.parking_space import ParkingSpace
+from garage.permit import Permit
 from garage.vehicle import Vehicle
+from garage.vehicle_type import VehicleType
+
+# Iterating a Flag leaves out NONE on Python 3.11+, so permits are listed.
+PERMITS = [
+    Permit.NONE,
+    Permit.DISABILITY,
+    Permit.PREMIUM,
+    Permit.DISABILITY | Permit.PREMIUM,
+]
 
 
 class TestHelpers:
+    @staticmethod
+    def mixed_levels() -> List[ParkingLevel]:
+        return [
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(required_permit=Permit.DISABILITY),
+                    ParkingSpace(compact=True),
+                ]
+            ),
+            ParkingLevel(spaces=[ParkingSpace(), ParkingSpace()]),
+        ]
+
+    @staticmethod
+    def random_levels(
+        seed: int, level_count: int = None, space_count: int = None
+    ) -> List[ParkingLevel]:
+        """Levels of random spaces; counts left out are random too."""
+        rng = random.Random(seed)
+        return [
+            ParkingLevel(
+                spaces=[
+                    ParkingSpace(
+                        compact=rng.random() < 0.3, required_permit=rng.choice(PERMITS)
+                    )
+                    for _ in range(
+                        rng.randint(0, 40) if space_count is None else space_count
+                    )
+                ]
+            )
+            for _ in range(level_count or rng.randint(1, 6))
+        ]
+
+    @staticmethod
+    def random_vehicles(count: int, seed: int) -> List[Vehicle]:
+        rng = random.Random(seed)
+        return [
+            Vehicle(
+                vehicle_type=rng.choice(list(VehicleType)),
+                permit=rng.choice(PERMITS),
+            )
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def occupant_ids(garage: Garage) -> List[List[Optional[str]]]:
+        return [
+            [space.vehicle and space.vehicle.vehicle_id for space in level.spaces]
+            for level in garage.levels
+        ]
+
     @staticmethod
     def garage_vehicles(garage: Garage) -> List[Vehicle]:
         return [